@@ -14,17 +14,85 @@ class Config:
     # Node Agent Configuration
     NODE_AGENT_MAX_WORKERS = int(os.getenv('NODE_AGENT_MAX_WORKERS', 4))
     NODE_AGENT_HEARTBEAT_INTERVAL = int(os.getenv('NODE_AGENT_HEARTBEAT_INTERVAL', 30))
+    NODE_AGENT_START_METHOD = os.getenv('NODE_AGENT_START_METHOD', 'forkserver')
+    # Per-job-type worker pools, e.g. "molecular_dynamics:2,compute:2"
+    NODE_AGENT_EXECUTORS = os.getenv('NODE_AGENT_EXECUTORS', '')
+    NODE_AGENT_PRELOAD_MODULES = os.getenv(
+        'NODE_AGENT_PRELOAD_MODULES', 'numpy,backend.node_agent.molecular_dynamics'
+    )
+    # "push": the scheduler sends batches; "pull": agents fetch work and steal from peers
+    NODE_AGENT_DISPATCH_MODE = os.getenv('NODE_AGENT_DISPATCH_MODE', 'push')
+    # Pulled jobs kept waiting locally before asking for more (defaults to max workers)
+    NODE_AGENT_LOW_WATER_MARK = int(os.getenv('NODE_AGENT_LOW_WATER_MARK', 0)) or None
+    # Serve the local agent over RPC, e.g. "0.0.0.0:9000" or "unix:/run/agent.sock"
+    NODE_AGENT_RPC_ADDRESS = os.getenv('NODE_AGENT_RPC_ADDRESS', '')
+    NODE_AGENT_RPC_POOL_SIZE = int(os.getenv('NODE_AGENT_RPC_POOL_SIZE', 4))
+    # Spawn worker processes in the background at startup; 'false' waits for the first job
+    NODE_AGENT_PREWARM_WORKERS = os.getenv('NODE_AGENT_PREWARM_WORKERS', 'true').lower() == 'true'
+    # Result arrays of at least this many bytes come back through shared memory (0 = never)
+    NODE_AGENT_SHARED_RESULT_MIN_BYTES = int(os.getenv('NODE_AGENT_SHARED_RESULT_MIN_BYTES', 1024 * 1024))
+    # Node-local cache of content-hashed job inputs (empty = off)
+    ARTIFACT_CACHE_DIR = os.getenv('ARTIFACT_CACHE_DIR', '')
+    ARTIFACT_CACHE_MAX_BYTES = int(os.getenv('ARTIFACT_CACHE_MAX_BYTES', 50 * 1024 ** 3))
+    # Schemes job artifacts may be fetched from (file, http, https; a plain path is file)
+    ARTIFACT_SOURCE_SCHEMES = os.getenv('ARTIFACT_SOURCE_SCHEMES', 'https')
     
     # Job Queue Configuration
     JOB_QUEUE_MAX_SIZE = int(os.getenv('JOB_QUEUE_MAX_SIZE', 1000))
     JOB_QUEUE_PRIORITY_LEVELS = int(os.getenv('JOB_QUEUE_PRIORITY_LEVELS', 3))
+    # Most tasks a single job array submission may declare
+    JOB_ARRAY_MAX_SIZE = int(os.getenv('JOB_ARRAY_MAX_SIZE', 100000))
+    
+    # Fair-share Configuration
+    FAIR_SHARE_ENABLED = os.getenv('FAIR_SHARE_ENABLED', 'false').lower() == 'true'
+    FAIR_SHARE_HALF_LIFE = float(os.getenv('FAIR_SHARE_HALF_LIFE', 3600))
     
     # Fault Tolerance Configuration
     FAULT_TOLERANCE_RETRY_LIMIT = int(os.getenv('FAULT_TOLERANCE_RETRY_LIMIT', 3))
     FAULT_TOLERANCE_TIMEOUT = int(os.getenv('FAULT_TOLERANCE_TIMEOUT', 60))
+    # "fixed" fails a node after missed heartbeats; "phi" adapts to each node's jitter
+    FAILURE_DETECTOR = os.getenv('FAILURE_DETECTOR', 'fixed')
+    PHI_THRESHOLD = float(os.getenv('PHI_THRESHOLD', 8.0))
+    PHI_WINDOW_SIZE = int(os.getenv('PHI_WINDOW_SIZE', 100))
+    # Jobs of failed nodes placed per second (0 = unlimited) and burst size
+    REDISTRIBUTION_RATE = float(os.getenv('REDISTRIBUTION_RATE', 50))
+    REDISTRIBUTION_BURST = int(os.getenv('REDISTRIBUTION_BURST', 100))
+    
+    # Gang Scheduling Configuration
+    GANG_RESERVATION_TIMEOUT = float(os.getenv('GANG_RESERVATION_TIMEOUT', 120))
+    # How often gang jobs are placed in pull mode, where no distribution pass does it
+    GANG_SCHEDULING_INTERVAL = float(os.getenv('GANG_SCHEDULING_INTERVAL', 1.0))
+    
+    # Job Dependency Configuration: finished jobs whose outcome later submissions may depend on
+    DAG_MAX_OUTCOMES = int(os.getenv('DAG_MAX_OUTCOMES', 100000))
+    
+    # Data Locality Configuration: load units a node holding all of a job's inputs is worth (0 = off)
+    ARTIFACT_LOCALITY_WEIGHT = float(os.getenv('ARTIFACT_LOCALITY_WEIGHT', 0.0))
+    
+    # Runtime Prediction Configuration
+    RUNTIME_PREDICTION_ENABLED = os.getenv('RUNTIME_PREDICTION_ENABLED', 'false').lower() == 'true'
+    RUNTIME_PREDICTION_MIN_SAMPLES = int(os.getenv('RUNTIME_PREDICTION_MIN_SAMPLES', 5))
+    RUNTIME_PREDICTION_FORGETTING = float(os.getenv('RUNTIME_PREDICTION_FORGETTING', 0.98))
+    
+    # Preemption Configuration
+    PREEMPTION_ENABLED = os.getenv('PREEMPTION_ENABLED', 'false').lower() == 'true'
+    # Least urgent queue priority allowed to preempt (lower numbers are more urgent)
+    PREEMPTION_MAX_PRIORITY = int(os.getenv('PREEMPTION_MAX_PRIORITY', 0))
+    CHECKPOINT_DIR = os.getenv('CHECKPOINT_DIR', '')
+    CHECKPOINT_INTERVAL_STEPS = int(os.getenv('CHECKPOINT_INTERVAL_STEPS', 100))
     
     # Performance Monitoring
     METRICS_COLLECTION_INTERVAL = int(os.getenv('METRICS_COLLECTION_INTERVAL', 60))
+    RESOURCE_SAMPLE_INTERVAL = float(os.getenv('RESOURCE_SAMPLE_INTERVAL', 1.0))
+    RESOURCE_HISTORY_SIZE = int(os.getenv('RESOURCE_HISTORY_SIZE', 3600))
+    TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 0.0))
+    TRACE_FILE = os.getenv('TRACE_FILE', 'job_traces.jsonl')
+    # Record job arrivals and outcomes for replay (empty = off)
+    WORKLOAD_TRACE_DIR = os.getenv('WORKLOAD_TRACE_DIR', '')
+    WORKLOAD_TRACE_MAX_BYTES = int(os.getenv('WORKLOAD_TRACE_MAX_BYTES', 64 * 1024 * 1024))
+    WORKLOAD_TRACE_MAX_FILES = int(os.getenv('WORKLOAD_TRACE_MAX_FILES', 10))
+    # Seconds from process start until the API accepts jobs before startup logs a warning
+    STARTUP_TIME_BUDGET = float(os.getenv('STARTUP_TIME_BUDGET', 1.0))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -53,4 +121,37 @@ class Config:
             raise ValueError("Invalid scheduler port")
         
         if cls.NODE_AGENT_MAX_WORKERS <= 0:
-            raise ValueError("Max workers must be positive")
\ No newline at end of file
+            raise ValueError("Max workers must be positive")
+        
+        if cls.NODE_AGENT_SHARED_RESULT_MIN_BYTES < 0:
+            raise ValueError("Shared result threshold must not be negative")
+        
+        if cls.NODE_AGENT_DISPATCH_MODE not in ('push', 'pull'):
+            raise ValueError("Dispatch mode must be 'push' or 'pull'")
+        
+        if cls.GANG_SCHEDULING_INTERVAL <= 0:
+            raise ValueError("Gang scheduling interval must be positive")
+        
+        if cls.FAILURE_DETECTOR not in ('fixed', 'phi'):
+            raise ValueError("Failure detector must be 'fixed' or 'phi'")
+        
+        if cls.PHI_THRESHOLD <= 0:
+            raise ValueError("Phi threshold must be positive")
+        
+        if cls.FAIR_SHARE_HALF_LIFE <= 0:
+            raise ValueError("Fair-share half-life must be positive")
+        
+        if not 0 <= cls.TRACE_SAMPLE_RATE <= 1:
+            raise ValueError("Trace sample rate must be between 0 and 1")
+        
+        if cls.ARTIFACT_LOCALITY_WEIGHT < 0:
+            raise ValueError("Artifact locality weight cannot be negative")
+        
+        if not 0 < cls.RUNTIME_PREDICTION_FORGETTING <= 1:
+            raise ValueError("Runtime prediction forgetting factor must be in (0, 1]")
+        
+        if cls.WORKLOAD_TRACE_MAX_BYTES <= 0 or cls.WORKLOAD_TRACE_MAX_FILES <= 0:
+            raise ValueError("Workload trace size and file limits must be positive")
+        
+        if cls.STARTUP_TIME_BUDGET <= 0:
+            raise ValueError("Startup time budget must be positive")
\ No newline at end of file
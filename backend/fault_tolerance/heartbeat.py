@@ -1,99 +1,314 @@
+import heapq
 import threading
 import time
 import logging
-from typing import Dict, Any, Callable
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional
+from backend.scheduler.algorithms import JobSchedulingAlgorithms
+from .phi_accrual import FixedTimeoutDetector
 
 class HeartbeatMonitor:
     """
     Monitor node health and manage fault tolerance
+
+    Nodes report in through ``record_heartbeat``. Each node has an expiry
+    deadline kept in a min-heap with at most one entry per node; a
+    heartbeat only moves the node's deadline, and the stale heap entry is
+    re-armed when it comes due. The monitor thread sleeps until the
+    earliest deadline, so checking costs nothing while nodes are healthy
+    instead of a scan over every node.
+
+    By default a node fails ``max_missed_heartbeats`` intervals after its
+    last heartbeat. A ``failure_detector`` such as ``PhiAccrualDetector``
+    can set each node's deadline from its own heartbeat history instead.
+
+    Heartbeats may carry the node's artifact cache listing, which is passed
+    on to ``artifact_registry``.
+
+    Jobs of failed nodes are placed on survivors in batches, at most
+    ``redistribution_rate`` jobs per second (with bursts of
+    ``redistribution_burst``), so losing a whole rack does not flood the
+    rest of the cluster; the remainder waits its turn. Cores and memory
+    placed on a node count against it until it next reports in, so later
+    batches do not overcommit it. Jobs no survivor has room for go to
+    ``requeue_job``; without one they stay orphaned and are retried,
+    after ``check_interval`` if a batch could place nothing at all.
     """
-    def __init__(self, 
-                 node_registry=None, 
-                 check_interval: int = 30, 
-                 max_missed_heartbeats: int = 3):
+    def __init__(self,
+                 node_registry=None,
+                 check_interval: int = 30,
+                 max_missed_heartbeats: int = 3,
+                 clock: Callable[[], float] = time.monotonic,
+                 failure_detector=None,
+                 requeue_job: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 redistribution_rate: Optional[float] = None,
+                 redistribution_burst: int = 100,
+                 artifact_registry=None):
         self.node_registry = node_registry
         self.check_interval = check_interval
         self.max_missed_heartbeats = max_missed_heartbeats
+        self.heartbeat_timeout = check_interval * max_missed_heartbeats
+        self.clock = clock
+        self.failure_detector = failure_detector or FixedTimeoutDetector(self.heartbeat_timeout)
         self.logger = logging.getLogger('HeartbeatMonitor')
-        self.node_health = {}
-    
+        self.node_health: Dict[str, Dict[str, Any]] = {}
+        self.deadlines: List = []  # (deadline, node_id), one entry per monitored node
+        self.condition = threading.Condition()
+        self.monitor_thread: Optional[threading.Thread] = None
+        self.running = False
+
+        self.requeue_job = requeue_job
+        self.redistribution_rate = redistribution_rate
+        self.redistribution_burst = redistribution_burst
+        self.redistribution_tokens = float(redistribution_burst)
+        self.tokens_updated_at = clock()
+        self.orphaned_jobs = deque()  # Jobs of failed nodes awaiting placement
+        self.redistribution_paused_until = 0.0  # Set when no orphan fits anywhere
+        self.redistribution_lock = threading.Lock()
+        self.artifact_registry = artifact_registry
+
+    def record_heartbeat(self, node_id: str, load: Optional[float] = None,
+                         resources: Optional[Dict[str, Any]] = None,
+                         timestamp: Optional[float] = None):
+        """
+        Ingest a heartbeat, pushing the node's failure deadline forward
+        """
+        now = self.clock() if timestamp is None else timestamp
+        with self.condition:
+            health = self.node_health.get(node_id)
+            if health is None:
+                health = self.node_health[node_id] = {'status': 'HEALTHY', 'armed': False}
+            elif health['status'] == 'FAILED':
+                self.logger.info(f"Node {node_id} is sending heartbeats again")
+
+            self.failure_detector.heartbeat(node_id, now)
+            health['last_heartbeat'] = now
+            health['deadline'] = self.failure_detector.deadline(node_id)
+            health['status'] = 'HEALTHY'
+            # Redistributed since this report
+            health['placed_load'] = health['placed_cpu'] = health['placed_memory'] = 0.0
+            if load is not None:
+                health['load'] = load
+            if resources is not None:
+                health['resources'] = {key: value for key, value in resources.items() if key != 'artifacts'}
+
+            if not health['armed']:
+                health['armed'] = True
+                heapq.heappush(self.deadlines, (health['deadline'], node_id))
+                if self.deadlines[0][1] == node_id:
+                    self.condition.notify()
+
+        # Cache listings feed locality-aware placement rather than node health
+        if resources and 'artifacts' in resources and self.artifact_registry is not None:
+            self.artifact_registry.update(node_id, resources['artifacts'])
+
+    def remove_node(self, node_id: str):
+        """
+        Stop monitoring a deregistered node and drop its detector state
+        """
+        with self.condition:
+            self.node_health.pop(node_id, None)
+            self.failure_detector.remove(node_id)
+            # Rare, so the heap is rebuilt rather than leaving an entry to skip
+            self.deadlines = [entry for entry in self.deadlines if entry[1] != node_id]
+            heapq.heapify(self.deadlines)
+        if self.artifact_registry is not None:
+            self.artifact_registry.remove_node(node_id)
+
     def start_monitoring(self):
         """
         Start background heartbeat monitoring
         """
-        def monitor():
-            while True:
-                if self.node_registry is not None:
-                    self._check_node_health()
-                else:
-                    self.logger.warning("Node registry is not set, skipping heartbeat monitoring.")
-                    time.sleep(self.check_interval)
-        
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
-    
-    def _check_node_health(self):
-        """
-        Check health of all registered nodes
-        """
-        active_nodes = self.node_registry.get_active_nodes()
-        
-        for node in active_nodes:
-            node_id = node['id']
-            last_heartbeat = node.get('last_heartbeat', 0)
-            
-            # Track missed heartbeats
-            if node_id not in self.node_health:
-                self.node_health[node_id] = {
-                    'missed_beats': 0,
-                    'status': 'HEALTHY'
-                }
-            
-            time_since_last_beat = time.time() - last_heartbeat
-            
-            if time_since_last_beat > self.check_interval:
-                self.node_health[node_id]['missed_beats'] += 1
-                
-                if (self.node_health[node_id]['missed_beats'] > 
-                    self.max_missed_heartbeats):
-                    self._handle_node_failure(node_id)
-            else:
-                # Reset missed beats if node responds
-                self.node_health[node_id]['missed_beats'] = 0
-                self.node_health[node_id]['status'] = 'HEALTHY'
-    
+        if self.node_registry is None:
+            self.logger.warning("Node registry is not set, failed nodes will not be marked inactive.")
+        else:
+            # Known nodes get a full timeout to send their first heartbeat
+            now = self.clock()
+            for node in self.node_registry.get_active_nodes():
+                if node['id'] not in self.node_health:
+                    self.record_heartbeat(node['id'], node.get('current_load'), timestamp=now)
+
+        self.running = True
+        self.monitor_thread = threading.Thread(target=self._monitor, name='HeartbeatMonitor', daemon=True)
+        self.monitor_thread.start()
+
+    def stop_monitoring(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.monitor_thread is not None:
+            self.monitor_thread.join()
+            self.monitor_thread = None
+
+    def _monitor(self):
+        while True:
+            with self.condition:
+                while self.running:
+                    wake_at = [self.deadlines[0][0]] if self.deadlines else []
+                    if self.orphaned_jobs:
+                        wake_at.append(self._next_redistribution_at())
+                    timeout = min(wake_at) - self.clock() if wake_at else None
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self.condition.wait(timeout)
+                if not self.running:
+                    return
+            self.check_deadlines()
+            self.redistribute_orphaned_jobs()
+
+    def check_deadlines(self, now: Optional[float] = None) -> List[str]:
+        """
+        Fail nodes whose deadline has passed; returns their ids
+
+        Only due heap entries are touched: an entry whose node has
+        heartbeated since is re-armed at the node's current deadline.
+        """
+        now = self.clock() if now is None else now
+        failed = []
+        with self.condition:
+            while self.deadlines and self.deadlines[0][0] <= now:
+                _, node_id = heapq.heappop(self.deadlines)
+                health = self.node_health[node_id]
+                if health['deadline'] > now:
+                    heapq.heappush(self.deadlines, (health['deadline'], node_id))
+                    continue
+                health['armed'] = False
+                health['status'] = 'FAILED'
+                failed.append(node_id)
+
+        for node_id in failed:
+            self._handle_node_failure(node_id)
+        return failed
+
     def _handle_node_failure(self, node_id: str):
         """
         Handle node that has missed too many heartbeats
         """
         self.logger.warning(f"Node {node_id} is considered failed")
-        
+
         # Mark node as inactive
         if self.node_registry is not None:
             self.node_registry.mark_node_inactive(node_id)
-        
+
         # Trigger node recovery or job redistribution
         self._redistribute_node_jobs(node_id)
-    
+
     def _redistribute_node_jobs(self, failed_node_id: str):
         """
-        Redistribute jobs from failed node
+        Queue the failed node's jobs for batched placement on surviving nodes
         """
-        # Retrieve and redistribute jobs from failed node
-        if self.node_registry is not None:
-            failed_node_jobs = self.node_registry.get_node_jobs(failed_node_id)
-            
-            # Find alternative nodes for job redistribution
-            active_nodes = self.node_registry.get_active_nodes()
-            
-            if active_nodes:
-                for job in failed_node_jobs:
-                    target_node = self._select_alternative_node(active_nodes)
-                    target_node.receive_jobs([job])
-    
-    def _select_alternative_node(self, nodes: Dict[str, Any]) -> Any:
-        """
-        Select an alternative node for job redistribution
-        """
-        # Simple load balancing strategy
-        return min(nodes, key=lambda node: node.get('current_load', 0))
\ No newline at end of file
+        if self.node_registry is None:
+            return
+        failed_node_jobs = self.node_registry.get_node_jobs(failed_node_id)
+        if not failed_node_jobs:
+            return
+        with self.redistribution_lock:
+            self.orphaned_jobs.extend(failed_node_jobs)
+            self.redistribution_paused_until = 0.0
+        self.redistribute_orphaned_jobs()
+
+    def redistribute_orphaned_jobs(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Place as many orphaned jobs as the rate limit allows, one send per node
+
+        Returns the jobs sent to each node.
+        """
+        with self.redistribution_lock:
+            if self.clock() < self.redistribution_paused_until:
+                return {}
+            budget = len(self.orphaned_jobs)
+            if self.redistribution_rate is not None:
+                self._refill_tokens()
+                budget = min(budget, int(self.redistribution_tokens))
+                self.redistribution_tokens -= budget
+            batch = [self.orphaned_jobs.popleft() for _ in range(budget)]
+        if not batch:
+            return {}
+
+        active_nodes = [
+            self._remaining_capacity(node) for node in self.node_registry.get_active_nodes()
+            if self.node_health.get(node['id'], {}).get('status') != 'FAILED'
+        ]
+        distribution, unplaced = JobSchedulingAlgorithms.capacity_aware_placement(
+            batch, active_nodes, self._current_loads(active_nodes)
+        )
+
+        sent = {}
+        for node_id, jobs in distribution.items():
+            try:
+                self.node_registry.get_node(node_id).receive_jobs(jobs)
+            except Exception as e:
+                self.logger.error(f"Failed to redistribute {len(jobs)} jobs to node {node_id}: {e}")
+                unplaced.extend(jobs)
+                continue
+            sent[node_id] = jobs
+            health = self.node_health.get(node_id)
+            if health is not None:
+                cores = sum(job.get('resources', {}).get('cpu_cores', 1) for job in jobs)
+                health['placed_cpu'] = health.get('placed_cpu', 0.0) + cores
+                health['placed_memory'] = health.get('placed_memory', 0.0) + sum(
+                    job.get('resources', {}).get('memory_gb', 0) for job in jobs
+                )
+                health['placed_load'] = health.get('placed_load', 0.0) + cores / max(
+                    health.get('resources', {}).get('cpu_cores', 0), 1
+                )
+
+        if sent:
+            self.logger.info(
+                f"Redistributed {sum(len(jobs) for jobs in sent.values())} jobs across {len(sent)} nodes"
+            )
+        if unplaced and self.requeue_job is None:
+            self.logger.warning(f"No surviving node can take {len(unplaced)} jobs yet, keeping them orphaned")
+            with self.redistribution_lock:
+                self.orphaned_jobs.extend(unplaced)
+                if not sent:
+                    self.redistribution_paused_until = self.clock() + self.check_interval
+        else:
+            for job in unplaced:
+                self.requeue_job(job)
+
+        if self.orphaned_jobs:
+            with self.condition:
+                self.condition.notify()
+        return sent
+
+    def _remaining_capacity(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        A node with what was placed on it since its last report deducted
+        """
+        health = self.node_health.get(node['id'], {})
+        if not health.get('placed_cpu') and not health.get('placed_memory'):
+            return node
+        return dict(
+            node,
+            available_cpu=node.get('available_cpu', 0) - health.get('placed_cpu', 0.0),
+            available_memory=node.get('available_memory', 0) - health.get('placed_memory', 0.0)
+        )
+
+    def _current_loads(self, nodes: List[Dict[str, Any]]) -> Dict[str, float]:
+        """
+        Last reported load of each node plus what was placed on it since
+        """
+        loads = {}
+        for node in nodes:
+            health = self.node_health.get(node['id'], {})
+            loads[node['id']] = health.get('load', node.get('current_load', 0)) + health.get('placed_load', 0.0)
+        return loads
+
+    def _refill_tokens(self):
+        now = self.clock()
+        self.redistribution_tokens = min(
+            float(self.redistribution_burst),
+            self.redistribution_tokens + (now - self.tokens_updated_at) * self.redistribution_rate
+        )
+        self.tokens_updated_at = now
+
+    def _next_redistribution_at(self) -> float:
+        """
+        When the rate limit next allows a job to be placed
+        """
+        if self.redistribution_rate is None:
+            return max(self.clock(), self.redistribution_paused_until)
+        missing = max(0.0, 1.0 - self.redistribution_tokens)
+        return max(self.tokens_updated_at + missing / self.redistribution_rate,
+                   self.redistribution_paused_until)
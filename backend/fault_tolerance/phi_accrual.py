@@ -0,0 +1,278 @@
+import argparse
+import csv
+import json
+import math
+import numpy as np
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# Coefficients of the logistic approximation to the normal CDF used for phi
+_PHI_A = 1.5976
+_PHI_B = 0.070566
+
+
+class FixedTimeoutDetector:
+    """
+    Declares a node failed a fixed time after its last heartbeat
+    """
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.last_arrival: Dict[str, float] = {}
+
+    def heartbeat(self, node_id: str, timestamp: float) -> None:
+        self.last_arrival[node_id] = timestamp
+
+    def deadline(self, node_id: str) -> float:
+        return self.last_arrival[node_id] + self.timeout
+
+    def remove(self, node_id: str) -> None:
+        self.last_arrival.pop(node_id, None)
+
+
+class PhiAccrualDetector:
+    """
+    Adaptive failure detector scoring suspicion from heartbeat inter-arrivals
+
+    Phi is ``-log10`` of the probability that a heartbeat arrives even
+    later than the time already elapsed, given the mean and deviation of
+    the node's recent inter-arrival times. A node is suspected once phi
+    reaches ``threshold`` (8 means a 1e-8 chance of a false suspicion if
+    arrivals are normal), so jittery nodes get more slack and steady ones
+    are caught sooner than with a fixed number of missed beats.
+
+    Windows are kept for all nodes in shared numpy arrays (one row per
+    node) with running sums, so a heartbeat is O(1) and the per-node cost
+    is ``window_size`` floats. Rows of removed nodes go on a free list and
+    are handed to the next new node. Because phi only grows with elapsed
+    time, ``deadline`` can invert it into the moment a node becomes suspect,
+    which is what ``HeartbeatMonitor`` keeps in its deadline heap.
+    """
+    def __init__(self,
+                 threshold: float = 8.0,
+                 window_size: int = 100,
+                 min_std: float = 0.1,
+                 acceptable_pause: float = 0.0,
+                 first_interval: float = 1.0,
+                 min_samples: int = 3,
+                 capacity: int = 64):
+        if threshold <= 0:
+            raise ValueError("Phi threshold must be positive")
+        self.threshold = threshold
+        self.window_size = window_size
+        self.min_std = min_std
+        self.acceptable_pause = acceptable_pause
+        self.first_interval = first_interval
+        self.min_samples = min_samples
+
+        self.slots: Dict[str, int] = {}
+        self.free_slots: List[int] = []
+        self.intervals = np.zeros((capacity, window_size), dtype=np.float64)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.positions = np.zeros(capacity, dtype=np.int32)
+        self.sums = np.zeros(capacity, dtype=np.float64)
+        self.squares = np.zeros(capacity, dtype=np.float64)
+        self.last_arrival = np.zeros(capacity, dtype=np.float64)
+        self._suspect_offset = self._solve_suspect_offset(threshold)
+
+    def heartbeat(self, node_id: str, timestamp: float) -> None:
+        """
+        Record a heartbeat arrival
+        """
+        slot = self.slots.get(node_id)
+        if slot is None:
+            slot = self._allocate(node_id)
+            self.last_arrival[slot] = timestamp
+            return
+
+        interval = timestamp - self.last_arrival[slot]
+        self.last_arrival[slot] = timestamp
+        if interval <= 0:
+            return
+
+        position = self.positions[slot]
+        if self.counts[slot] == self.window_size:
+            evicted = self.intervals[slot, position]
+            self.sums[slot] -= evicted
+            self.squares[slot] -= evicted * evicted
+        else:
+            self.counts[slot] += 1
+        self.intervals[slot, position] = interval
+        self.sums[slot] += interval
+        self.squares[slot] += interval * interval
+        self.positions[slot] = (position + 1) % self.window_size
+
+    def statistics(self, node_id: str) -> Tuple[float, float]:
+        """
+        Mean and standard deviation of the node's inter-arrival window
+        """
+        slot = self.slots[node_id]
+        count = int(self.counts[slot])
+        if count < self.min_samples:
+            # Bootstrap from the expected interval until enough samples arrive
+            return self.first_interval, max(self.first_interval / 4, self.min_std)
+        mean = self.sums[slot] / count
+        variance = max(0.0, self.squares[slot] / count - mean * mean)
+        return float(mean), max(math.sqrt(variance), self.min_std)
+
+    def phi(self, node_id: str, now: float) -> float:
+        """
+        Current suspicion level of a node
+        """
+        mean, std = self.statistics(node_id)
+        elapsed = now - self.last_arrival[self.slots[node_id]] - self.acceptable_pause
+        y = (elapsed - mean) / std
+        e = math.exp(-y * (_PHI_A + _PHI_B * y * y))
+        if elapsed > mean:
+            probability_later = e / (1.0 + e)
+        else:
+            probability_later = 1.0 - 1.0 / (1.0 + e)
+        if probability_later <= 0.0:
+            return math.inf
+        return -math.log10(probability_later)
+
+    def deadline(self, node_id: str) -> float:
+        """
+        Time at which the node's phi reaches the threshold without further heartbeats
+        """
+        mean, std = self.statistics(node_id)
+        return float(self.last_arrival[self.slots[node_id]]) + self.acceptable_pause + mean + self._suspect_offset * std
+
+    def remove(self, node_id: str) -> None:
+        """
+        Forget a node; its row is reset and freed for the next new node
+        """
+        slot = self.slots.pop(node_id, None)
+        if slot is not None:
+            self.counts[slot] = self.positions[slot] = 0
+            self.sums[slot] = self.squares[slot] = 0.0
+            self.free_slots.append(slot)
+
+    def _allocate(self, node_id: str) -> int:
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.slots)
+            if slot == len(self.counts):
+                self._grow()
+        self.slots[node_id] = slot
+        return slot
+
+    def _grow(self) -> None:
+        capacity = len(self.counts) * 2
+        intervals = np.zeros((capacity, self.window_size), dtype=np.float64)
+        intervals[:len(self.intervals)] = self.intervals
+        self.intervals = intervals
+        for name in ('counts', 'positions', 'sums', 'squares', 'last_arrival'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    @staticmethod
+    def _solve_suspect_offset(threshold: float) -> float:
+        """
+        Standardized delay y at which phi equals the threshold
+
+        Solves ``B*y^3 + A*y + ln(p / (1 - p)) = 0`` for ``p = 10^-threshold``;
+        the cubic is increasing, so Cardano's formula gives its only real root.
+        """
+        log_odds = -threshold * math.log(10) - math.log1p(-10 ** -threshold)
+        p = _PHI_A / _PHI_B
+        q = log_odds / _PHI_B
+        root = math.sqrt(q * q / 4 + p ** 3 / 27)
+        return math.copysign(abs(-q / 2 + root) ** (1 / 3), -q / 2 + root) + \
+            math.copysign(abs(-q / 2 - root) ** (1 / 3), -q / 2 - root)
+
+
+def load_heartbeat_trace(path: str) -> Tuple[list, Dict[str, float]]:
+    """
+    Read a recorded trace of ``timestamp,node_id[,event]`` rows
+
+    ``event`` is ``heartbeat`` (the default) or ``failed``, marking when a
+    node actually went down. Returns heartbeats in time order and the
+    failure time of each failed node.
+    """
+    heartbeats, failures = [], {}
+    with open(path, newline='') as trace_file:
+        for row in csv.reader(trace_file):
+            if not row or row[0].startswith('#') or row[0] == 'timestamp':
+                continue
+            timestamp, node_id = float(row[0]), row[1]
+            event = row[2] if len(row) > 2 else 'heartbeat'
+            if event == 'failed':
+                failures[node_id] = timestamp
+            else:
+                heartbeats.append((timestamp, node_id))
+    heartbeats.sort()
+    return heartbeats, failures
+
+
+def replay_heartbeat_trace(heartbeats: Iterable[Tuple[float, str]],
+                           failures: Optional[Dict[str, float]] = None,
+                           detector=None) -> Dict[str, Any]:
+    """
+    Replay heartbeats through a detector and score its decisions
+
+    A false positive is a suspicion raised during a gap that ended with
+    another heartbeat from a node that had not failed. Detection latency
+    is the time from a node's recorded failure to its suspicion.
+    """
+    failures = failures or {}
+    detector = detector or PhiAccrualDetector()
+    deadlines: Dict[str, float] = {}
+    intervals = false_positives = 0
+
+    for timestamp, node_id in heartbeats:
+        failed_at = failures.get(node_id)
+        if failed_at is not None and timestamp > failed_at:
+            continue  # Beats after a recorded failure belong to a restarted node
+        previous = deadlines.get(node_id)
+        if previous is not None:
+            intervals += 1
+            if previous < timestamp:
+                false_positives += 1
+        detector.heartbeat(node_id, timestamp)
+        deadlines[node_id] = detector.deadline(node_id)
+
+    latencies = np.array([
+        deadlines[node_id] - failed_at
+        for node_id, failed_at in failures.items() if node_id in deadlines
+    ])
+    report = {
+        'nodes': len(deadlines),
+        'intervals': intervals,
+        'false_positives': false_positives,
+        'false_positive_rate': false_positives / intervals if intervals else 0.0,
+        'failures': len(latencies)
+    }
+    if len(latencies):
+        report['detection_latency'] = {
+            'mean': float(latencies.mean()),
+            'p50': float(np.percentile(latencies, 50)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(latencies.max())
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a heartbeat trace through failure detectors")
+    parser.add_argument('trace', help="CSV of timestamp,node_id[,event] rows")
+    parser.add_argument('--threshold', type=float, default=8.0)
+    parser.add_argument('--window-size', type=int, default=100)
+    parser.add_argument('--fixed-timeout', type=float, default=None,
+                        help="Also score a fixed timeout detector for comparison")
+    args = parser.parse_args()
+
+    heartbeats, failures = load_heartbeat_trace(args.trace)
+    report = {'phi_accrual': replay_heartbeat_trace(
+        heartbeats, failures, PhiAccrualDetector(threshold=args.threshold, window_size=args.window_size)
+    )}
+    if args.fixed_timeout:
+        report['fixed_timeout'] = replay_heartbeat_trace(
+            heartbeats, failures, FixedTimeoutDetector(args.fixed_timeout)
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
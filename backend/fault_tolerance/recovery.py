@@ -1,6 +1,7 @@
 # File: distributed-job-scheduler/backend/fault_tolerance/recovery.py
 
 import logging
+import time
 from typing import List, Dict, Any
 
 class JobRecoveryManager:
@@ -1,20 +1,42 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import uuid
 import logging
 import time  # Ensure time is imported
 import traceback  # Add traceback for more detailed error logging
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 from .job_queue import DistributedJobQueue
+from .job_array import JobArray
+from .job_record import JobRecord, to_json
+from backend.node_agent.artifact_cache import SUPPORTED_SCHEMES, validate_artifacts
+from backend.performance.tracing import TRACE_KEY, record_span
 from flask_cors import CORS
 
+# Fields set by the scheduler and agents as a job moves along; never taken from a submission
+SERVER_FIELDS = frozenset((
+    'id', 'status', 'submitted_at', TRACE_KEY, 'retries', 'next_retry_at',
+    'predicted_runtime', 'timeout_predicted', 'execution_time',
+    'gang_rank', 'gang_size', 'gang_nodes', 'array_id', 'array_index',
+    'artifact_cache', 'artifact_paths', 'stop_path', 'preemptions', 'checkpoint', 'checkpoint_path'
+))
+
 class JobSubmissionAPI:
     """
     RESTful API for job submission and management
     """
-    def __init__(self, job_queue: DistributedJobQueue):
+    def __init__(self, job_queue: DistributedJobQueue, dependency_graph=None, metrics=None, tracer=None,
+                 recorder=None, max_array_size: int = 100000, artifact_source_schemes: Iterable[str] = ()):
         self.app = Flask(__name__)
         CORS(self.app, resources={r"/*": {"origins": "*"}})  # Development only
         self.job_queue = job_queue
+        self.dependency_graph = dependency_graph
+        self.metrics = metrics
+        self.tracer = tracer
+        self.recorder = recorder
+        self.max_array_size = max_array_size
+        self.artifact_source_schemes = tuple(artifact_source_schemes)
+        unsupported = set(self.artifact_source_schemes) - set(SUPPORTED_SCHEMES)
+        if unsupported:
+            raise ValueError(f"Unsupported artifact source schemes: {sorted(unsupported)}")
         self.logger = logging.getLogger('JobSubmissionAPI')
         
         # Add error handler for detailed logging
@@ -42,11 +64,13 @@ class JobSubmissionAPI:
         self.app.route('/jobs', methods=['GET'])(self.list_jobs)
         self.app.route('/jobs/<job_id>', methods=['GET'])(self.get_job_status)
         self.app.route('/jobs/<job_id>', methods=['DELETE'])(self.cancel_job)
+        self.app.route('/metrics', methods=['GET'])(self.export_metrics)
     
     def submit_job(self):
         """
         Submit a new job to the queue
         """
+        received_at = time.monotonic()
         try:
             # Log incoming request details
             self.logger.info(f"Received job submission request")
@@ -61,13 +85,38 @@ class JobSubmissionAPI:
             self.logger.info(f"Current timestamp: {current_time}")
             
             job = self._prepare_job(job_data)
-            self.job_queue.enqueue(job)
+            if 'array' in job:
+                return self._submit_array(job)
+            
+            if self.tracer is not None and self.tracer.start_trace(job, started_at=received_at):
+                record_span(job, 'api_parse', received_at, time.monotonic())
+            
+            if self.dependency_graph is None and job.get('depends_on'):
+                return jsonify({"error": "Job dependencies are not enabled"}), 400
+            
+            # Recorded first, so a job finishing right away still finds its submission
+            if self.recorder is not None:
+                self.recorder.record_submit(job)
+            try:
+                if self.dependency_graph is not None:
+                    status = self.dependency_graph.add_job(job)
+                else:
+                    self.job_queue.enqueue(job)
+                    status = "QUEUED"
+            except Exception:
+                if self.recorder is not None:
+                    self.recorder.record_finish(job['id'], 'CANCELLED')
+                raise
             
             return jsonify({
                 "job_id": job['id'],
-                "status": "QUEUED"
+                "status": status
             }), 201
         
+        except ValueError as e:
+            self.logger.warning(f"Rejected job submission: {e}")
+            return jsonify({"error": str(e)}), 400
+        
         except Exception as e:
             # Log full traceback for debugging
             self.logger.error(f"Job submission error: {e}")
@@ -78,15 +127,54 @@ class JobSubmissionAPI:
                 "trace": traceback.format_exc()
             }), 500
     
-    def _prepare_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _submit_array(self, job: Dict[str, Any]):
+        """
+        Queue a job array built from a prepared template job
+        """
+        spec = job.pop('array')
+        if not isinstance(spec, dict):
+            raise ValueError("array must be an object with start/end or size")
+        if job.get('depends_on'):
+            raise ValueError("Job arrays cannot declare dependencies")
+        
+        job_array = JobArray.from_spec(job, spec, max_size=self.max_array_size)
+        self.job_queue.enqueue_array(job_array)
+        
+        return jsonify({
+            "job_id": job_array.id,
+            "array_size": len(job_array),
+            "status": "QUEUED"
+        }), 201
+    
+    def _prepare_job(self, job_data: Dict[str, Any]) -> JobRecord:
         """
-        Validate and prepare job for submission
+        Validate and prepare job for submission, as the compact record kept while it is queued
         """
         required_fields = ['command', 'type']
         for field in required_fields:
             if field not in job_data:
                 raise ValueError(f"Missing required field: {field}")
         
+        depends_on = job_data.get('depends_on', [])
+        if not isinstance(depends_on, list) or not all(isinstance(d, str) for d in depends_on):
+            raise ValueError("depends_on must be a list of job IDs")
+        
+        nodes = job_data.get('nodes', 1)
+        if isinstance(nodes, bool) or not isinstance(nodes, int) or nodes < 1:
+            raise ValueError("nodes must be a positive integer")
+        
+        if 'artifacts' in job_data:
+            validate_artifacts(job_data['artifacts'], self.artifact_source_schemes)
+        
+        simulation_parameters = job_data.get('simulation_parameters') or {}
+        if not isinstance(simulation_parameters, dict):
+            raise ValueError("simulation_parameters must be an object")
+        restart_from = simulation_parameters.get('restart_from')
+        if restart_from is not None and restart_from not in {
+            artifact['digest'] for artifact in job_data.get('artifacts') or []
+        }:
+            raise ValueError("restart_from must be the digest of one of the job's artifacts")
+        
         # Explicitly check time module
         try:
             current_time = time.time()
@@ -95,29 +183,34 @@ class JobSubmissionAPI:
             self.logger.error(f"Time module error: {e}")
             raise
         
-        return {
-            'id': str(uuid.uuid4()),
-            'status': 'QUEUED',
-            'priority': job_data.get('priority', 5),
-            'submitted_at': time.time(),  # Explicitly use time.time()
-            'timeout': job_data.get('timeout', 3600),  # Add timeout with default
-            **job_data
-        }
+        # No default timeout: the scheduler may predict one, else the agent applies its own
+        job = JobRecord({'priority': 5})
+        for key, value in job_data.items():
+            if key not in SERVER_FIELDS:
+                job[key] = value
+        job['id'] = str(uuid.uuid4())
+        job['status'] = 'QUEUED'
+        job['submitted_at'] = time.time()  # Explicitly use time.time()
+        return job
     
     def list_jobs(self):
         """
         List all jobs in the queue
         """
         jobs = self.job_queue.get_all_jobs()
-        return jsonify(jobs), 200
+        if self.dependency_graph is not None:
+            jobs.extend(self.dependency_graph.get_waiting_jobs())
+        return jsonify([to_json(job) for job in jobs]), 200
     
     def get_job_status(self, job_id: str):
         """
         Get status of a specific job
         """
         job = self.job_queue.get_job(job_id)
+        if job is None and self.dependency_graph is not None:
+            job = self.dependency_graph.get_job(job_id)
         if job:
-            return jsonify(job), 200
+            return jsonify(to_json(job)), 200
         return jsonify({"error": "Job not found"}), 404
     
     def cancel_job(self, job_id: str):
@@ -125,13 +218,33 @@ class JobSubmissionAPI:
         Cancel a queued job
         """
         try:
-            if self.job_queue.cancel_job(job_id):
+            cancelled = self.job_queue.cancel_job(job_id)
+            if not cancelled and self.dependency_graph is not None:
+                blocked = self.dependency_graph.get_job(job_id)
+                cancelled = blocked is not None and blocked['status'] == 'BLOCKED'
+            if cancelled:
+                if self.recorder is not None:
+                    self.recorder.record_finish(job_id, 'CANCELLED')
+                if self.dependency_graph is not None:
+                    # Dependents of a cancelled job can never run
+                    self.dependency_graph.mark_failed(job_id)
                 return jsonify({"message": "Job cancelled successfully"}), 200
             return jsonify({"error": "Job not found or cannot be cancelled"}), 404
         except Exception as e:
             self.logger.error(f"Job cancellation error: {e}")
             return jsonify({"error": str(e)}), 500
     
+    def export_metrics(self):
+        """
+        Expose scheduler metrics in the Prometheus text format
+        """
+        if self.metrics is None:
+            return jsonify({"error": "Metrics are not enabled"}), 404
+        return Response(
+            self.metrics.render_prometheus(),
+            mimetype='text/plain; version=0.0.4; charset=utf-8'
+        )
+    
     def run(self, host='0.0.0.0', port=8000):
         """
         Run the Flask application
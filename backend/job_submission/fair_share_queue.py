@@ -0,0 +1,309 @@
+# File: distributed-job-scheduler/backend/job_submission/fair_share_queue.py
+
+import heapq
+import itertools
+import threading
+import time
+from typing import List, Dict, Any, Optional
+from .job_array import JobArray, JobArrayStore, split_task_id
+from backend.performance.tracing import begin_span, end_span
+
+# Rebase the usage epoch before 2 ** exponent gets anywhere near float overflow
+MAX_DECAY_EXPONENT = 512.0
+
+
+def job_owner(job: Dict[str, Any]) -> str:
+    """
+    Fair-share account a job is charged to (project first, then owner)
+    """
+    return job.get('project') or job.get('owner') or 'default'
+
+
+class FairShareJobQueue:
+    """
+    Thread-safe job queue that shares dispatch fairly across owners
+
+    Every owner gets its own priority sub-queue. Dispatch always serves the
+    owner with the lowest virtual time (decayed historical usage divided by
+    the owner's share weight), so a team submitting a huge backlog cannot
+    starve everyone else. Usage decays exponentially with ``half_life``.
+
+    Usage is stored relative to a shared epoch, which keeps the ordering of
+    owners stable as time passes; only charges move an owner in the heap,
+    so dispatch costs O(log owners).
+    """
+    def __init__(self,
+                 max_size: int = 1000,
+                 priority_levels: int = 3,
+                 half_life: float = 3600.0,
+                 weights: Optional[Dict[str, float]] = None,
+                 default_weight: float = 1.0,
+                 dispatch_cost: float = 1.0,
+                 metrics=None):
+        self.jobs = {}  # In-memory job store
+        self.max_size = max_size
+        self.priority_levels = priority_levels
+        self.half_life = half_life
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.dispatch_cost = dispatch_cost
+        self.metrics = metrics
+        self.arrays = JobArrayStore()
+        self.lock = threading.Lock()
+
+        self._sub_queues: Dict[str, List] = {}
+        self._dead: Dict[str, int] = {}  # Cancelled entries left in each sub-queue
+        self._usage: Dict[str, float] = {}  # Usage scaled to self._epoch
+        self._epoch = time.time()
+        self._owner_heap: List = []
+        self._owner_entries: Dict[str, int] = {}  # Live heap entry per owner
+        self._queued_arrays = set()  # Arrays with tasks left to dispatch
+        self._counter = itertools.count()
+
+    def enqueue(self, job: Dict[str, Any]) -> None:
+        """
+        Add a job to its owner's sub-queue
+        """
+        with self.lock:
+            self._push_job(job, job)
+            self.jobs[job['id']] = job
+            begin_span(job, 'queue_wait')
+        if self.metrics is not None:
+            self.metrics.record_enqueue(job)
+
+    def enqueue_array(self, job_array: JobArray) -> None:
+        """
+        Add a job array to its owner's sub-queue as a single entry
+        """
+        with self.lock:
+            self._push_job(job_array.template, job_array)
+            self.arrays.add(job_array)
+            self._queued_arrays.add(job_array.id)
+
+    def dequeue(self) -> Dict[str, Any]:
+        """
+        Get and remove the next job from the owner with the lowest virtual time
+        """
+        with self.lock:
+            while self._owner_heap:
+                _, entry, owner = heapq.heappop(self._owner_heap)
+                if self._owner_entries.get(owner) != entry:
+                    continue  # Superseded by a later charge
+
+                job = self._pop_live_job(owner)
+                if job is None:
+                    self._drop_owner(owner)
+                    continue
+
+                now = time.time()
+                self._charge(owner, self.dispatch_cost, now)
+                if self._sub_queues[owner]:
+                    self._push_owner(owner)
+                else:
+                    self._drop_owner(owner)
+
+                if self.metrics is not None:
+                    wait_time = now - job.get('submitted_at', now)
+                    self.metrics.record_owner_wait(owner, wait_time)
+                end_span(job, 'queue_wait')
+                return job
+            return None
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Retrieve a specific job by ID
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            job = self.arrays.get_job(job_id)
+        return job
+
+    def get_all_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Get all jobs in the queue, with one aggregated entry per job array
+        """
+        return list(self.jobs.values()) + self.arrays.summaries()
+
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancel a specific job
+
+        The sub-queue entry is dropped lazily the next time the owner is
+        served, or sooner once cancelled entries outnumber live ones in the
+        owner's sub-queue.
+        """
+        with self.lock:
+            if job_id in self.jobs:
+                job = self.jobs.pop(job_id)
+                self._discard_entry(job_owner(job))
+                return True
+            if not self.arrays.cancel(job_id):
+                return False
+            array_id = job_id if job_id in self.arrays.arrays else split_task_id(job_id)[0]
+            job_array = self.arrays.arrays.get(array_id)
+            if job_array is not None and job_array.id in self._queued_arrays \
+                    and not job_array.has_pending():
+                self._queued_arrays.discard(job_array.id)
+                self._discard_entry(job_owner(job_array.template))
+            return True
+
+    def update_job_status(self, job_id: str, status: str) -> None:
+        """
+        Update status of a specific job
+        """
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id]['status'] = status
+            else:
+                self.arrays.update_status(job_id, status)
+
+    def record_usage(self, owner: str, amount: float, timestamp: Optional[float] = None) -> None:
+        """
+        Charge consumed resources (e.g. core-seconds of a finished job) to an owner
+        """
+        with self.lock:
+            self._charge(owner, amount, timestamp or time.time())
+            if owner in self._owner_entries:
+                self._push_owner(owner)
+
+    def set_weight(self, owner: str, weight: float) -> None:
+        """
+        Change an owner's share weight
+        """
+        if weight <= 0:
+            raise ValueError("Share weight must be positive")
+        with self.lock:
+            self.weights[owner] = weight
+            if owner in self._owner_entries:
+                self._push_owner(owner)
+
+    def get_owner_usage(self) -> Dict[str, float]:
+        """
+        Current decayed usage per owner
+        """
+        with self.lock:
+            scale = 2.0 ** (-(time.time() - self._epoch) / self.half_life)
+            return {owner: usage * scale for owner, usage in self._usage.items()}
+
+    def _queue_priority(self, job: Dict[str, Any]):
+        """
+        Sub-queue ordering key, matching DistributedJobQueue
+        """
+        priority = max(0, min(job.get('priority', self.priority_levels // 2),
+                              self.priority_levels - 1))
+
+        # Lower number = higher priority
+        return (priority, job.get('submitted_at', time.time()))
+
+    def _push_job(self, job: Dict[str, Any], item) -> None:
+        if len(self.jobs) + len(self._queued_arrays) >= self.max_size:
+            raise Exception("Job queue is full")
+
+        owner = job_owner(job)
+        sub_queue = self._sub_queues.setdefault(owner, [])
+        heapq.heappush(sub_queue, (*self._queue_priority(job), next(self._counter), item))
+
+        if owner not in self._owner_entries:
+            self._push_owner(owner)
+
+    def _pop_live_job(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Pop the owner's best job, discarding entries cancelled since enqueue
+
+        Job arrays yield one lazily expanded task and stay queued while they
+        have tasks left.
+        """
+        sub_queue = self._sub_queues[owner]
+        while sub_queue:
+            entry = heapq.heappop(sub_queue)
+            item = entry[-1]
+            if isinstance(item, JobArray):
+                task = item.next_task()
+                if item.has_pending():
+                    heapq.heappush(sub_queue, entry)
+                else:
+                    self._queued_arrays.discard(item.id)
+                if task is not None:
+                    return task
+            elif self.jobs.get(item['id']) is item:
+                del self.jobs[item['id']]
+                return item
+            dead = self._dead.get(owner, 0) - 1
+            if dead > 0:
+                self._dead[owner] = dead
+            else:
+                self._dead.pop(owner, None)
+        return None
+
+    def _is_live(self, item) -> bool:
+        if isinstance(item, JobArray):
+            return item.has_pending()
+        return self.jobs.get(item['id']) is item
+
+    def _discard_entry(self, owner: str) -> None:
+        """
+        Count a cancelled entry, compacting the sub-queue once most of it is dead
+        """
+        sub_queue = self._sub_queues.get(owner)
+        if sub_queue is None:
+            return
+        dead = self._dead.get(owner, 0) + 1
+        if dead <= len(sub_queue) - dead:
+            self._dead[owner] = dead
+            return
+
+        sub_queue = [entry for entry in sub_queue if self._is_live(entry[-1])]
+        self._dead.pop(owner, None)
+        if sub_queue:
+            heapq.heapify(sub_queue)
+            self._sub_queues[owner] = sub_queue
+        else:
+            self._drop_owner(owner)
+
+    def _drop_owner(self, owner: str) -> None:
+        """
+        Forget an owner with nothing queued; its heap entry goes stale
+        """
+        self._sub_queues.pop(owner, None)
+        self._dead.pop(owner, None)
+        self._owner_entries.pop(owner, None)
+
+    def _virtual_time(self, owner: str) -> float:
+        return self._usage.get(owner, 0.0) / self.weights.get(owner, self.default_weight)
+
+    def _push_owner(self, owner: str) -> None:
+        if len(self._owner_heap) > 2 * len(self._owner_entries) + 64:
+            # Too many superseded entries, drop them
+            self._owner_heap = [
+                item for item in self._owner_heap
+                if self._owner_entries.get(item[2]) == item[1]
+            ]
+            heapq.heapify(self._owner_heap)
+
+        entry = next(self._counter)
+        self._owner_entries[owner] = entry
+        heapq.heappush(self._owner_heap, (self._virtual_time(owner), entry, owner))
+
+    def _charge(self, owner: str, amount: float, timestamp: float) -> None:
+        exponent = (timestamp - self._epoch) / self.half_life
+        if exponent > MAX_DECAY_EXPONENT:
+            self._rebase(timestamp)
+            exponent = 0.0
+        self._usage[owner] = self._usage.get(owner, 0.0) + amount * 2.0 ** exponent
+
+    def _rebase(self, timestamp: float) -> None:
+        """
+        Move the usage epoch forward and rebuild the owner heap (rare, O(owners))
+        """
+        scale = 2.0 ** (-(timestamp - self._epoch) / self.half_life)
+        self._usage = {
+            owner: usage * scale for owner, usage in self._usage.items()
+            if usage * scale > 0.0
+        }
+        self._epoch = timestamp
+
+        pending = list(self._owner_entries)
+        self._owner_heap = []
+        self._owner_entries = {}
+        for owner in pending:
+            self._push_owner(owner)
@@ -0,0 +1,257 @@
+# File: distributed-job-scheduler/backend/job_submission/job_array.py
+
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+# Per-task status codes, stored one byte per task
+TASK_STATUSES = ('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED')
+TASK_STATUS_CODES = {status: code for code, status in enumerate(TASK_STATUSES)}
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = range(len(TASK_STATUSES))
+
+
+def split_task_id(task_id: str):
+    """
+    Split an array task id ``<array_id>_<index>`` into its parts
+    """
+    array_id, _, index = task_id.rpartition('_')
+    if not array_id or not index.lstrip('-').isdigit():
+        return None, None
+    return array_id, int(index)
+
+
+class JobArray:
+    """
+    Parametric sweep stored as one job template plus an index range
+
+    Tasks are only materialized into job dicts when they are dispatched
+    (or looked up), so a pending task costs a single status byte. Indices
+    run from ``start`` to ``end`` inclusive; ``overrides`` maps an index to
+    fields that replace the template's for that task, with nested dicts
+    such as ``simulation_parameters`` merged one level deep.
+    """
+    def __init__(self,
+                 template: Dict[str, Any],
+                 start: int,
+                 end: int,
+                 overrides: Optional[Dict[int, Dict[str, Any]]] = None):
+        if end < start:
+            raise ValueError("Job array end must not be before start")
+
+        self.id = template['id']
+        self.template = template
+        self.start = start
+        self.end = end
+        self.overrides = {int(index): fields for index, fields in (overrides or {}).items()}
+        self.next_offset = 0  # Tasks before this offset have left the queue
+        self.status_codes = bytearray(end - start + 1)  # All QUEUED
+        self.status_counts = [0] * len(TASK_STATUSES)
+        self.status_counts[QUEUED] = len(self.status_codes)
+        self.lock = threading.Lock()
+
+        for index in self.overrides:
+            if not start <= index <= end:
+                raise ValueError(f"Override index {index} outside array range")
+
+    @classmethod
+    def from_spec(cls, template: Dict[str, Any], spec: Dict[str, Any],
+                  max_size: Optional[int] = None) -> 'JobArray':
+        """
+        Build an array from the API's ``array`` field, at most ``max_size`` tasks long
+        """
+        if 'size' in spec:
+            start = int(spec.get('start', 0))
+            end = start + int(spec['size']) - 1
+        else:
+            start, end = int(spec['start']), int(spec['end'])
+        if max_size is not None and end - start + 1 > max_size:
+            raise ValueError(f"Job arrays may have at most {max_size} tasks")
+        return cls(template, start, end, spec.get('overrides'))
+
+    def __len__(self) -> int:
+        return len(self.status_codes)
+
+    def has_pending(self) -> bool:
+        with self.lock:
+            return self._skip_cancelled() < len(self.status_codes)
+
+    def next_task(self) -> Optional[Dict[str, Any]]:
+        """
+        Materialize the next queued task and mark it running
+        """
+        with self.lock:
+            offset = self._skip_cancelled()
+            if offset >= len(self.status_codes):
+                return None
+            self.next_offset = offset + 1
+            self._set_code(offset, RUNNING)
+        return self.materialize(self.start + offset, 'RUNNING')
+
+    def materialize(self, index: int, status: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the job for one task, a record if the template is one
+        """
+        task = self.template.copy()
+        for key, value in self.overrides.get(index, {}).items():
+            if isinstance(value, dict) and isinstance(task.get(key), dict):
+                task[key] = {**task[key], **value}
+            else:
+                task[key] = value
+
+        task['id'] = f"{self.id}_{index}"
+        task['array_id'] = self.id
+        task['array_index'] = index
+        task['status'] = status or self.task_status(index)
+        return task
+
+    def task_status(self, index: int) -> Optional[str]:
+        if not self.start <= index <= self.end:
+            return None
+        return TASK_STATUSES[self.status_codes[index - self.start]]
+
+    def update_task_status(self, index: int, status: str) -> bool:
+        if not self.start <= index <= self.end or status not in TASK_STATUS_CODES:
+            return False
+        with self.lock:
+            self._set_code(index - self.start, TASK_STATUS_CODES[status])
+        return True
+
+    def cancel(self, index: Optional[int] = None) -> bool:
+        """
+        Cancel one queued task, or every still-queued task when no index is given
+        """
+        with self.lock:
+            if index is not None:
+                if not self.start <= index <= self.end:
+                    return False
+                offset = index - self.start
+                if self.status_codes[offset] != QUEUED:
+                    return False
+                self._set_code(offset, CANCELLED)
+                return True
+
+            cancelled = False
+            for offset in range(self.next_offset, len(self.status_codes)):
+                if self.status_codes[offset] == QUEUED:
+                    self._set_code(offset, CANCELLED)
+                    cancelled = True
+            return cancelled
+
+    def finished(self) -> bool:
+        """
+        True once no task is queued or running
+        """
+        return not self.status_counts[QUEUED] and not self.status_counts[RUNNING]
+
+    def aggregate_status(self) -> str:
+        counts = self.status_counts
+        if counts[RUNNING]:
+            return 'RUNNING'
+        if counts[QUEUED]:
+            return 'QUEUED' if counts[QUEUED] == len(self) else 'RUNNING'
+        if counts[FAILED]:
+            return 'FAILED'
+        if counts[COMPLETED]:
+            return 'COMPLETED'
+        return 'CANCELLED'
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregated view of the array used for API listing
+        """
+        with self.lock:
+            return {
+                'id': self.id,
+                'type': self.template.get('type'),
+                'command': self.template.get('command'),
+                'priority': self.template.get('priority'),
+                'submitted_at': self.template.get('submitted_at'),
+                'array': {'start': self.start, 'end': self.end, 'size': len(self)},
+                'status': self.aggregate_status(),
+                'task_counts': {
+                    status: self.status_counts[code] for code, status in enumerate(TASK_STATUSES)
+                }
+            }
+
+    def _skip_cancelled(self) -> int:
+        offset = self.next_offset
+        while offset < len(self.status_codes) and self.status_codes[offset] != QUEUED:
+            offset += 1
+        self.next_offset = offset
+        return offset
+
+    def _set_code(self, offset: int, code: int) -> None:
+        self.status_counts[self.status_codes[offset]] -= 1
+        self.status_counts[code] += 1
+        self.status_codes[offset] = code
+
+
+class JobArrayStore:
+    """
+    Registry of job arrays shared by the queue implementations
+
+    Arrays stay registered after their last task is dispatched so that
+    status lookups keep working; of the arrays whose tasks have all
+    finished, only the ``max_finished`` most recent are kept.
+    """
+    def __init__(self, max_finished: int = 1000):
+        self.arrays: Dict[str, JobArray] = {}
+        self.max_finished = max_finished
+        self.finished: "OrderedDict[str, None]" = OrderedDict()  # Oldest first
+
+    def add(self, job_array: JobArray) -> None:
+        self.arrays[job_array.id] = job_array
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Summary of an array, or a single task materialized on demand
+        """
+        job_array = self.arrays.get(job_id)
+        if job_array is not None:
+            return job_array.summary()
+
+        job_array, index = self._find_task(job_id)
+        return job_array.materialize(index) if job_array is not None else None
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return [job_array.summary() for job_array in self.arrays.values()]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a whole array or a single queued task
+        """
+        job_array = self.arrays.get(job_id)
+        if job_array is not None:
+            cancelled = job_array.cancel()
+        else:
+            job_array, index = self._find_task(job_id)
+            cancelled = job_array.cancel(index) if job_array is not None else False
+        if cancelled:
+            self._retire_if_finished(job_array)
+        return cancelled
+
+    def update_status(self, job_id: str, status: str) -> bool:
+        job_array, index = self._find_task(job_id)
+        if job_array is None or not job_array.update_task_status(index, status):
+            return False
+        self._retire_if_finished(job_array)
+        return True
+
+    def _retire_if_finished(self, job_array: JobArray) -> None:
+        """
+        Track a finished array and forget the oldest beyond ``max_finished``
+        """
+        if not job_array.finished():
+            return
+        self.finished[job_array.id] = None
+        self.finished.move_to_end(job_array.id)
+        while len(self.finished) > self.max_finished:
+            array_id, _ = self.finished.popitem(last=False)
+            self.arrays.pop(array_id, None)
+
+    def _find_task(self, task_id: str):
+        array_id, index = split_task_id(task_id)
+        job_array = self.arrays.get(array_id)
+        if job_array is None or job_array.task_status(index) is None:
+            return None, None
+        return job_array, index
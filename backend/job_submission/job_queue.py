@@ -1,61 +1,100 @@
 # File: distributed-job-scheduler/backend/job_submission/job_queue.py
 
+import itertools
 import threading
 from queue import PriorityQueue
 import time
 from typing import List, Dict, Any
+from .job_array import JobArray, JobArrayStore
+from backend.performance.tracing import begin_span, end_span
 
 class DistributedJobQueue:
     """
     Thread-safe distributed job queue with advanced features
     """
-    def __init__(self, max_size: int = 1000, priority_levels: int = 3):
+    def __init__(self, max_size: int = 1000, priority_levels: int = 3, metrics=None):
         self.queue = PriorityQueue(maxsize=max_size)
         self.jobs = {}  # In-memory job store
         self.max_size = max_size
         self.priority_levels = priority_levels
+        self.metrics = metrics
+        self.arrays = JobArrayStore()
         self.lock = threading.Lock()
+        self._counter = itertools.count()  # Tie-breaker for equal priorities
     
     def enqueue(self, job: Dict[str, Any]) -> None:
         """
         Add a job to the queue
         """
         with self.lock:
-            if len(self.jobs) >= self.max_size:
+            if self.queue.qsize() >= self.max_size:
                 raise Exception("Job queue is full")
             
-            # Normalize priority
-            priority = max(0, min(job.get('priority', self.priority_levels // 2), 
-                                   self.priority_levels - 1))
-            
-            # Lower number = higher priority
-            queue_priority = (priority, job.get('submitted_at', time.time()))
-            
-            self.queue.put((queue_priority, job))
+            # Flat entries: a nested key tuple would cost another object per queued job
+            self.queue.put((*self._queue_priority(job), next(self._counter), job))
             self.jobs[job['id']] = job
+            begin_span(job, 'queue_wait')
+        if self.metrics is not None:
+            self.metrics.record_enqueue(job)
+    
+    def enqueue_array(self, job_array: JobArray) -> None:
+        """
+        Add a job array; it occupies a single queue slot until its last task leaves
+        """
+        with self.lock:
+            if self.queue.qsize() >= self.max_size:
+                raise Exception("Job queue is full")
+            
+            self.queue.put((*self._queue_priority(job_array.template), next(self._counter), job_array))
+            self.arrays.add(job_array)
     
     def dequeue(self) -> Dict[str, Any]:
         """
         Get and remove the next job from the queue
         """
         with self.lock:
-            if not self.queue.empty():
-                _, job = self.queue.get()
-                del self.jobs[job['id']]
-                return job
+            while not self.queue.empty():
+                entry = self.queue.get()
+                item = entry[-1]
+                if isinstance(item, JobArray):
+                    # Expand array tasks lazily, one per dequeue
+                    task = item.next_task()
+                    if item.has_pending():
+                        self.queue.put(entry)
+                    if task is None:
+                        continue
+                    return task
+                
+                del self.jobs[item['id']]
+                end_span(item, 'queue_wait')
+                return item
             return None
     
+    def _queue_priority(self, job: Dict[str, Any]):
+        """
+        Ordering key for a job (lower number = higher priority)
+        """
+        # Normalize priority
+        priority = max(0, min(job.get('priority', self.priority_levels // 2), 
+                               self.priority_levels - 1))
+        
+        # Lower number = higher priority
+        return (priority, job.get('submitted_at', time.time()))
+    
     def get_job(self, job_id: str) -> Dict[str, Any]:
         """
         Retrieve a specific job by ID
         """
-        return self.jobs.get(job_id)
+        job = self.jobs.get(job_id)
+        if job is None:
+            job = self.arrays.get_job(job_id)
+        return job
     
     def get_all_jobs(self) -> List[Dict[str, Any]]:
         """
-        Get all jobs in the queue
+        Get all jobs in the queue, with one aggregated entry per job array
         """
-        return list(self.jobs.values())
+        return list(self.jobs.values()) + self.arrays.summaries()
     
     def cancel_job(self, job_id: str) -> bool:
         """
@@ -70,12 +109,14 @@ class DistributedJobQueue:
                 temp_queue = PriorityQueue()
                 while not self.queue.empty():
                     item = self.queue.get()
-                    if item[1]['id'] != job_id:
+                    if isinstance(item[-1], JobArray) or item[-1]['id'] != job_id:
                         temp_queue.put(item)
                 
                 self.queue = temp_queue
                 return True
-            return False
+            
+            # Cancelled array tasks are skipped when the array is next dequeued
+            return self.arrays.cancel(job_id)
     
     def update_job_status(self, job_id: str, status: str) -> None:
         """
@@ -83,4 +124,6 @@ class DistributedJobQueue:
         """
         with self.lock:
             if job_id in self.jobs:
-                self.jobs[job_id]['status'] = status
\ No newline at end of file
+                self.jobs[job_id]['status'] = status
+            else:
+                self.arrays.update_status(job_id, status)
@@ -0,0 +1,225 @@
+# File: distributed-job-scheduler/backend/job_submission/job_record.py
+
+import enum
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, Any, Iterator, Optional
+
+
+class JobStatus(enum.IntEnum):
+    """
+    Job lifecycle states, stored on a record as a small integer code
+    """
+    PENDING = 0
+    QUEUED = 1
+    BLOCKED = 2
+    RUNNING = 3
+    COMPLETED = 4
+    FAILED = 5
+    RETRY = 6
+    CANCELLED = 7
+    PREEMPTED = 8
+    UPSTREAM_FAILED = 9
+
+
+# Top-level job fields with a slot of their own; anything else lives in ``extra``
+FIELDS = ('id', 'type', 'priority', 'submitted_at', 'command', 'timeout', 'retries', 'trace')
+
+# Resource requirements kept as structured fields rather than a nested dict
+RESOURCE_FIELDS = ('cpu_cores', 'memory_gb', 'gpu_required')
+
+_FIELD_SET = frozenset(FIELDS)
+_RESOURCE_SET = frozenset(RESOURCE_FIELDS)
+# Repeated across many jobs (every task of a sweep runs the same command), so stored once
+_INTERNED = frozenset(('type', 'command'))
+_STATUS_NAMES = tuple(status.name for status in JobStatus)
+_MISSING = object()
+
+
+class JobRecord(MutableMapping):
+    """
+    Compact in-memory job, readable and writable like the job dicts it replaces
+
+    Queued jobs used to be dicts holding the raw request, which costs a
+    hash table per job plus another for ``resources``. A record keeps the
+    common fields in ``__slots__``: the status as a ``JobStatus`` code,
+    the type and command as interned strings shared by every job with the
+    same value, and ``cpu_cores``/``memory_gb``/``gpu_required`` as plain
+    attributes. Any
+    other field (``simulation_parameters``, ``depends_on``, checkpoint
+    paths, ...) goes into ``extra``, which stays ``None`` until needed.
+
+    Scheduler, queue and agent code keeps using ``job['id']`` and
+    ``job.get('resources', {})``; reading ``resources`` builds a fresh
+    dict, so resource changes must assign the whole field. Records are
+    not JSON-serializable themselves: the API and RPC edges convert with
+    ``from_dict`` and ``to_dict``.
+    """
+    __slots__ = FIELDS + ('status_code',) + RESOURCE_FIELDS + ('extra',)
+
+    def __init__(self, fields: Optional[Dict[str, Any]] = None):
+        self.extra: Optional[Dict[str, Any]] = None
+        if fields:
+            for key, value in fields.items():
+                self[key] = value
+
+    @classmethod
+    def from_dict(cls, fields: Dict[str, Any]) -> 'JobRecord':
+        return cls(fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain dict with the same fields, for JSON responses and RPC messages
+        """
+        return {key: self[key] for key in self}
+
+    def copy(self) -> 'JobRecord':
+        clone = JobRecord.__new__(JobRecord)
+        for slot in JobRecord.__slots__:
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                setattr(clone, slot, value)
+        if self.extra is not None:
+            clone.extra = dict(self.extra)
+        return clone
+
+    @property
+    def status(self) -> Optional[JobStatus]:
+        code = getattr(self, 'status_code', None)
+        return None if code is None else JobStatus(code)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if key == 'status':
+            code = getattr(self, 'status_code', None)
+            if code is not None:
+                return _STATUS_NAMES[code]
+        elif key == 'resources':
+            resources = self._resources()
+            if resources is not None:
+                return resources
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Avoids raising KeyError for absent fields, which callers probe often
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if key == 'status':
+            code = getattr(self, 'status_code', None)
+            if code is not None:
+                return _STATUS_NAMES[code]
+        elif key == 'resources':
+            resources = self._resources()
+            if resources is not None:
+                return resources
+        return default if self.extra is None else self.extra.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if key in _INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        elif key == 'status' and value in JobStatus.__members__:
+            self._drop_extra(key)
+            self.status_code = JobStatus[value].value
+        elif key == 'resources' and isinstance(value, dict) and value.keys() <= _RESOURCE_SET:
+            self._drop_extra(key)
+            self._clear_resources()
+            for name, amount in value.items():
+                setattr(self, name, amount)
+        else:
+            # Unknown statuses and unusual resource specs are kept as given
+            if key in ('status', 'resources'):
+                self._delete_structured(key)
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif key in ('status', 'resources') and self._delete_structured(key):
+            pass
+        elif not self._drop_extra(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        if key == 'status' and hasattr(self, 'status_code'):
+            return True
+        if key == 'resources' and any(hasattr(self, name) for name in RESOURCE_FIELDS):
+            return True
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if hasattr(self, 'status_code'):
+            yield 'status'
+        if any(hasattr(self, name) for name in RESOURCE_FIELDS):
+            yield 'resources'
+        if self.extra is not None:
+            yield from list(self.extra)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'JobRecord({self.to_dict()!r})'
+
+    def __reduce__(self):
+        return JobRecord, (self.to_dict(),)
+
+    def _resources(self) -> Optional[Dict[str, Any]]:
+        resources = None
+        for name in RESOURCE_FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                if resources is None:
+                    resources = {}
+                resources[name] = value
+        return resources
+
+    def _clear_resources(self) -> None:
+        for name in RESOURCE_FIELDS:
+            if hasattr(self, name):
+                delattr(self, name)
+
+    def _drop_extra(self, key: str) -> bool:
+        if self.extra is None or key not in self.extra:
+            return False
+        del self.extra[key]
+        if not self.extra:
+            self.extra = None
+        return True
+
+    def _delete_structured(self, key: str) -> bool:
+        """
+        Drop the slot-backed form of ``status`` or ``resources``; True if it was set
+        """
+        if key == 'status':
+            if not hasattr(self, 'status_code'):
+                return False
+            del self.status_code
+            return True
+        had_resources = any(hasattr(self, name) for name in RESOURCE_FIELDS)
+        self._clear_resources()
+        return had_resources
+
+
+def to_json(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON-serializable form of a job, whether a ``JobRecord`` or a plain dict
+    """
+    return job.to_dict() if isinstance(job, JobRecord) else job
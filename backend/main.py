@@ -1,14 +1,14 @@
 # File: distributed-job-scheduler/backend/main.py
 
 import logging
+import threading
 import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Tuple
 from backend.config import Config
-from scheduler.scheduler import Scheduler
-from node_agent.agent import NodeAgent
-from job_submission.api import JobSubmissionAPI
-from job_submission.job_queue import DistributedJobQueue
-from fault_tolerance.heartbeat import HeartbeatMonitor
-from performance.metrics import PerformanceMetrics
+
+if TYPE_CHECKING:
+    from backend.job_submission.api import JobSubmissionAPI
 
 class NodeRegistry:
     """
@@ -16,10 +16,14 @@ class NodeRegistry:
     """
     def __init__(self):
         self.nodes = []
+        self.node_handles = {}
     
     def get_active_nodes(self):
         return self.nodes
     
+    def get_node(self, node_id):
+        return self.node_handles.get(node_id)
+    
     def mark_node_inactive(self, node_id):
         pass
     
@@ -35,52 +39,280 @@ def setup_logging():
         format=Config.LOG_FORMAT
     )
 
-def main():
-    # Setup logging
-    setup_logging()
+def start_local_heartbeats(heartbeat_monitor, node_agent, interval: float):
+    """
+    Report the in-process agent, with its artifact cache listing, every interval
+    """
+    def send_heartbeats():
+        while True:
+            heartbeat_monitor.record_heartbeat(node_agent.node_id, resources=node_agent.heartbeat_resources())
+            time.sleep(interval)
+
+    threading.Thread(target=send_heartbeats, name='LocalHeartbeats', daemon=True).start()
+
+def start_gang_scheduling(scheduler, interval: float):
+    """
+    Place waiting gang jobs every interval; agents pulling work never receive them
+    """
+    def schedule_gangs():
+        while True:
+            try:
+                if scheduler.gang_scheduler.pending:
+                    scheduler.schedule_gangs()
+            except Exception as e:
+                logging.getLogger('DistributedJobScheduler').error(f"Gang scheduling failed: {e}")
+            time.sleep(interval)
+
+    threading.Thread(target=schedule_gangs, name='GangScheduling', daemon=True).start()
+
+def run_in_background(name: str, target: Callable, *args) -> Future:
+    """
+    Run a slow initialization step on a daemon thread so the rest of startup goes on
+
+    The returned future holds the step's outcome; a failure is logged too.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(target(*args))
+        except BaseException as e:
+            logging.getLogger('DistributedJobScheduler').error(f"{name} failed: {e}")
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
+
+def interrupt_on_failure(future: Future):
+    """
+    Interrupt the main thread, and so the API server, when a background step fails
+    """
+    if future.exception() is not None:
+        import _thread
+        _thread.interrupt_main()
+
+def start_monitors(node_registry, node_agent, job_queue, artifact_registry):
+    """
+    Start resource and heartbeat monitoring
+
+    Both pull in numpy, which nothing on the way to serving needs, so
+    this runs in the background while the API comes up.
+    """
+    from backend.node_agent.resource_monitor import ResourceMonitor
+    from backend.fault_tolerance.heartbeat import HeartbeatMonitor
+
+    resource_monitor = ResourceMonitor(
+        monitoring_interval=Config.METRICS_COLLECTION_INTERVAL,
+        sample_interval=Config.RESOURCE_SAMPLE_INTERVAL,
+        history_size=Config.RESOURCE_HISTORY_SIZE,
+        worker_pids=node_agent.worker_pids
+    )
+    resource_monitor.start_continuous_monitoring()
+
+    failure_detector = None
+    if Config.FAILURE_DETECTOR == 'phi':
+        from backend.fault_tolerance.phi_accrual import PhiAccrualDetector
+        failure_detector = PhiAccrualDetector(
+            threshold=Config.PHI_THRESHOLD,
+            window_size=Config.PHI_WINDOW_SIZE,
+            first_interval=Config.NODE_AGENT_HEARTBEAT_INTERVAL
+        )
+    heartbeat_monitor = HeartbeatMonitor(
+        node_registry=node_registry, 
+        check_interval=Config.NODE_AGENT_HEARTBEAT_INTERVAL,
+        failure_detector=failure_detector,
+        requeue_job=job_queue.enqueue,
+        redistribution_rate=Config.REDISTRIBUTION_RATE or None,
+        redistribution_burst=Config.REDISTRIBUTION_BURST,
+        artifact_registry=artifact_registry
+    )
+    heartbeat_monitor.start_monitoring()
+    if node_agent.artifact_cache is not None:
+        start_local_heartbeats(heartbeat_monitor, node_agent, Config.NODE_AGENT_HEARTBEAT_INTERVAL)
+
+def start_services() -> Tuple['JobSubmissionAPI', Future]:
+    """
+    Build and start every component
+
+    Returns the job submission API and a future for the monitors, which
+    are still starting; ``main`` stops serving if they fail.
+
+    Modules are imported here rather than at the top of the file, and
+    optional ones only when configured, so startup pays only for what
+    it uses and the time measured against ``STARTUP_TIME_BUDGET``
+    includes imports. Worker processes and the monitors start on
+    background threads; jobs arriving before the workers are up spawn
+    them on demand.
+    """
     logger = logging.getLogger('DistributedJobScheduler')
+    started = time.perf_counter()
+
+    from backend.job_submission.api import JobSubmissionAPI
+    from backend.job_submission.job_queue import DistributedJobQueue
+    from backend.node_agent.agent import NodeAgent, parse_executor_sizes
+    from backend.performance.metrics import PerformanceMetrics
+    from backend.performance.tracing import Tracer
+    from backend.scheduler.locality import ArtifactRegistry
+    from backend.scheduler.scheduler import Scheduler
+
+    # Validate configuration
+    Config.validate_config()
     
-    try:
-        # Validate configuration
-        Config.validate_config()
-        
-        # Initialize node registry
-        node_registry = NodeRegistry()
-        
-        # Initialize core components
+    # Initialize node registry
+    node_registry = NodeRegistry()
+    
+    # The local agent starts without workers; they come up alongside the rest of startup
+    artifact_cache = None
+    if Config.ARTIFACT_CACHE_DIR:
+        from backend.node_agent.artifact_cache import ArtifactCache
+        artifact_cache = ArtifactCache(Config.ARTIFACT_CACHE_DIR, max_bytes=Config.ARTIFACT_CACHE_MAX_BYTES)
+    node_agent = NodeAgent(
+        max_workers=Config.NODE_AGENT_MAX_WORKERS,
+        checkpoint_dir=Config.CHECKPOINT_DIR or None,
+        executor_sizes=parse_executor_sizes(Config.NODE_AGENT_EXECUTORS),
+        start_method=Config.NODE_AGENT_START_METHOD,
+        preload=tuple(filter(None, Config.NODE_AGENT_PRELOAD_MODULES.split(','))),
+        artifact_cache=artifact_cache,
+        lazy_workers=True,
+        shared_result_min_bytes=Config.NODE_AGENT_SHARED_RESULT_MIN_BYTES or None
+    )
+    if Config.NODE_AGENT_PREWARM_WORKERS:
+        run_in_background('StartWorkers', node_agent.start_workers)
+    
+    # Initialize performance metrics
+    metrics_collector = PerformanceMetrics(
+        collection_interval=Config.METRICS_COLLECTION_INTERVAL
+    )
+    metrics_collector.start_periodic_reporting()
+    tracer = Tracer(sample_rate=Config.TRACE_SAMPLE_RATE, path=Config.TRACE_FILE)
+    recorder = None
+    if Config.WORKLOAD_TRACE_DIR:
+        from backend.performance.workload_trace import WorkloadRecorder
+        recorder = WorkloadRecorder(
+            Config.WORKLOAD_TRACE_DIR,
+            max_bytes=Config.WORKLOAD_TRACE_MAX_BYTES,
+            max_files=Config.WORKLOAD_TRACE_MAX_FILES
+        )
+    
+    # Initialize core components
+    if Config.FAIR_SHARE_ENABLED:
+        from backend.job_submission.fair_share_queue import FairShareJobQueue
+        job_queue = FairShareJobQueue(
+            max_size=Config.JOB_QUEUE_MAX_SIZE,
+            priority_levels=Config.JOB_QUEUE_PRIORITY_LEVELS,
+            half_life=Config.FAIR_SHARE_HALF_LIFE,
+            metrics=metrics_collector
+        )
+    else:
         job_queue = DistributedJobQueue(
             max_size=Config.JOB_QUEUE_MAX_SIZE,
-            priority_levels=Config.JOB_QUEUE_PRIORITY_LEVELS
+            priority_levels=Config.JOB_QUEUE_PRIORITY_LEVELS,
+            metrics=metrics_collector
         )
-        
-        node_agent = NodeAgent(
-            max_workers=Config.NODE_AGENT_MAX_WORKERS
+    # Queue length is read when metrics are scraped rather than on every change
+    metrics_collector.queue_length.set_function(lambda: len(job_queue.jobs))
+    
+    # Make the local agent reachable by the scheduler, over RPC when configured
+    if Config.NODE_AGENT_RPC_ADDRESS:
+        from backend.rpc.transport import AgentRPCServer, AgentRPCClient
+        rpc_server = AgentRPCServer(node_agent, Config.NODE_AGENT_RPC_ADDRESS)
+        rpc_server.start()
+        node_registry.node_handles[node_agent.node_id] = AgentRPCClient(
+            rpc_server.address, pool_size=Config.NODE_AGENT_RPC_POOL_SIZE
         )
-        
-        # Initialize performance metrics
-        metrics_collector = PerformanceMetrics(
-            collection_interval=Config.METRICS_COLLECTION_INTERVAL
+    else:
+        node_registry.node_handles[node_agent.node_id] = node_agent
+    
+    # Initialize scheduler with job queue and node registry
+    preemption_policy = None
+    if Config.PREEMPTION_ENABLED:
+        from backend.scheduler.preemption import PreemptionPolicy
+        preemption_policy = PreemptionPolicy(
+            max_priority=Config.PREEMPTION_MAX_PRIORITY,
+            priority_levels=Config.JOB_QUEUE_PRIORITY_LEVELS
         )
-        metrics_collector.start_periodic_reporting()
-        
-        # Initialize job submission API
-        job_api = JobSubmissionAPI(job_queue)
-        
-        # Initialize scheduler with job queue and node registry
-        scheduler = Scheduler(job_queue, node_registry)
-        
-        # Initialize heartbeat monitoring with node registry
-        heartbeat_monitor = HeartbeatMonitor(
-            node_registry=node_registry, 
-            check_interval=Config.NODE_AGENT_HEARTBEAT_INTERVAL
+    runtime_predictor = None
+    if Config.RUNTIME_PREDICTION_ENABLED:
+        from backend.scheduler.runtime_predictor import RuntimePredictor
+        runtime_predictor = RuntimePredictor(
+            forgetting=Config.RUNTIME_PREDICTION_FORGETTING,
+            min_samples=Config.RUNTIME_PREDICTION_MIN_SAMPLES
         )
-        heartbeat_monitor.start_monitoring()
-        
-        # Start job submission API
-        job_api.run(
-            host=Config.SCHEDULER_HOST, 
-            port=Config.SCHEDULER_PORT
+    # Which nodes cache which job inputs, fed by heartbeats
+    artifact_registry = ArtifactRegistry()
+    placement_policy = None
+    if Config.ARTIFACT_LOCALITY_WEIGHT > 0:
+        from backend.scheduler.locality import LocalityPlacement
+        placement_policy = LocalityPlacement(artifact_registry, Config.ARTIFACT_LOCALITY_WEIGHT)
+    scheduler = Scheduler(
+        job_queue,
+        node_registry,
+        preemption_policy=preemption_policy,
+        metrics=metrics_collector,
+        tracer=tracer,
+        recorder=recorder,
+        runtime_predictor=runtime_predictor,
+        artifact_registry=artifact_registry,
+        placement_policy=placement_policy
+    )
+    
+    # Report job outcomes from the local agent back to the scheduler
+    node_agent.on_job_complete = lambda job, result: scheduler.handle_job_completion(
+        job['id'], job.get('gang_rank'), job.get('execution_time')
+    )
+    node_agent.on_job_failure = lambda job, error: scheduler.handle_job_failure(
+        job['id'], node_agent.node_id
+    )
+    node_agent.on_jobs_stolen = scheduler.handle_jobs_stolen
+    if Config.NODE_AGENT_DISPATCH_MODE == 'pull':
+        node_agent.start_pulling(
+            scheduler.request_work,
+            low_water_mark=Config.NODE_AGENT_LOW_WATER_MARK
         )
+        start_gang_scheduling(scheduler, Config.GANG_SCHEDULING_INTERVAL)
+    
+    # Initialize job submission API; jobs are registered with the scheduler's dependency DAG
+    job_api = JobSubmissionAPI(
+        job_queue,
+        dependency_graph=scheduler.dependency_graph,
+        metrics=metrics_collector,
+        tracer=tracer,
+        recorder=recorder,
+        max_array_size=Config.JOB_ARRAY_MAX_SIZE,
+        artifact_source_schemes=tuple(filter(None, Config.ARTIFACT_SOURCE_SCHEMES.split(',')))
+    )
+    
+    monitors = run_in_background(
+        'StartMonitors', start_monitors, node_registry, node_agent, job_queue, artifact_registry
+    )
+    
+    elapsed = time.perf_counter() - started
+    if elapsed > Config.STARTUP_TIME_BUDGET:
+        logger.warning(f"Startup took {elapsed:.3f}s, over the {Config.STARTUP_TIME_BUDGET:.3f}s budget")
+    else:
+        logger.info(f"Started in {elapsed:.3f}s")
+    return job_api, monitors
+
+def main():
+    # Setup logging
+    setup_logging()
+    logger = logging.getLogger('DistributedJobScheduler')
+    
+    try:
+        job_api, monitors = start_services()
+        
+        # Start job submission API; failure detection is not optional, so
+        # if the monitors fail to start the server is stopped
+        try:
+            monitors.add_done_callback(interrupt_on_failure)
+            job_api.run(
+                host=Config.SCHEDULER_HOST, 
+                port=Config.SCHEDULER_PORT
+            )
+        except KeyboardInterrupt:
+            if not monitors.done() or monitors.exception() is None:
+                raise
+        monitors.result()
     
     except Exception as e:
         logger.error(f"Scheduler initialization failed: {e}")
@@ -1,11 +1,98 @@
 # File: distributed-job-scheduler/backend/node_agent/agent.py
 
-import multiprocessing
+import socket
 import threading
 import logging
+import os
 import time
-import psutil
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Callable, List, NamedTuple, Tuple
+from .artifact_cache import ArtifactCache, stage_artifacts
+from .worker_pool import WorkerPool, get_worker_context, preload_modules
+from backend.performance.tracing import TRACE_KEY, begin_span, end_span, is_traced, merge_trace, span
+
+# Modules imported by workers before they accept jobs
+DEFAULT_PRELOAD_MODULES = ('numpy', 'backend.node_agent.molecular_dynamics')
+
+# Pool used for job types without an executor of their own
+DEFAULT_EXECUTOR = 'default'
+
+# Result arrays at least this large come back through shared memory instead of the pipe
+SHARED_RESULT_MIN_BYTES = 1024 * 1024
+
+
+class WorkerResult(NamedTuple):
+    """
+    Job result sent back from a worker
+
+    ``execution_time`` is how long the job ran in the worker, from picking
+    it up to finishing it; ``trace`` holds the spans a traced job recorded.
+    """
+    result: Any
+    execution_time: float
+    trace: Optional[Dict[str, Any]] = None
+
+
+def run_job(job: Dict[str, Any], shared_min_bytes: Optional[int] = None) -> WorkerResult:
+    """
+    Run a specific job inside a worker process
+
+    With ``shared_min_bytes``, arrays and float lists in the result at
+    least that large are left in shared memory (see ``share_arrays``).
+    """
+    started = time.monotonic()
+    if not is_traced(job):
+        result = _run_job(job)
+        return WorkerResult(_share_result(result, shared_min_bytes), time.monotonic() - started)
+    end_span(job, 'worker_start')
+    with span(job, 'execute'):
+        result = _run_job(job)
+    execution_time = time.monotonic() - started
+    begin_span(job, 'result_transfer')
+    return WorkerResult(_share_result(result, shared_min_bytes), execution_time, job[TRACE_KEY])
+
+
+def _share_result(result: Any, min_bytes: Optional[int]) -> Any:
+    if min_bytes is None:
+        return result
+    from .shared_results import share_arrays
+    return share_arrays(result, min_bytes)
+
+
+def _release_worker_blocks(pid: int) -> None:
+    from .shared_results import release_worker_blocks
+    release_worker_blocks(pid)
+
+
+def _run_job(job: Dict[str, Any]) -> Any:
+    job_type = job.get('type')
+    if job.get('artifacts') and job.get('artifact_cache'):
+        with span(job, 'execute.artifacts'):
+            job['artifact_paths'] = stage_artifacts(job)
+
+    if job_type == 'molecular_dynamics':
+        from .molecular_dynamics import run_molecular_dynamics_job
+        return run_molecular_dynamics_job(job)
+    elif job_type == 'compute':
+        # Simulate computation
+        time.sleep(job.get('duration', 5))
+    elif job_type == 'data_processing':
+        # Simulate data processing
+        time.sleep(job.get('duration', 10))
+
+    return f"Completed job {job.get('id')}"
+
+
+def parse_executor_sizes(spec: str) -> Dict[str, int]:
+    """
+    Parse ``type:size,type:size`` into per-job-type executor sizes
+    """
+    sizes = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        job_type, _, size = entry.partition(':')
+        sizes[job_type.strip()] = int(size)
+    return sizes
 
 
 class NodeAgent:
@@ -13,26 +100,163 @@ class NodeAgent:
     Manages job execution and resource monitoring for a single compute node
     """
 
-    def __init__(self, max_workers: int = 4):
+    def __init__(self,
+                 max_workers: int = 4,
+                 checkpoint_dir: Optional[str] = None,
+                 node_id: Optional[str] = None,
+                 on_job_complete: Optional[Callable[[Dict[str, Any], Any], None]] = None,
+                 on_job_failure: Optional[Callable[[Dict[str, Any], Exception], None]] = None,
+                 executor_sizes: Optional[Dict[str, int]] = None,
+                 start_method: Optional[str] = 'forkserver',
+                 preload: Tuple[str, ...] = DEFAULT_PRELOAD_MODULES,
+                 artifact_cache: Optional[ArtifactCache] = None,
+                 lazy_workers: bool = False,
+                 shared_result_min_bytes: Optional[int] = SHARED_RESULT_MIN_BYTES):
         self.max_workers = max_workers
-        self.worker_pool = multiprocessing.Pool(processes=max_workers)
+        self.checkpoint_dir = checkpoint_dir
+        self.artifact_cache = artifact_cache
+        self.shared_result_min_bytes = shared_result_min_bytes
+        self.node_id = node_id or socket.gethostname()
+        self.on_job_complete = on_job_complete
+        self.on_job_failure = on_job_failure
+
+        # Separate warm pools per job type keep short jobs from queueing behind long ones
+        sizes = dict(executor_sizes or {})
+        sizes.setdefault(DEFAULT_EXECUTOR, max_workers)
+        if any(size <= 0 for size in sizes.values()):
+            raise ValueError("Executor sizes must be positive")
+        context = get_worker_context(start_method, preload)
+        self.executors: Dict[str, WorkerPool] = {
+            job_type: WorkerPool(
+                processes=size,
+                context=context,
+                initializer=preload_modules,
+                initargs=(tuple(preload),),
+                name=f'NodeAgentWorkers-{job_type}',
+                lazy=lazy_workers,
+                on_worker_exit=_release_worker_blocks if shared_result_min_bytes is not None else None
+            )
+            for job_type, size in sizes.items()
+        }
         self.active_jobs: Dict[str, Any] = {}
+        self.lock = threading.Lock()
         self.logger = logging.getLogger('NodeAgent')
 
-    def execute_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        # Pull mode: jobs fetched ahead of time wait here until a worker frees up
+        self.local_queue = deque()
+        self.work_source: Optional[Callable[[str, int], List[Dict[str, Any]]]] = None
+        self.peers: List['NodeAgent'] = []
+        self.on_jobs_stolen: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None
+        self.low_water_mark = max_workers
+        self.pull_batch_size = max_workers
+        self.poll_interval = 1.0
+        self._work_event = threading.Event()
+        self._pull_thread: Optional[threading.Thread] = None
+        self._pulling = False
+
+    def submit_job(self,
+                   job: Dict[str, Any],
+                   on_complete: Optional[Callable[[Dict[str, Any], Any], None]] = None,
+                   on_failure: Optional[Callable[[Dict[str, Any], Exception], None]] = None) -> Future:
         """
-        Execute a job using the worker pool
+        Start a job without waiting for it and return a future for its result
+
+        The job is removed from ``active_jobs`` when it finishes. Completion
+        and failure callbacks (falling back to the agent-wide ones) run on
+        the worker pool's collector thread and should return quickly. Jobs
+        running past their ``timeout`` have their worker terminated. A
+        completed job's ``execution_time`` is set to how long it ran in its
+        worker, excluding any wait for one.
+
+        Result arrays and float lists of ``shared_result_min_bytes`` or
+        more are handed over in shared memory. Callbacks and the future
+        get the result as the job returned it; arrays map the worker's
+        blocks without a copy, each freed once nothing references it any
+        more. Blocks of a worker killed before handing its result over are
+        unlinked along with it.
         """
-        try:
-            job_id = job['id']
+        job_id = job['id']
+        self._prepare_checkpointing(job)
+        if self.artifact_cache is not None and job.get('artifacts'):
+            job['artifact_cache'] = self.artifact_cache.directory
+            self.artifact_cache.record_use(job['artifacts'])
+        shared_min_bytes = self.shared_result_min_bytes
+        with self.lock:
             self.active_jobs[job_id] = job
 
-            result = self.worker_pool.apply_async(self._run_job, (job,))
+        on_complete = on_complete or self.on_job_complete
+        on_failure = on_failure or self.on_job_failure
+        outcome = Future()
+
+        def job_done(future: Future):
+            self._work_event.set()  # A worker is free, pull mode may start more work
+            if future.cancelled():
+                outcome.cancel()
+                with self.lock:
+                    if self.active_jobs.get(job_id) is job:
+                        del self.active_jobs[job_id]
+                return
+
+            error = future.exception()
+            result = None
+            if error is None:
+                output = future.result()
+                job['execution_time'] = output.execution_time
+                if output.trace is not None:
+                    merge_trace(job, output.trace)
+                    end_span(job, 'result_transfer')
+                result = output.result
+                if shared_min_bytes is not None:
+                    # Attached even for a stale outcome, which frees its blocks
+                    from .shared_results import attach_arrays
+                    try:
+                        result = attach_arrays(result)
+                    except Exception as e:
+                        result, error = None, e
 
+            with self.lock:
+                current = self.active_jobs.get(job_id) is job  # Not if cancelled or preempted
+                if current:
+                    del self.active_jobs[job_id]
+            try:
+                if current and error is None:
+                    if on_complete is not None:
+                        on_complete(job, result)
+                elif current:
+                    self.logger.error(f"Job {job_id} failed: {error}")
+                    if on_failure is not None:
+                        on_failure(job, error)
+            finally:
+                if error is None:
+                    outcome.set_result(result)
+                else:
+                    outcome.set_exception(error)
+
+        begin_span(job, 'worker_start')
+        future = self._executor_for(job).submit(
+            job_id, run_job, (job, shared_min_bytes), timeout=job.get('timeout', 3600)
+        )
+        future.add_done_callback(job_done)
+        return outcome
+
+    def receive_jobs(self, jobs: List[Dict[str, Any]]) -> List[Future]:
+        """
+        Accept a batch of jobs dispatched by the scheduler
+        """
+        for job in jobs:
+            end_span(job, 'dispatch')
+        return [self.submit_job(job) for job in jobs]
+
+    def execute_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a job using the worker pool and wait for its result
+        """
+        try:
+            result = self.submit_job(job).result()
             return {
-                'job_id': job_id,
-                'status': 'RUNNING',
-                'result': result.get(timeout=job.get('timeout', 3600))
+                'job_id': job['id'],
+                'status': 'COMPLETED',
+                'result': result
             }
         except Exception as e:
             self.logger.error(f"Job execution failed: {e}")
@@ -42,20 +266,248 @@ class NodeAgent:
                 'error': str(e)
             }
 
-    def _run_job(self, job: Dict[str, Any]) -> Any:
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job, terminating its worker if needed
+        """
+        if self._take_local(job_id) is not None:
+            return True
+        with self.lock:
+            job = self.active_jobs.pop(job_id, None)
+        if job is None:
+            return False
+        return self._executor_for(job).cancel(job_id)
+
+    def start_pulling(self,
+                      work_source: Callable[[str, int], List[Dict[str, Any]]],
+                      peers: Optional[List['NodeAgent']] = None,
+                      low_water_mark: Optional[int] = None,
+                      batch_size: Optional[int] = None,
+                      poll_interval: float = 1.0):
+        """
+        Switch to pull mode: fetch work whenever the local backlog runs low
+
+        ``work_source(node_id, n)`` returns up to ``n`` jobs from the central
+        queue (see ``Scheduler.request_work``). Fetched jobs wait in a small
+        local deque and are only handed to a worker once one is idle, so
+        the agent never holds more work than it can start soon. When the
+        central queue has nothing left, an agent with idle workers steals
+        from the tail of the busiest peer's deque.
+        """
+        self.work_source = work_source
+        self.peers = [peer for peer in (peers or []) if peer is not self]
+        if low_water_mark is not None:
+            self.low_water_mark = low_water_mark
+        if batch_size is not None:
+            self.pull_batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        self._pulling = True
+        self._pull_thread = threading.Thread(
+            target=self._pull_loop, name=f'NodeAgentPull-{self.node_id}', daemon=True
+        )
+        self._pull_thread.start()
+
+    def stop_pulling(self) -> List[Dict[str, Any]]:
+        """
+        Stop fetching work and return local jobs that never started
+        """
+        self._pulling = False
+        self._work_event.set()
+        if self._pull_thread is not None:
+            self._pull_thread.join()
+            self._pull_thread = None
+        with self.lock:
+            unstarted, self.local_queue = list(self.local_queue), deque()
+        return unstarted
+
+    def steal_jobs(self, max_jobs: int) -> List[Dict[str, Any]]:
+        """
+        Give up to half of the local backlog, newest first, to an idle peer
+        """
+        with self.lock:
+            count = min(max_jobs, (len(self.local_queue) + 1) // 2)
+            return [self.local_queue.pop() for _ in range(count)]
+
+    def heartbeat_resources(self) -> Dict[str, Any]:
+        """
+        Node state sent with each heartbeat: the artifact cache listing, if any
+        """
+        if self.artifact_cache is None:
+            return {}
+        with self.lock:
+            in_use = {
+                artifact['digest']
+                for job in self.active_jobs.values()
+                for artifact in job.get('artifacts') or []
+            }
+        return {'artifacts': self.artifact_cache.report(in_use)}
+
+    def backlog(self) -> int:
+        """
+        Number of fetched jobs not yet handed to a worker
+        """
+        return len(self.local_queue)
+
+    def worker_pids(self) -> Dict[str, int]:
+        """
+        Process id of the worker running each active job
+        """
+        pids = {}
+        for executor in self.executors.values():
+            pids.update(executor.worker_pids())
+        return pids
+
+    def start_workers(self):
+        """
+        Spawn the worker processes of lazily started executors
+
+        Blocks until they are up, so callers wanting a fast start run it
+        in a background thread; jobs submitted meanwhile spawn their own.
+        """
+        for executor in self.executors.values():
+            executor.start()
+
+    def shutdown(self):
+        """
+        Stop all worker processes
+        """
+        unstarted = self.stop_pulling()
+        if unstarted:
+            self.logger.warning(f"Shutting down with {len(unstarted)} unstarted pulled jobs")
+        for executor in self.executors.values():
+            executor.shutdown()
+
+    def _pull_loop(self):
+        """
+        Keep workers busy from the local deque, refilling it below the low-water mark
+        """
+        while self._pulling:
+            self._work_event.clear()
+            self._start_local_jobs()
+
+            if len(self.local_queue) <= self.low_water_mark:
+                self._fetch_work()
+            if not self.local_queue and self._idle_workers() > 0:
+                self._steal_work()
+            if self._start_local_jobs():
+                continue
+
+            self._work_event.wait(self.poll_interval)
+
+    def _fetch_work(self):
+        try:
+            jobs = self.work_source(self.node_id, self.pull_batch_size) or []
+        except Exception as e:
+            self.logger.error(f"Failed to request work: {e}")
+            return
+        for job in jobs:
+            begin_span(job, 'node_queue')
+        with self.lock:
+            self.local_queue.extend(jobs)
+
+    def _steal_work(self):
+        """
+        Take jobs from the peer with the longest backlog
+        """
+        victims = sorted(self.peers, key=lambda peer: peer.backlog(), reverse=True)
+        for peer in victims:
+            if peer.backlog() == 0:
+                return
+            jobs = peer.steal_jobs(self._idle_workers())
+            if not jobs:
+                continue
+            self.logger.info(f"Stole {len(jobs)} jobs from node {peer.node_id}")
+            with self.lock:
+                self.local_queue.extend(jobs)
+            if self.on_jobs_stolen is not None:
+                self.on_jobs_stolen(self.node_id, jobs)
+            return
+
+    def _start_local_jobs(self) -> int:
+        """
+        Hand local jobs to executors that have an idle worker
+        """
+        started, waiting = [], deque()
+        with self.lock:
+            idle = {job_type: pool.idle_workers() for job_type, pool in self.executors.items()}
+            for job in self.local_queue:
+                job_type = job.get('type') if job.get('type') in idle else DEFAULT_EXECUTOR
+                if idle[job_type] > 0:
+                    idle[job_type] -= 1
+                    started.append(job)
+                else:
+                    waiting.append(job)
+            self.local_queue = waiting
+
+        for job in started:
+            end_span(job, 'node_queue')
+            self.submit_job(job)
+        return len(started)
+
+    def _idle_workers(self) -> int:
+        return sum(max(0, pool.idle_workers()) for pool in self.executors.values())
+
+    def _take_local(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            for index, job in enumerate(self.local_queue):
+                if job['id'] == job_id:
+                    del self.local_queue[index]
+                    return job
+        return None
+
+    def _executor_for(self, job: Dict[str, Any]) -> WorkerPool:
+        return self.executors.get(job.get('type'), self.executors[DEFAULT_EXECUTOR])
+
+    def preempt_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Ask a running job to stop so its cores can go to a more urgent job
+
+        Checkpointing jobs stop at their next step; any other job has its
+        worker terminated. The returned progress points at the last
+        checkpoint the job wrote, if any.
+        """
+        with self.lock:
+            job = self.active_jobs.pop(job_id, None)
+        if job is None:
+            return None
+
+        checkpoint = self._checkpoint_status(job)
+        stop_path = job.get('stop_path')
+        if stop_path:
+            with open(stop_path, 'w'):
+                pass
+        else:
+            self._executor_for(job).cancel(job_id)
+
+        return {'job_id': job_id, 'checkpoint': checkpoint}
+
+    def checkpoint_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Location and age of a running job's latest checkpoint
+        """
+        job = self.active_jobs.get(job_id)
+        return self._checkpoint_status(job) if job else None
+
+    def _checkpoint_status(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        path = job.get('checkpoint_path')
+        if not path or not os.path.exists(path):
+            return None
+        return {'path': path, 'saved_at': os.path.getmtime(path)}
+
+    def _prepare_checkpointing(self, job: Dict[str, Any]):
         """
-        Internal method to run a specific job
+        Give molecular dynamics jobs a checkpoint and a per-attempt stop marker
         """
-        job_type = job.get('type')
+        if job.get('type') != 'molecular_dynamics':
+            return
 
-        if job_type == 'molecular_dynamics':
-            from .molecular_dynamics import run_molecular_dynamics_job
-            return run_molecular_dynamics_job(job)
-        elif job_type == 'compute':
-            # Simulate computation
-            time.sleep(job.get('duration', 5))
-        elif job_type == 'data_processing':
-            # Simulate data processing
-            time.sleep(job.get('duration', 10))
+        checkpoint_path = (job.get('checkpoint') or {}).get('path') or job.get('checkpoint_path')
+        if not checkpoint_path and self.checkpoint_dir:
+            checkpoint_path = os.path.join(self.checkpoint_dir, f"{job['id']}.npz")
+        if not checkpoint_path:
+            return
 
-        return f"Completed job {job.get('id')}"
+        job['checkpoint_path'] = checkpoint_path
+        # One marker per attempt, so a resumed run never sees an old stop request
+        job['stop_path'] = f"{checkpoint_path}.{job.get('preemptions', 0)}.stop"
@@ -0,0 +1,217 @@
+# File: distributed-job-scheduler/backend/node_agent/artifact_cache.py
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, Any, Iterable, List, Tuple
+
+DIGEST_ALGORITHM = 'sha256'
+CHUNK_SIZE = 1024 * 1024
+
+# Digests name cached files, so anything else could point outside the cache
+DIGEST_PATTERN = re.compile(r'^sha256:[0-9a-f]{64}$')
+
+# Schemes artifacts can be fetched from; a plain path counts as 'file'
+SUPPORTED_SCHEMES = ('file', 'http', 'https')
+
+
+def hash_file(path: str) -> str:
+    """
+    Content digest of a file, as ``sha256:<hex>``
+    """
+    digest = hashlib.new(DIGEST_ALGORITHM)
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return f'{DIGEST_ALGORITHM}:{digest.hexdigest()}'
+
+
+def source_scheme(source: str) -> str:
+    scheme, separator, _ = source.partition('://')
+    return scheme.lower() if separator else 'file'
+
+
+def validate_artifacts(artifacts: Any, allowed_schemes: Iterable[str]) -> None:
+    """
+    Check a job's artifact list before it is accepted; raises ValueError
+
+    Every artifact needs a SHA-256 ``digest`` and a ``source`` whose
+    scheme is one of ``allowed_schemes``.
+    """
+    allowed = set(allowed_schemes)
+    if not isinstance(artifacts, list) or not all(isinstance(artifact, dict) for artifact in artifacts):
+        raise ValueError("artifacts must be a list of objects")
+    for artifact in artifacts:
+        digest = artifact.get('digest')
+        if not isinstance(digest, str) or not DIGEST_PATTERN.match(digest):
+            raise ValueError(f"Artifact digest must be sha256:<64 hex digits>, got {digest!r}")
+        source = artifact.get('source')
+        if not isinstance(source, str) or source_scheme(source) not in allowed:
+            raise ValueError(
+                f"Artifact source {source!r} must use one of the enabled schemes: {sorted(allowed)}"
+            )
+        size = artifact.get('size', 0)
+        if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+            raise ValueError(f"Artifact size must be a non-negative integer, got {size!r}")
+
+
+def artifact_path(directory: str, digest: str) -> str:
+    """
+    Cache file of a digest; raises ValueError for a digest that could escape the directory
+    """
+    if not isinstance(digest, str) or not DIGEST_PATTERN.match(digest):
+        raise ValueError(f"Invalid artifact digest: {digest!r}")
+    path = os.path.join(directory, digest.replace(':', '-'))
+    root = os.path.abspath(directory)
+    if os.path.commonpath([root, os.path.abspath(path)]) != root:
+        raise ValueError(f"Artifact digest {digest!r} resolves outside the cache")
+    return path
+
+
+def _digest_from_name(name: str) -> str:
+    return name.replace('-', ':', 1)
+
+
+def stage_artifacts(job: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Make a job's input artifacts local; returns digest -> local path
+
+    Runs in the worker process. Cached files are touched so eviction
+    sees them as recently used; missing ones are copied from their
+    ``source`` (a path or URL), checked against their digest and moved
+    into the cache atomically, so a crash never leaves a partial file
+    under a valid name.
+    """
+    directory = job['artifact_cache']
+    paths = {}
+    for artifact in job.get('artifacts') or []:
+        path = artifact_path(directory, artifact['digest'])
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            _fetch(artifact, directory, path)
+        paths[artifact['digest']] = path
+    return paths
+
+
+def _fetch(artifact: Dict[str, Any], directory: str, path: str) -> None:
+    algorithm, _, expected = artifact['digest'].partition(':')
+    digest = hashlib.new(algorithm)
+    source_uri = artifact['source']
+    if source_scheme(source_uri) not in SUPPORTED_SCHEMES:
+        raise ValueError(f"Unsupported artifact source: {source_uri}")
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.partial')
+    try:
+        with os.fdopen(handle, 'wb') as target:
+            if '://' in source_uri and not source_uri.startswith('file://'):
+                import urllib.request  # Only remote sources need the HTTP stack
+                source = urllib.request.urlopen(source_uri)
+            else:
+                source = open(source_uri[len('file://'):] if source_uri.startswith('file://') else source_uri, 'rb')
+            with source:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    target.write(chunk)
+        if digest.hexdigest() != expected:
+            raise ValueError(f"Artifact from {source_uri} does not match digest {artifact['digest']}")
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class ArtifactCache:
+    """
+    Node-local, content-addressed store of job input files
+
+    Files are named by their digest, so the same input is fetched once per
+    node however many jobs read it. Workers fill the cache themselves
+    (``stage_artifacts``) so dispatch never waits on a copy; the agent
+    learns what is on disk by scanning the directory when it reports to
+    the scheduler, evicting the least recently used files beyond
+    ``max_bytes`` that no running job needs. Reports carry only the
+    changes since the previous one, with a full listing every
+    ``full_report_interval`` reports so a restarted scheduler catches up.
+    """
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 ** 3, full_report_interval: int = 10):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.full_report_interval = full_report_interval
+        self.reported: Dict[str, int] = {}
+        self.reports = 0
+        self.bytes_reused = 0
+        self.bytes_fetched = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return artifact_path(self.directory, digest)
+
+    def record_use(self, artifacts: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Count a job's inputs as reused or to be fetched; returns (reused, fetched) bytes
+        """
+        reused = fetched = 0
+        for artifact in artifacts:
+            if os.path.exists(self.path(artifact['digest'])):
+                reused += artifact.get('size', 0)
+            else:
+                fetched += artifact.get('size', 0)
+        with self.lock:
+            self.bytes_reused += reused
+            self.bytes_fetched += fetched
+        return reused, fetched
+
+    def report(self, in_use: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Changes to the cache since the last report, for the next heartbeat
+        """
+        held = self._evict(self._scan(), set(in_use))
+        with self.lock:
+            self.reports += 1
+            full = self.reports % self.full_report_interval == 1 or self.full_report_interval == 1
+            if full:
+                report = {'full': True, 'added': dict(held), 'removed': []}
+            else:
+                report = {
+                    'full': False,
+                    'added': {digest: size for digest, size in held.items() if digest not in self.reported},
+                    'removed': [digest for digest in self.reported if digest not in held]
+                }
+            self.reported = held
+            report['bytes_reused'] = self.bytes_reused
+            report['bytes_fetched'] = self.bytes_fetched
+        return report
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """
+        Cached files as (last used, digest, size)
+        """
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                digest = _digest_from_name(entry.name)
+                if not DIGEST_PATTERN.match(digest) or not entry.is_file():
+                    continue  # Partial downloads and files that are not ours
+                stat = entry.stat()
+                entries.append((stat.st_mtime, digest, stat.st_size))
+        return entries
+
+    def _evict(self, entries: List[Tuple[float, str, int]], in_use: set) -> Dict[str, int]:
+        total = sum(size for _, _, size in entries)
+        held = {digest: size for _, digest, size in entries}
+        for _, digest, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if digest in in_use:
+                continue
+            try:
+                os.unlink(self.path(digest))
+            except FileNotFoundError:
+                pass
+            total -= size
+            del held[digest]
+        return held
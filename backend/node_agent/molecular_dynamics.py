@@ -1,7 +1,13 @@
 import numpy as np
+import os
+import shutil
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
+from backend.performance.tracing import span
+
+# Integration step of update_particles, in simulation time units
+TIMESTEP = 0.01
 
 @dataclass
 class Particle:
@@ -65,7 +71,7 @@ class MolecularDynamicsSimulation:
         
         return forces
     
-    def update_particles(self, forces: np.ndarray, dt: float = 0.01):
+    def update_particles(self, forces: np.ndarray, dt: float = TIMESTEP):
         """
         Update particle positions and velocities using Verlet integration
         """
@@ -84,9 +90,54 @@ class MolecularDynamicsSimulation:
             # Apply periodic boundary conditions
             self.particles[i].position %= self.box_dimensions
     
-    def run_simulation(self, steps: int = 1000) -> Dict[str, Any]:
+    def save_checkpoint(self, path: str, step: int, simulation_data: Dict[str, Any]):
+        """
+        Atomically write particle state and collected metrics to a checkpoint
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as checkpoint_file:
+            np.savez(
+                checkpoint_file,
+                step=step,
+                positions=np.array([p.position for p in self.particles]),
+                velocities=np.array([p.velocity for p in self.particles]),
+                masses=np.array([p.mass for p in self.particles]),
+                charges=np.array([p.charge for p in self.particles]),
+                total_energy=np.array(simulation_data['total_energy']),
+                temperature=np.array(simulation_data['temperature'])
+            )
+        os.replace(temp_path, path)
+    
+    def load_checkpoint(self, path: str, simulation_data: Dict[str, Any]) -> int:
+        """
+        Restore particle state from a checkpoint, returning the step to resume at
+        """
+        with np.load(path) as checkpoint:
+            self.num_particles = len(checkpoint['masses'])
+            self.particles = [
+                Particle(position=position, velocity=velocity, mass=float(mass), charge=float(charge))
+                for position, velocity, mass, charge in zip(
+                    checkpoint['positions'], checkpoint['velocities'],
+                    checkpoint['masses'], checkpoint['charges']
+                )
+            ]
+            simulation_data['total_energy'] = checkpoint['total_energy'].tolist()
+            simulation_data['temperature'] = checkpoint['temperature'].tolist()
+            return int(checkpoint['step'])
+    
+    def run_simulation(
+        self,
+        steps: int = 1000,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 0,
+        stop_path: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Run complete molecular dynamics simulation
+
+        With a checkpoint path the run resumes from an existing checkpoint and
+        saves one every ``checkpoint_interval`` steps. The run stops early,
+        reporting ``stopped_at_step``, once ``stop_path`` exists.
         """
         simulation_data = {
             'total_energy': [],
@@ -94,7 +145,15 @@ class MolecularDynamicsSimulation:
             'final_particle_states': []
         }
         
-        for _ in range(steps):
+        start_step = 0
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            start_step = self.load_checkpoint(checkpoint_path, simulation_data)
+        
+        for step in range(start_step, steps):
+            if stop_path and os.path.exists(stop_path):
+                simulation_data['stopped_at_step'] = step
+                return simulation_data
+            
             forces = self.compute_forces()
             self.update_particles(forces)
             
@@ -108,6 +167,9 @@ class MolecularDynamicsSimulation:
             # Compute instantaneous temperature
             temperature = total_kinetic_energy / (1.5 * self.num_particles)
             simulation_data['temperature'].append(temperature)
+            
+            if checkpoint_path and checkpoint_interval and (step + 1) % checkpoint_interval == 0:
+                self.save_checkpoint(checkpoint_path, step + 1, simulation_data)
         
         # Store final particle states
         simulation_data['final_particle_states'] = [
@@ -127,20 +189,43 @@ def run_molecular_dynamics_job(job: Dict[str, Any]) -> Dict[str, Any]:
     """
     simulation_params = job.get('simulation_parameters', {})
     
-    simulation = MolecularDynamicsSimulation(
-        num_particles=simulation_params.get('num_particles', 1000),
-        box_dimensions=simulation_params.get('box_dimensions', [100, 100, 100])
-    )
+    with span(job, 'execute.setup'):
+        simulation = MolecularDynamicsSimulation(
+            num_particles=simulation_params.get('num_particles', 1000),
+            box_dimensions=simulation_params.get('box_dimensions', [100, 100, 100])
+        )
+    
+    checkpoint_path = job.get('checkpoint_path')
+    checkpoint_interval = simulation_params.get('checkpoint_interval', 100 if checkpoint_path else 0)
+    
+    # Restart from a checkpoint shipped as an artifact; the cached copy is never written to
+    restart_from = simulation_params.get('restart_from')
+    if restart_from and not (checkpoint_path and os.path.exists(checkpoint_path)):
+        if 'artifact_paths' not in job:
+            raise ValueError(
+                f"Job restarts from artifact {restart_from}, but this node has no artifact cache configured"
+            )
+        restart_path = job['artifact_paths'].get(restart_from)
+        if restart_path is None:
+            raise ValueError(f"restart_from {restart_from} is not one of the job's artifacts")
+        if checkpoint_path:
+            shutil.copyfile(restart_path, checkpoint_path)
+        else:
+            checkpoint_path, checkpoint_interval = restart_path, 0
     
     start_time = time.time()
-    result = simulation.run_simulation(
-        steps=simulation_params.get('simulation_steps', 1000)
-    )
+    with span(job, 'execute.simulate'):
+        result = simulation.run_simulation(
+            steps=simulation_params.get('simulation_steps', 1000),
+            checkpoint_path=checkpoint_path,
+            checkpoint_interval=checkpoint_interval,
+            stop_path=job.get('stop_path')
+        )
     end_time = time.time()
     
     return {
         'job_id': job['id'],
         'simulation_result': result,
         'execution_time': end_time - start_time,
-        'status': 'COMPLETED'
+        'status': 'PREEMPTED' if 'stopped_at_step' in result else 'COMPLETED'
     }
\ No newline at end of file
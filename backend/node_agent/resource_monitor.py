@@ -1,54 +1,245 @@
 # File: distributed-job-scheduler/backend/node_agent/resource_monitor.py
 
 import psutil
+import threading
 import time
 import logging
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Columns of each sample; counters only ever grow and are read as rates
+SAMPLE_FIELDS = (
+    'cpu_percent',
+    'memory_used_percent',
+    'memory_available',
+    'disk_used_percent',
+    'disk_free',
+    'net_bytes_sent',
+    'net_bytes_recv',
+)
+COUNTER_FIELDS = ('net_bytes_sent', 'net_bytes_recv')
+
+
+class SampleRingBuffer:
+    """
+    Fixed-size time series of samples stored in preallocated NumPy arrays
+
+    The newest ``capacity`` samples are kept; older ones are overwritten.
+    Window queries slice the arrays directly, so aggregates cost one
+    vectorized pass over the window and nothing is allocated per sample.
+    """
+    def __init__(self, capacity: int, fields: Tuple[str, ...] = SAMPLE_FIELDS):
+        self.capacity = capacity
+        self.fields = fields
+        self.columns = {name: index for index, name in enumerate(fields)}
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, len(fields)), dtype=np.float64)
+        self.count = 0
+        self.next_index = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, timestamp: float, values: Dict[str, float]) -> None:
+        with self.lock:
+            index = self.next_index
+            self.timestamps[index] = timestamp
+            row = self.values[index]
+            for name, column in self.columns.items():
+                row[column] = values.get(name, np.nan)
+            self.next_index = (index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Timestamps and values of samples from the last ``seconds``, oldest first
+        """
+        with self.lock:
+            if self.count < self.capacity:
+                timestamps = self.timestamps[:self.count].copy()
+                values = self.values[:self.count].copy()
+            else:
+                order = np.r_[self.next_index:self.capacity, 0:self.next_index]
+                timestamps = self.timestamps[order]
+                values = self.values[order]
+
+        if seconds is not None and len(timestamps):
+            now = timestamps[-1] if now is None else now
+            start = np.searchsorted(timestamps, now - seconds, side='left')
+            timestamps, values = timestamps[start:], values[start:]
+        return timestamps, values
+
+    def mean(self, field: str, seconds: Optional[float] = None) -> Optional[float]:
+        _, values = self.window(seconds)
+        column = values[:, self.columns[field]]
+        return float(np.nanmean(column)) if len(column) else None
+
+    def max(self, field: str, seconds: Optional[float] = None) -> Optional[float]:
+        _, values = self.window(seconds)
+        column = values[:, self.columns[field]]
+        return float(np.nanmax(column)) if len(column) else None
+
+    def rate(self, field: str, seconds: Optional[float] = None) -> Optional[float]:
+        """
+        Per-second change of a counter across the window
+        """
+        timestamps, values = self.window(seconds)
+        if len(timestamps) < 2 or timestamps[-1] <= timestamps[0]:
+            return None
+        column = values[:, self.columns[field]]
+        return float((column[-1] - column[0]) / (timestamps[-1] - timestamps[0]))
+
 
 class ResourceMonitor:
     """
     Comprehensive system resource monitoring
+
+    A background sampler takes one snapshot per source every
+    ``sample_interval`` seconds without blocking (CPU usage is measured
+    since the previous sample) and records it in a ring buffer holding
+    ``history_size`` samples. When given ``worker_pids`` (such as
+    ``NodeAgent.worker_pids``), it also tracks CPU and memory of the
+    worker process running each job.
     """
-    def __init__(self, monitoring_interval: int = 60):
+    def __init__(self,
+                 monitoring_interval: int = 60,
+                 sample_interval: float = 1.0,
+                 history_size: int = 3600,
+                 worker_pids: Optional[Callable[[], Dict[str, int]]] = None):
         self.monitoring_interval = monitoring_interval
+        self.sample_interval = sample_interval
+        self.history = SampleRingBuffer(history_size)
+        self.worker_pids = worker_pids
+        self.job_usage: Dict[str, Dict[str, Any]] = {}
+        self._processes: Dict[int, psutil.Process] = {}
+        self._stop_event = threading.Event()
         self.logger = logging.getLogger('ResourceMonitor')
-    
+        self.cores = psutil.cpu_count(logical=False)
+        self.logical_cores = psutil.cpu_count(logical=True)
+
+        psutil.cpu_percent(interval=None)  # Start the CPU usage measurement window
+
     def monitor_resources(self) -> Dict[str, Any]:
         """
         Collect comprehensive system resource metrics
         """
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        network = psutil.net_io_counters()
         return {
             'timestamp': time.time(),
             'cpu': {
-                'usage': psutil.cpu_percent(interval=1),
-                'cores': psutil.cpu_count(logical=False),
-                'logical_cores': psutil.cpu_count(logical=True)
+                'usage': psutil.cpu_percent(interval=None),
+                'cores': self.cores,
+                'logical_cores': self.logical_cores
             },
             'memory': {
-                'total': psutil.virtual_memory().total,
-                'available': psutil.virtual_memory().available,
-                'used_percent': psutil.virtual_memory().percent
+                'total': memory.total,
+                'available': memory.available,
+                'used_percent': memory.percent
             },
             'disk': {
-                'total': psutil.disk_usage('/').total,
-                'free': psutil.disk_usage('/').free,
-                'used_percent': psutil.disk_usage('/').percent
+                'total': disk.total,
+                'free': disk.free,
+                'used_percent': disk.percent
             },
             'network': {
-                'bytes_sent': psutil.net_io_counters().bytes_sent,
-                'bytes_recv': psutil.net_io_counters().bytes_recv
+                'bytes_sent': network.bytes_sent,
+                'bytes_recv': network.bytes_recv
             }
         }
-    
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take one snapshot, add it to the history and refresh per-job usage
+        """
+        resources = self.monitor_resources()
+        self.history.append(resources['timestamp'], {
+            'cpu_percent': resources['cpu']['usage'],
+            'memory_used_percent': resources['memory']['used_percent'],
+            'memory_available': resources['memory']['available'],
+            'disk_used_percent': resources['disk']['used_percent'],
+            'disk_free': resources['disk']['free'],
+            'net_bytes_sent': resources['network']['bytes_sent'],
+            'net_bytes_recv': resources['network']['bytes_recv'],
+        })
+        if self.worker_pids is not None:
+            self.job_usage = self._sample_workers(self.worker_pids())
+        return resources
+
+    def summary(self, window: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Mean and peak of each gauge and the rate of each counter over a window
+        """
+        timestamps, values = self.history.window(window)
+        if not len(timestamps):
+            return {'samples': 0}
+
+        summary: Dict[str, Any] = {'samples': len(timestamps), 'window': window}
+        elapsed = timestamps[-1] - timestamps[0]
+        for name, column in self.history.columns.items():
+            if name in COUNTER_FIELDS:
+                change = values[-1, column] - values[0, column]
+                summary[f'{name}_rate'] = float(change / elapsed) if elapsed > 0 else None
+            else:
+                summary[name] = {
+                    'mean': float(np.nanmean(values[:, column])),
+                    'max': float(np.nanmax(values[:, column]))
+                }
+        return summary
+
     def start_continuous_monitoring(self):
         """
         Start background monitoring thread
         """
         def monitor():
-            while True:
-                resources = self.monitor_resources()
-                self.logger.info(f"System Resources: {resources}")
-                time.sleep(self.monitoring_interval)
-        
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
\ No newline at end of file
+            next_report = time.monotonic() + self.monitoring_interval
+            while not self._stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    self.sample()
+                except Exception as e:
+                    self.logger.error(f"Resource sampling failed: {e}")
+                if started >= next_report:
+                    self.logger.info(f"System Resources: {self.summary(self.monitoring_interval)}")
+                    next_report = started + self.monitoring_interval
+                self._stop_event.wait(max(0.0, self.sample_interval - (time.monotonic() - started)))
+
+        self._stop_event.clear()
+        monitor_thread = threading.Thread(target=monitor, name='ResourceMonitor', daemon=True)
+        monitor_thread.start()
+
+    def stop_continuous_monitoring(self):
+        self._stop_event.set()
+
+    def _sample_workers(self, pids: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+        """
+        CPU and memory of each job's worker process
+
+        Process handles are cached per pid, so CPU usage is measured over
+        the time since the previous sample, like the system-wide figure.
+        """
+        usage = {}
+        live = set()
+        for job_id, pid in pids.items():
+            process = self._processes.get(pid)
+            try:
+                if process is None:
+                    process = self._processes[pid] = psutil.Process(pid)
+                with process.oneshot():
+                    memory = process.memory_info()
+                    usage[job_id] = {
+                        'pid': pid,
+                        'cpu_percent': process.cpu_percent(interval=None),
+                        'rss': memory.rss,
+                        'num_threads': process.num_threads()
+                    }
+                live.add(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        for pid in list(self._processes):
+            if pid not in live:
+                del self._processes[pid]
+        return usage
@@ -0,0 +1,204 @@
+# File: distributed-job-scheduler/backend/node_agent/shared_results.py
+
+import os
+import secrets
+from itertools import chain
+from multiprocessing import shared_memory
+from typing import Any, List, NamedTuple, Optional, Tuple
+import numpy as np
+
+# Blocks are named after the worker that made them, so a killed worker's can be found
+BLOCK_PREFIX = 'jobresult_'
+SHM_DIRECTORY = '/dev/shm'
+
+_FLOAT_TYPES = {float, np.float64}
+
+
+class SharedArray(NamedTuple):
+    """
+    Descriptor of an array a worker left in a shared memory block
+
+    With ``as_list`` the array was made from a list of floats, and is
+    turned back into one when attached.
+    """
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    as_list: bool = False
+
+
+class SharedRecords(NamedTuple):
+    """
+    Descriptor of a list of same-keyed dicts, shared as one column per key
+    """
+    keys: Tuple[str, ...]
+    columns: Tuple[SharedArray, ...]
+
+
+def share_arrays(value: Any, min_bytes: int) -> Any:
+    """
+    Move large arrays of a result into shared memory; runs in the worker
+
+    NumPy arrays of ``min_bytes`` or more anywhere in nested dicts, lists
+    and tuples are copied into a new block each and replaced by a
+    ``SharedArray`` descriptor, so only a few bytes per array go through
+    the pipe. So are lists of floats (or of equally long lists of floats)
+    and lists of dicts with the same keys and such values, like an MD
+    run's energy series and final particle states: ``attach_arrays``
+    gives back exactly the lists that went in. The worker unmaps its side
+    right away; the block lives on until the agent attaches to it.
+    """
+    created: List[str] = []
+    try:
+        return _share(value, max(min_bytes, 1), created)
+    except BaseException:
+        for name in created:
+            _unlink(name)
+        raise
+
+
+def _share(value: Any, min_bytes: int, created: List[str]) -> Any:
+    if isinstance(value, np.ndarray):
+        if value.nbytes < min_bytes or value.dtype.hasobject:
+            return value
+        return _to_block(value, False, created)
+    if isinstance(value, dict):
+        return {key: _share(item, min_bytes, created) for key, item in value.items()}
+    if isinstance(value, list):
+        packed = _pack_list(value, min_bytes, created)
+        if packed is not None:
+            return packed
+        return [_share(item, min_bytes, created) for item in value]
+    if type(value) is tuple:
+        return tuple(_share(item, min_bytes, created) for item in value)
+    return value
+
+
+def _pack_list(items: list, min_bytes: int, created: List[str]) -> Any:
+    """
+    Share a list of floats or of float records, or return None if it is neither or too small
+    """
+    if not items:
+        return None
+    if isinstance(items[0], dict):
+        keys = tuple(items[0])
+        if not all(isinstance(item, dict) and item.keys() == items[0].keys() for item in items):
+            return None
+        columns = [_float_array([item[key] for item in items]) for key in keys]
+        if any(column is None for column in columns) or sum(column.nbytes for column in columns) < min_bytes:
+            return None
+        return SharedRecords(keys, tuple(_to_block(column, True, created) for column in columns))
+    array = _float_array(items)
+    if array is None or array.nbytes < min_bytes:
+        return None
+    return _to_block(array, True, created)
+
+
+def _float_array(items: list) -> Optional[np.ndarray]:
+    """
+    Floats, or equally long lists of floats, as a float64 array; None for anything else
+
+    Only floats qualify, so that ``tolist`` on the array gives back equal values.
+    """
+    types = set(map(type, items))
+    if types <= _FLOAT_TYPES:
+        return np.array(items, dtype=np.float64)
+    if types != {list}:
+        return None
+    width = len(items[0])
+    if not width or set(map(len, items)) != {width} or not set(map(type, chain.from_iterable(items))) <= _FLOAT_TYPES:
+        return None
+    return np.fromiter(chain.from_iterable(items), np.float64, len(items) * width).reshape(len(items), width)
+
+
+def _to_block(array: np.ndarray, as_list: bool, created: List[str]) -> SharedArray:
+    name = f"{BLOCK_PREFIX}{os.getpid()}_{secrets.token_hex(8)}"
+    block = shared_memory.SharedMemory(name=name, create=True, size=array.nbytes)
+    created.append(name)
+    try:
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    finally:
+        block.close()
+    return SharedArray(name, array.shape, array.dtype.str, as_list)
+
+
+def _unlink(name: str) -> None:
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def release_worker_blocks(pid: int) -> int:
+    """
+    Unlink the blocks a terminated worker left behind, returning how many
+
+    A worker killed after sharing a result but before the agent attached
+    it (cancelled, timed out or crashed) takes the descriptors with it;
+    its blocks are found by name instead. Only platforms keeping shared
+    memory in ``SHM_DIRECTORY`` are covered.
+    """
+    prefix = f"{BLOCK_PREFIX}{pid}_"
+    try:
+        names = [name for name in os.listdir(SHM_DIRECTORY) if name.startswith(prefix)]
+    except OSError:
+        return 0
+    for name in names:
+        try:
+            os.unlink(os.path.join(SHM_DIRECTORY, name))
+        except FileNotFoundError:
+            pass
+    return len(names)
+
+
+class _MappedBlock:
+    """
+    Owner of an attached block, kept alive by the arrays viewing it
+
+    Arrays are built over ``__array_interface__``, which makes this object
+    their base: slices and views keep it too, and the block is unmapped
+    only once the last of them is gone. Closing it any earlier would leave
+    the arrays pointing at unmapped memory.
+    """
+    def __init__(self, block: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str):
+        self.block = block
+        self.__array_interface__ = np.ndarray(shape, dtype, buffer=block.buf).__array_interface__
+
+    def __del__(self):
+        self.block.close()
+
+
+def attach_arrays(value: Any) -> Any:
+    """
+    Replace ``SharedArray`` descriptors with arrays mapping their blocks
+
+    Runs in the agent. Arrays are not copied: each views its block
+    directly, and the memory is freed when the result's arrays are
+    garbage collected, i.e. once whoever consumed or persisted the result
+    lets go of it. Shared lists are rebuilt from their block, which is
+    then unmapped. Blocks are unlinked as soon as they are mapped, so
+    nothing is left behind in shared memory if the agent dies. A result
+    that is never attached (say, a cancelled job's) must still go through
+    here for its blocks to be released.
+    """
+    if isinstance(value, SharedArray):
+        block = shared_memory.SharedMemory(name=value.name)
+        block.unlink()
+        if not value.as_list:
+            return np.asarray(_MappedBlock(block, tuple(value.shape), value.dtype))
+        try:
+            return np.ndarray(tuple(value.shape), value.dtype, buffer=block.buf).tolist()
+        finally:
+            block.close()
+    if isinstance(value, SharedRecords):
+        columns = [attach_arrays(column) for column in value.columns]
+        return [dict(zip(value.keys, row)) for row in zip(*columns)]
+    if isinstance(value, dict):
+        return {key: attach_arrays(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [attach_arrays(item) for item in value]
+    if type(value) is tuple:
+        return tuple(attach_arrays(item) for item in value)
+    return value
@@ -0,0 +1,430 @@
+# File: distributed-job-scheduler/backend/node_agent/worker_pool.py
+
+import importlib
+import logging
+import multiprocessing
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from typing import Dict, Any, Callable, Optional, List, Iterable
+
+
+class JobTimeoutError(Exception):
+    """
+    Raised when a job exceeds its timeout and its worker is terminated
+    """
+
+
+class JobCancelledError(Exception):
+    """
+    Raised when a running job is cancelled and its worker is terminated
+    """
+
+
+class WorkerCrashedError(Exception):
+    """
+    Raised when a worker process dies while running a job
+    """
+
+
+class RemoteJobError(Exception):
+    """
+    Raised for an exception thrown by the job inside a worker process
+    """
+
+
+def preload_modules(module_names: Iterable[str]) -> None:
+    """
+    Worker initializer importing job modules up front instead of on first use
+    """
+    for module_name in module_names:
+        importlib.import_module(module_name)
+
+
+def get_worker_context(start_method: Optional[str] = None, preload: Iterable[str] = ()):
+    """
+    Multiprocessing context for worker pools
+
+    With the forkserver start method, ``preload`` is imported once in the
+    fork server, so every (re)spawned worker starts with those modules warm.
+    """
+    if start_method is None or start_method not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+
+    context = multiprocessing.get_context(start_method)
+    if start_method == 'forkserver' and preload:
+        context.set_forkserver_preload(list(preload))
+    return context
+
+
+def _worker_loop(conn, initializer: Optional[Callable], initargs: tuple):
+    """
+    Main loop of a worker process: run one task at a time until told to stop
+    """
+    if initializer is not None:
+        initializer(*initargs)
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+
+        fn, args = task
+        try:
+            outcome = (True, fn(*args))
+        except BaseException as e:
+            outcome = (False, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            conn.send((False, f"Job result could not be sent: {e}"))
+
+
+class _Worker:
+    """
+    Handle on one worker process and the task it is running
+    """
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.task_id: Optional[str] = None
+        self.future: Optional[Future] = None
+        self.deadline: Optional[float] = None
+        self.pid = process.pid
+
+
+class WorkerPool:
+    """
+    Process pool with per-task futures, timeouts and cancellation
+
+    Unlike ``multiprocessing.Pool`` every worker runs a single known task,
+    so a stuck, timed-out or cancelled job is stopped by terminating just
+    its worker, which is then replaced. Submission never blocks; a
+    background thread hands queued tasks to idle workers, collects
+    results and resolves the futures returned by ``submit``.
+
+    A ``lazy`` pool starts no processes up front: workers are spawned as
+    tasks arrive, up to ``processes``, or all at once by ``start``.
+    Processes are always spawned outside the pool lock, so a slow start
+    never holds up submissions or result collection.
+
+    ``on_worker_exit`` is called, outside the lock, with the pid of every
+    worker terminated mid-task, to clean up whatever it left behind.
+    """
+    def __init__(self,
+                 processes: int = 4,
+                 context=None,
+                 initializer: Optional[Callable] = None,
+                 initargs: tuple = (),
+                 name: str = 'WorkerPool',
+                 lazy: bool = False,
+                 on_worker_exit: Optional[Callable[[int], None]] = None):
+        self.processes = processes
+        self.context = context or multiprocessing.get_context()
+        self.initializer = initializer
+        self.initargs = initargs
+        self.name = name
+        self.on_worker_exit = on_worker_exit
+        self.logger = logging.getLogger(name)
+
+        self.lock = threading.Lock()
+        self.pending = deque()  # (task_id, fn, args, future, timeout)
+        self.running: Dict[str, _Worker] = {}
+        self._resolved = []  # (future, result, error) awaiting resolution
+        self._terminated = []  # Pids of killed workers awaiting on_worker_exit
+        self._starting = 0  # Workers being spawned outside the lock
+        self._wake_reader, self._wake_writer = self.context.Pipe(duplex=False)
+        self._closed = False
+
+        self.workers: List[_Worker] = [] if lazy else [self._spawn_worker() for _ in range(processes)]
+        self._collector = threading.Thread(target=self._collect, name=f'{name}-collector', daemon=True)
+        self._collector.start()
+
+    def submit(self, task_id: str, fn: Callable, args: tuple = (), timeout: Optional[float] = None) -> Future:
+        """
+        Queue a task and return a future for its result
+        """
+        future = Future()
+        with self.lock:
+            if self._closed:
+                raise RuntimeError("Worker pool is shut down")
+            self.pending.append((task_id, fn, args, future, timeout))
+            spawns = self._reserve_spawns()
+            self._dispatch_pending()
+        self._add_workers(spawns)
+        self._wake()
+        self._resolve_finished()
+        return future
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a queued task, or terminate the worker running it
+        """
+        with self.lock:
+            queued = next((item for item in self.pending if item[0] == task_id), None)
+            if queued is not None:
+                self.pending.remove(queued)
+
+        if queued is not None:
+            queued[3].cancel()
+            return True
+
+        with self.lock:
+            worker = self.running.get(task_id)
+            if worker is None:
+                return False
+            spawns = self._replace_worker(worker, JobCancelledError(f"Job {task_id} was cancelled"))
+            self._dispatch_pending()
+        self._add_workers(spawns)
+        self._wake()
+        self._resolve_finished()
+        return True
+
+    def start(self) -> None:
+        """
+        Spawn any workers a lazy pool has not started yet
+        """
+        with self.lock:
+            if self._closed:
+                return
+            spawns = max(0, self.processes - len(self.workers) - self._starting)
+            self._starting += spawns
+        self._add_workers(spawns)
+
+    def worker_pids(self) -> Dict[str, int]:
+        """
+        Process id of the worker running each task
+        """
+        with self.lock:
+            return {task_id: worker.pid for task_id, worker in self.running.items()}
+
+    def idle_workers(self) -> int:
+        with self.lock:
+            unstarted = self.processes - len(self.workers)
+            return sum(1 for worker in self.workers if worker.future is None) + unstarted - len(self.pending)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Stop all workers; queued tasks are cancelled, running ones terminated
+        """
+        with self.lock:
+            if self._closed:
+                return
+            self._closed = True
+            queued, self.pending = self.pending, deque()
+            workers = list(self.workers)
+
+        for item in queued:
+            item[3].cancel()
+
+        self._wake()
+        self._collector.join(timeout)
+
+        for worker in workers:
+            if worker.future is not None:
+                worker.process.terminate()
+                continue
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            if worker.future is not None:
+                with self.lock:
+                    self._finish(worker, error=JobCancelledError("Worker pool shut down"))
+                    self._terminated.append(worker.pid)
+            worker.conn.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+        self._resolve_finished()
+
+    def _spawn_worker(self) -> _Worker:
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=_worker_loop,
+            args=(child_conn, self.initializer, self.initargs),
+            name=f'{self.name}-worker',
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _replace_worker(self, worker: _Worker, error: Exception) -> int:
+        """
+        Terminate a worker and fail its task (caller holds the lock)
+
+        Returns the number of workers to start in its place, already
+        reserved, for the caller to pass to ``_add_workers`` once it has
+        released the lock.
+        """
+        worker.process.terminate()
+        worker.process.join()
+        worker.conn.close()
+        self._finish(worker, error=error)
+        self._terminated.append(worker.pid)
+        self.workers.remove(worker)
+        if self._closed:
+            return 0
+        self._starting += 1
+        return 1
+
+    def _reserve_spawns(self) -> int:
+        """
+        Reserve workers to start for tasks no idle worker can take (caller holds the lock)
+        """
+        if self._closed:
+            return 0
+        idle = sum(1 for worker in self.workers if worker.future is None) + self._starting
+        spawns = max(0, min(len(self.pending) - idle, self.processes - len(self.workers) - self._starting))
+        self._starting += spawns
+        return spawns
+
+    def _add_workers(self, count: int) -> None:
+        """
+        Spawn reserved workers without holding the lock, then give them queued tasks
+        """
+        if not count:
+            return
+        workers = []
+        try:
+            for _ in range(count):
+                workers.append(self._spawn_worker())
+        finally:
+            with self.lock:
+                self._starting -= count
+                closed = self._closed
+                if not closed:
+                    self.workers.extend(workers)
+                    self._dispatch_pending()
+            if closed:
+                for worker in workers:
+                    worker.process.terminate()
+                    worker.conn.close()
+            self._wake()
+            self._resolve_finished()
+
+    def _dispatch_pending(self) -> None:
+        """
+        Hand queued tasks to idle workers (caller holds the lock)
+        """
+        for worker in self.workers:
+            if not self.pending:
+                return
+            if worker.future is not None:
+                continue
+
+            task_id, fn, args, future, timeout = self.pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                worker.conn.send((fn, args))
+            except Exception as e:
+                self._resolved.append((future, None, e))
+                continue
+
+            worker.task_id = task_id
+            worker.future = future
+            worker.deadline = time.monotonic() + timeout if timeout else None
+            self.running[task_id] = worker
+
+    def _finish(self, worker: _Worker, result: Any = None, error: Optional[Exception] = None) -> None:
+        """
+        Free a worker and queue its future for resolution (caller holds the lock)
+        """
+        if worker.future is not None:
+            self._resolved.append((worker.future, result, error))
+        self.running.pop(worker.task_id, None)
+        worker.task_id = worker.future = worker.deadline = None
+
+    def _resolve_finished(self) -> None:
+        """
+        Resolve finished futures outside the lock so done-callbacks may use the pool
+        """
+        with self.lock:
+            resolved, self._resolved = self._resolved, []
+            terminated, self._terminated = self._terminated, []
+        for pid in terminated:
+            if self.on_worker_exit is None:
+                break
+            try:
+                self.on_worker_exit(pid)
+            except Exception as e:
+                self.logger.error(f"Cleaning up after worker {pid} failed: {e}")
+        for future, result, error in resolved:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _wake(self) -> None:
+        try:
+            self._wake_writer.send_bytes(b'\0')
+        except (OSError, ValueError):
+            pass
+
+    def _collect(self) -> None:
+        """
+        Background loop: collect results, enforce timeouts, replace dead workers
+        """
+        while True:
+            with self.lock:
+                if self._closed:
+                    return
+                busy = {worker.conn: worker for worker in self.workers if worker.future is not None}
+                deadlines = [worker.deadline for worker in busy.values() if worker.deadline]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+            try:
+                ready = wait(list(busy) + [self._wake_reader], timeout)
+            except (OSError, ValueError):
+                # A worker was replaced while we were about to wait on it
+                continue
+
+            spawns = 0
+            with self.lock:
+                if self._wake_reader in ready:
+                    while self._wake_reader.poll():
+                        self._wake_reader.recv_bytes()
+
+                for conn in ready:
+                    worker = busy.get(conn)
+                    if worker is None or worker not in self.workers or worker.future is None:
+                        continue
+                    try:
+                        ok, payload = conn.recv()
+                    except (EOFError, OSError):
+                        self.logger.error(f"Worker {worker.pid} died running job {worker.task_id}")
+                        spawns += self._replace_worker(worker, WorkerCrashedError(
+                            f"Worker process exited with code {worker.process.exitcode}"
+                        ))
+                        continue
+                    if ok:
+                        self._finish(worker, result=payload)
+                    else:
+                        self._finish(worker, error=RemoteJobError(payload))
+
+                now = time.monotonic()
+                for worker in list(self.workers):
+                    if worker.deadline is not None and now >= worker.deadline:
+                        self.logger.warning(f"Job {worker.task_id} timed out, terminating worker {worker.pid}")
+                        spawns += self._replace_worker(worker, JobTimeoutError(f"Job {worker.task_id} timed out"))
+
+                self._dispatch_pending()
+
+            self._add_workers(spawns)
+            self._resolve_finished()
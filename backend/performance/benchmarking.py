@@ -1,9 +1,64 @@
 # File: distributed-job-scheduler/backend/performance/benchmarking.py
 
 import time
+import json
+import threading
 import multiprocessing
 import random
-from typing import Dict, Any, List, Callable
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+# Benchmark baselines kept in the repository, one file per suite
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+# Directory containing the backend package, for benchmarks run in fresh interpreters
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Entry points whose import cost the startup suite profiles
+STARTUP_IMPORTS = (
+    'backend.main',
+    'backend.job_submission.api',
+    'backend.scheduler.scheduler',
+    'backend.node_agent.agent'
+)
+
+# Metric name suffixes and which direction is an improvement
+HIGHER_IS_BETTER = ('_per_second', '_per_day')
+LOWER_IS_BETTER = ('_us', '_ms', '_mb')
+SMALLER_MAGNITUDE_IS_BETTER = ('_drift',)
+
+# Allowed slowdown before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def _count_primes(duration: float) -> int:
+    """
+    Generate prime numbers to stress CPU (module level so Pool.map can pickle it)
+    """
+    def is_prime(n):
+        if n < 2:
+            return False
+        for i in range(2, int(n ** 0.5) + 1):
+            if n % i == 0:
+                return False
+        return True
+    
+    primes = []
+    start_time = time.time()
+    while time.time() - start_time < duration:
+        num = random.randint(10000, 100000)
+        if is_prime(num):
+            primes.append(num)
+    
+    return len(primes)
+
 
 class SystemBenchmark:
     """
@@ -14,33 +69,11 @@ class SystemBenchmark:
         """
         Measure CPU performance through intensive computation
         """
-        def cpu_intensive_task():
-            """Generate prime numbers to stress CPU"""
-            def is_prime(n):
-                if n < 2:
-                    return False
-                for i in range(2, int(n ** 0.5) + 1):
-                    if n % i == 0:
-                        return False
-                return True
-            
-            primes = []
-            start_time = time.time()
-            while time.time() - start_time < duration:
-                num = random.randint(10000, 100000)
-                if is_prime(num):
-                    primes.append(num)
-            
-            return len(primes)
-        
         start_time = time.time()
         
         # Use all available CPU cores
         with multiprocessing.Pool() as pool:
-            results = pool.map(
-                lambda _: cpu_intensive_task(), 
-                range(multiprocessing.cpu_count())
-            )
+            results = pool.map(_count_primes, [duration] * multiprocessing.cpu_count())
         
         end_time = time.time()
         
@@ -109,4 +142,808 @@ class SystemBenchmark:
             'memory_benchmark': self.memory_benchmark(),
             'io_benchmark': self.io_benchmark(),
             'timestamp': time.time()
-        }
\ No newline at end of file
+        }
+
+
+class _SinkAgent:
+    """
+    Agent stand-in that accepts every job without running it
+    """
+    def receive_jobs(self, jobs):
+        return []
+
+
+class _JSONDispatchHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        jobs = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        body = json.dumps({'accepted': len(jobs), 'job_ids': [job['id'] for job in jobs]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TransportBenchmark:
+    """
+    Loopback comparison of scheduler-to-agent dispatch transports
+    """
+    @staticmethod
+    def _measure(send: Callable[[List[Dict[str, Any]]], Any], batches: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        latencies = []
+        start_time = time.perf_counter()
+        for batch in batches:
+            sent_at = time.perf_counter()
+            send(batch)
+            latencies.append(time.perf_counter() - sent_at)
+        elapsed = time.perf_counter() - start_time
+
+        latencies.sort()
+        return {
+            'messages_per_second': len(batches) / elapsed,
+            'jobs_per_second': sum(len(batch) for batch in batches) / elapsed,
+            'latency_p50_ms': latencies[len(latencies) // 2] * 1000,
+            'latency_p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        }
+
+    @staticmethod
+    def dispatch_benchmark(messages: int = 2000, batch_size: int = 8, address: str = '127.0.0.1:0') -> Dict[str, Any]:
+        """
+        Dispatch job batches over the binary RPC transport and over JSON/HTTP
+
+        Both servers accept and acknowledge batches without running them, so
+        the numbers reflect transport and serialization cost only. The HTTP
+        client opens a connection per request, as a plain ``requests.post``
+        dispatcher would.
+        """
+        from backend.rpc.transport import AgentRPCServer, AgentRPCClient
+
+        batches = [
+            [
+                {
+                    'id': f'job-{i}-{j}',
+                    'type': 'molecular_dynamics',
+                    'priority': 5,
+                    'resources': {'cpu_cores': 4, 'memory_gb': 8},
+                    'simulation_parameters': {'num_particles': 1000, 'simulation_steps': 10000}
+                }
+                for j in range(batch_size)
+            ]
+            for i in range(messages)
+        ]
+
+        rpc_server = AgentRPCServer(_SinkAgent(), address)
+        rpc_server.start()
+        client = AgentRPCClient(rpc_server.address, pool_size=1)
+        try:
+            rpc = TransportBenchmark._measure(client.receive_jobs, batches)
+        finally:
+            client.close()
+            rpc_server.stop()
+
+        http_server = ThreadingHTTPServer(('127.0.0.1', 0), _JSONDispatchHandler)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{http_server.server_address[1]}/jobs"
+
+        def post_json(batch):
+            request = urllib.request.Request(
+                url, data=json.dumps(batch).encode(), headers={'Content-Type': 'application/json'}
+            )
+            with urllib.request.urlopen(request) as response:
+                return json.loads(response.read())
+
+        try:
+            json_http = TransportBenchmark._measure(post_json, batches)
+        finally:
+            http_server.shutdown()
+            http_server.server_close()
+
+        return {
+            'messages': messages,
+            'batch_size': batch_size,
+            'rpc': rpc,
+            'json_http': json_http,
+            'speedup': rpc['messages_per_second'] / json_http['messages_per_second']
+        }
+
+
+class _LocalNodeRegistry:
+    """
+    Registry exposing in-process agents as uniform 8-core nodes
+    """
+    def __init__(self, agents: Dict[str, Any]):
+        self.agents = agents
+        self.nodes = [
+            {'id': node_id, 'current_load': 0.0, 'available_cpu': 8, 'available_memory': 32}
+            for node_id in agents
+        ]
+
+    def get_active_nodes(self):
+        return self.nodes
+
+    def get_node(self, node_id):
+        return self.agents[node_id]
+
+
+def _bench_job(i: int, owner: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'id': f'job-{i}',
+        'type': 'noop',
+        'priority': i % 3,
+        'owner': owner or f'user{i % 8}',
+        'submitted_at': time.time(),
+        'resources': {'cpu_cores': 1, 'memory_gb': 1}
+    }
+
+
+def _median_run(measure: Callable[[], Dict[str, float]], repeats: int) -> Dict[str, float]:
+    """
+    Median of each metric over several runs, to damp scheduling noise
+    """
+    runs = [measure() for _ in range(repeats)]
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+class SchedulerBenchmark:
+    """
+    Throughput and latency of the scheduler's own code paths
+
+    Every section uses fixed seeds and sizes so runs are comparable, and
+    reports the median of ``repeats`` runs. Metrics ending in
+    ``_per_second`` are better when higher; ``_us`` and ``_ms`` metrics
+    are better when lower, which is how ``compare_to_baseline`` reads them.
+    """
+    def __init__(self, repeats: int = 3, quick: bool = False):
+        self.repeats = repeats
+        self.quick = quick
+        self.queue_depths = (100, 1000) if quick else (100, 1000, 10000)
+        self.node_counts = (10, 100) if quick else (10, 100, 1000)
+        self.api_requests = 200 if quick else 1000
+        self.end_to_end_jobs = 200 if quick else 1000
+        self.memory_depths = (10000,) if quick else (10000, 1000000)
+
+    def queue_benchmark(self) -> Dict[str, Any]:
+        """
+        Enqueue, dequeue and cancel rates of each queue at several depths
+        """
+        from backend.job_submission.job_queue import DistributedJobQueue
+        from backend.job_submission.fair_share_queue import FairShareJobQueue
+
+        results = {}
+        for name, queue_class in (('DistributedJobQueue', DistributedJobQueue),
+                                  ('FairShareJobQueue', FairShareJobQueue)):
+            results[name] = {}
+            for depth in self.queue_depths:
+                results[name][str(depth)] = _median_run(
+                    lambda: self._queue_ops(queue_class, depth), self.repeats
+                )
+        return results
+
+    @staticmethod
+    def _queue_ops(queue_class, depth: int) -> Dict[str, float]:
+        operations = min(depth, 2000)
+        cancels = min(depth, 100)
+        queue = queue_class(max_size=depth + operations)
+        for i in range(depth):
+            queue.enqueue(_bench_job(i))
+
+        jobs = [_bench_job(depth + i) for i in range(operations)]
+        start = time.perf_counter()
+        for job in jobs:
+            queue.enqueue(job)
+        enqueue_time = time.perf_counter() - start
+
+        victims = random.Random(depth).sample(range(depth + operations), cancels)
+        start = time.perf_counter()
+        for i in victims:
+            queue.cancel_job(f'job-{i}')
+        cancel_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(operations):
+            queue.dequeue()
+        dequeue_time = time.perf_counter() - start
+
+        return {
+            'enqueue_per_second': operations / enqueue_time,
+            'dequeue_per_second': operations / dequeue_time,
+            'cancel_per_second': cancels / cancel_time
+        }
+
+    def memory_benchmark(self) -> Dict[str, Any]:
+        """
+        Memory held per queued job, as plain dicts and as JobRecords
+
+        Jobs are built the way the API builds them, from a freshly parsed
+        JSON body, so each dict owns its own key and value strings just as
+        it would in production. Measured once per depth with tracemalloc.
+        """
+        import tracemalloc
+        from backend.job_submission.job_queue import DistributedJobQueue
+        from backend.job_submission.job_record import JobRecord
+
+        body = json.dumps({
+            'command': 'python run_sweep.py', 'type': 'compute', 'priority': 1,
+            'resources': {'cpu_cores': 2, 'memory_gb': 4.0}
+        })
+
+        def api_job(i: int) -> Dict[str, Any]:
+            return {'id': f'{i:032x}', 'status': 'QUEUED', 'submitted_at': time.time(), **json.loads(body)}
+
+        results = {}
+        for name, build in (('dict', api_job), ('record', lambda i: JobRecord(api_job(i)))):
+            results[name] = {}
+            for depth in self.memory_depths:
+                tracemalloc.start()
+                queue = DistributedJobQueue(max_size=depth)
+                for i in range(depth):
+                    queue.enqueue(build(i))
+                held = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del queue
+                results[name][str(depth)] = {'queued_mb': held / 2 ** 20, 'bytes_per_job': held / depth}
+        return results
+
+    def placement_benchmark(self, jobs: int = 256) -> Dict[str, Any]:
+        """
+        Per-job placement latency against cluster size
+        """
+        from backend.scheduler.algorithms import JobSchedulingAlgorithms
+
+        batch = [_bench_job(i) for i in range(jobs)]
+        results = {'least_loaded': {}, 'capacity_aware': {}}
+        for count in self.node_counts:
+            rng = random.Random(count)
+            nodes = [
+                {'id': f'node{i}', 'current_load': rng.random(), 'available_cpu': 8, 'available_memory': 32}
+                for i in range(count)
+            ]
+            loads = {node['id']: node['current_load'] for node in nodes}
+
+            def least_loaded():
+                start = time.perf_counter()
+                JobSchedulingAlgorithms.least_loaded_node_scheduling(batch, loads)
+                return {'per_job_us': (time.perf_counter() - start) / jobs * 1e6}
+
+            def capacity_aware():
+                start = time.perf_counter()
+                JobSchedulingAlgorithms.capacity_aware_placement(batch, nodes, loads)
+                return {'per_job_us': (time.perf_counter() - start) / jobs * 1e6}
+
+            results['least_loaded'][str(count)] = _median_run(least_loaded, self.repeats)
+            results['capacity_aware'][str(count)] = _median_run(capacity_aware, self.repeats)
+        return results
+
+    def api_benchmark(self) -> Dict[str, Any]:
+        """
+        Job submissions per second through the Flask app, without a network hop
+        """
+        from backend.job_submission.api import JobSubmissionAPI
+        from backend.job_submission.job_queue import DistributedJobQueue
+
+        def submit():
+            api = JobSubmissionAPI(DistributedJobQueue(max_size=self.api_requests))
+            client = api.app.test_client()
+            latencies = []
+            start = time.perf_counter()
+            for i in range(self.api_requests):
+                sent_at = time.perf_counter()
+                client.post('/jobs', json={'command': 'noop', 'type': 'noop', 'priority': i % 3})
+                latencies.append(time.perf_counter() - sent_at)
+            elapsed = time.perf_counter() - start
+            return {
+                'submissions_per_second': self.api_requests / elapsed,
+                'latency_p50_ms': statistics.median(latencies) * 1000
+            }
+
+        return _median_run(submit, self.repeats)
+
+    def end_to_end_benchmark(self, workers: int = 4) -> Dict[str, Any]:
+        """
+        No-op jobs per second from enqueue to completion callback on one agent
+
+        Worker processes are started and warmed before timing, so the figure
+        is the steady-state cost of queueing, placement, dispatch, the worker
+        round trip and completion handling.
+        """
+        from backend.job_submission.job_queue import DistributedJobQueue
+        from backend.node_agent.agent import NodeAgent
+        from backend.scheduler.scheduler import Scheduler
+
+        agent = NodeAgent(max_workers=workers, node_id='bench0', preload=())
+        try:
+            for i in range(workers * 2):
+                agent.execute_job({'id': f'warmup-{i}', 'type': 'noop'})
+
+            def run():
+                queue = DistributedJobQueue(max_size=self.end_to_end_jobs)
+                scheduler = Scheduler(queue, _LocalNodeRegistry({'bench0': agent}))
+                finished = threading.Semaphore(0)
+
+                def on_complete(job, result):
+                    scheduler.handle_job_completion(job['id'])
+                    finished.release()
+
+                agent.on_job_complete = on_complete
+                jobs = [_bench_job(i) for i in range(self.end_to_end_jobs)]
+                start = time.perf_counter()
+                for job in jobs:
+                    queue.enqueue(job)
+                scheduler.distribute_jobs()
+                for _ in jobs:
+                    finished.acquire()
+                elapsed = time.perf_counter() - start
+                return {'jobs_per_second': len(jobs) / elapsed}
+
+            return _median_run(run, self.repeats)
+        finally:
+            agent.on_job_complete = None
+            agent.shutdown()
+
+    def run(self, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run the selected sections (all by default) and describe the host
+        """
+        benchmarks = {
+            'queue': self.queue_benchmark,
+            'memory': self.memory_benchmark,
+            'placement': self.placement_benchmark,
+            'api': self.api_benchmark,
+            'end_to_end': self.end_to_end_benchmark
+        }
+        random.seed(0)
+        results = {name: benchmarks[name]() for name in (sections or benchmarks)}
+        return _report('scheduler', self.quick, self.repeats, results)
+
+
+def _md_worker(num_particles: int, steps: int, seed: int, start_at: float = 0.0) -> Dict[str, Any]:
+    """
+    Time one MD job in a fresh worker process and report its peak RSS
+
+    ``start_at`` lines up concurrent workers on a shared wall-clock moment.
+    """
+    import resource
+    import numpy as np
+    from backend.node_agent.molecular_dynamics import MolecularDynamicsSimulation, run_molecular_dynamics_job
+
+    np.random.seed(seed)
+    probe = MolecularDynamicsSimulation(num_particles=num_particles)
+    force_times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        probe.compute_forces()
+        force_times.append(time.perf_counter() - start)
+
+    np.random.seed(seed)
+    job = {
+        'id': f'md-bench-{num_particles}x{steps}',
+        'type': 'molecular_dynamics',
+        'simulation_parameters': {'num_particles': num_particles, 'simulation_steps': steps}
+    }
+    time.sleep(max(0.0, start_at - time.time()))
+    start = time.perf_counter()
+    result = run_molecular_dynamics_job(job)
+    elapsed = time.perf_counter() - start
+
+    energy = result['simulation_result']['total_energy']
+    return {
+        'elapsed': elapsed,
+        'force_eval_ms': statistics.median(force_times) * 1000,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'energy_drift': float((energy[-1] - energy[0]) / abs(energy[0])) if len(energy) and energy[0] else 0.0
+    }
+
+
+_transfer_states: Dict[int, List[Dict[str, Any]]] = {}
+
+
+def _md_result(num_particles: int, handoff: str) -> Any:
+    """
+    An MD final particle state of ``num_particles`` prepared for one way of returning it
+
+    ``lists`` pickles the per-particle dicts through the pipe and
+    ``shared`` leaves them in shared memory, as the node agent does with
+    large results. The particle state is generated once per worker so
+    only the handoff itself is timed.
+    """
+    import numpy as np
+    from backend.node_agent.shared_results import share_arrays
+
+    states = _transfer_states.get(num_particles)
+    if states is None:
+        rng = np.random.default_rng(num_particles)
+        states = _transfer_states[num_particles] = [
+            {'position': position, 'velocity': velocity, 'mass': mass, 'charge': charge}
+            for position, velocity, mass, charge in zip(
+                rng.uniform(0, 100, (num_particles, 3)).tolist(), rng.normal(0, 1, (num_particles, 3)).tolist(),
+                rng.uniform(1, 2, num_particles).tolist(), rng.uniform(-1, 1, num_particles).tolist()
+            )
+        ]
+    if handoff == 'shared':
+        return share_arrays(states, 1)
+    return states
+
+
+class MolecularDynamicsBenchmark:
+    """
+    Speed and accuracy of the MD kernel across problem sizes and worker counts
+
+    Each configuration runs ``run_molecular_dynamics_job`` in its own
+    forkserver process, so the reported peak RSS belongs to that run
+    alone. Particle positions are seeded, which makes the energy series
+    reproducible: a change to the force or integration code that alters
+    the physics shows up as a different ``energy_drift``, and one that
+    slows it down as lower throughput. Throughput is given in reduced
+    time units per day (the ns/day of a production MD code) and in
+    particle-steps per second, which stays comparable across sizes.
+    """
+    def __init__(self, repeats: int = 3, quick: bool = False, seed: int = 0):
+        self.repeats = repeats
+        self.quick = quick
+        self.seed = seed
+        self.particle_counts = (25, 50) if quick else (25, 50, 100)
+        self.step_counts = (5,) if quick else (10, 40)
+        # More workers than CPUs would only measure oversubscription
+        cpus = os.cpu_count() or 1
+        self.worker_counts = (1,) if quick else tuple(count for count in (1, 2, 4) if count <= cpus)
+        self.transfer_sizes = (20000,) if quick else (20000, 200000)
+
+    def kernel_benchmark(self) -> Dict[str, Any]:
+        """
+        Single-worker throughput, force evaluation time, memory and drift per size
+        """
+        results = {}
+        for num_particles in self.particle_counts:
+            for steps in self.step_counts:
+                results[f'{num_particles}x{steps}'] = _median_run(
+                    lambda: self._measure(num_particles, steps, workers=1), self.repeats
+                )
+        return results
+
+    def scaling_benchmark(self) -> Dict[str, Any]:
+        """
+        Aggregate throughput of identical jobs running in parallel workers
+        """
+        num_particles, steps = self.particle_counts[-1], self.step_counts[0]
+        results = {}
+        for workers in self.worker_counts:
+            results[str(workers)] = _median_run(
+                lambda: self._measure(num_particles, steps, workers), self.repeats
+            )
+        single = results[str(self.worker_counts[0])]['particle_steps_per_second'] / self.worker_counts[0]
+        for workers, stats in results.items():
+            stats['parallel_efficiency'] = stats['particle_steps_per_second'] / (single * int(workers))
+        return {'particles': num_particles, 'steps': steps, 'workers': results}
+
+    def transfer_benchmark(self) -> Dict[str, Any]:
+        """
+        Time to get a final particle state from a worker to the agent
+
+        Compares pickling the result with leaving it in shared memory,
+        through the same ``WorkerPool`` pipe the node agent uses. Both
+        hand over the same ``final_particle_states`` list; the shared
+        timing includes packing it into blocks and rebuilding it.
+        """
+        from backend.node_agent.shared_results import attach_arrays
+        from backend.node_agent.worker_pool import WorkerPool, get_worker_context, preload_modules
+
+        preload = ('numpy', 'backend.performance.benchmarking')
+        pool = WorkerPool(processes=1, context=get_worker_context('forkserver', preload),
+                          initializer=preload_modules, initargs=(preload,))
+        results = {}
+        try:
+            for num_particles in self.transfer_sizes:
+                pool.submit('warmup', _md_result, (num_particles, 'lists')).result()
+                stats = {'result_mib': num_particles * 8 * 8 / 1024 ** 2}
+                for handoff in ('lists', 'shared'):
+                    def measure():
+                        start = time.perf_counter()
+                        result = pool.submit(handoff, _md_result, (num_particles, handoff)).result()
+                        if handoff == 'shared':
+                            result = attach_arrays(result)
+                        elapsed = time.perf_counter() - start
+                        del result
+                        return {'elapsed_ms': elapsed * 1000}
+                    stats[f'{handoff}_ms'] = _median_run(measure, self.repeats)['elapsed_ms']
+                stats['speedup_vs_lists'] = stats['lists_ms'] / stats['shared_ms']
+                results[str(num_particles)] = stats
+        finally:
+            pool.shutdown()
+        return results
+
+    def _measure(self, num_particles: int, steps: int, workers: int) -> Dict[str, float]:
+        from concurrent.futures import ProcessPoolExecutor
+        from backend.node_agent.molecular_dynamics import TIMESTEP
+
+        context = multiprocessing.get_context('forkserver')
+        executors = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(workers)]
+        try:
+            for executor in executors:
+                executor.submit(int).result()  # Start the worker before timing
+            start_at = time.time() + 0.05
+            runs = [
+                future.result() for future in [
+                    executor.submit(_md_worker, num_particles, steps, self.seed, start_at)
+                    for executor in executors
+                ]
+            ]
+        finally:
+            for executor in executors:
+                executor.shutdown()
+
+        elapsed = max(run['elapsed'] for run in runs)
+        return {
+            'steps_per_second': workers * steps / elapsed,
+            'particle_steps_per_second': workers * steps * num_particles / elapsed,
+            'time_units_per_day': workers * steps * TIMESTEP / elapsed * 86400,
+            'force_eval_ms': statistics.median(run['force_eval_ms'] for run in runs),
+            'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+            'energy_drift': runs[0]['energy_drift']
+        }
+
+    def run(self, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        benchmarks = {
+            'kernel': self.kernel_benchmark,
+            'scaling': self.scaling_benchmark,
+            'transfer': self.transfer_benchmark
+        }
+        results = {name: benchmarks[name]() for name in (sections or benchmarks)}
+        return _report('molecular_dynamics', self.quick, self.repeats, results)
+
+
+def import_profile(module: str) -> List[Tuple[str, float, float]]:
+    """
+    Import a module in a fresh interpreter under ``-X importtime``
+
+    Returns (module, self ms, cumulative ms) for every module the import
+    loaded, in the order Python reports them, which ends with ``module``.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=REPO_ROOT, check=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return entries
+
+
+def _run_script(script: str) -> Dict[str, float]:
+    """
+    Run a snippet in a fresh interpreter; it prints its metrics as a JSON line
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', script], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, cwd=REPO_ROOT
+    )
+    line = process.stdout.readline()
+    elapsed = time.perf_counter() - started
+    process.stdout.close()
+    process.wait()
+    if not line:
+        raise RuntimeError(f"Benchmark script exited with code {process.returncode}")
+    metrics = json.loads(line)
+    metrics['process_ms'] = elapsed * 1000
+    return metrics
+
+
+_SERVICES_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from backend.main import start_services
+start_services()
+print(json.dumps({'serving_ms': (time.perf_counter() - started) * 1000}), flush=True)
+"""
+
+_AGENT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from backend.node_agent.agent import NodeAgent
+agent = NodeAgent(max_workers={workers}, lazy_workers={lazy})
+ready = time.perf_counter()
+agent.execute_job({{'id': 'first', 'type': 'compute', 'duration': 0}})
+done = time.perf_counter()
+print(json.dumps({{'start_ms': (ready - started) * 1000, 'first_job_ms': (done - started) * 1000}}), flush=True)
+agent.shutdown()
+"""
+
+
+class StartupBenchmark:
+    """
+    How long the scheduler and a node agent take to come up
+
+    Every measurement runs in a fresh interpreter, since a warm module
+    cache or a running fork server would hide exactly the costs measured
+    here. ``imports`` times ``STARTUP_IMPORTS`` under ``-X importtime``
+    and lists the slowest modules each one loads; ``services`` times
+    ``start_services`` until the API could serve; ``agent`` compares a
+    node agent spawning its workers up front with one spawning them on
+    the first job.
+    """
+    def __init__(self, repeats: int = 3, quick: bool = False):
+        self.repeats = repeats
+        self.quick = quick
+        self.slowest = 5 if quick else 15
+        self.agent_workers = 2 if quick else 4
+
+    def imports_benchmark(self) -> Dict[str, Any]:
+        """
+        Import time of each entry point, with its slowest dependencies
+        """
+        results = {}
+        for module in STARTUP_IMPORTS:
+            profiles = [import_profile(module) for _ in range(self.repeats)]
+            dependencies = sorted(profiles[0][:-1], key=lambda entry: entry[2], reverse=True)
+            results[module] = {
+                'import_ms': statistics.median(profile[-1][2] for profile in profiles),
+                'modules': len(profiles[0]),
+                'slowest': [
+                    {'module': name, 'self_ms': self_ms, 'cumulative_ms': cumulative_ms}
+                    for name, self_ms, cumulative_ms in dependencies[:self.slowest]
+                ]
+            }
+        return results
+
+    def services_benchmark(self) -> Dict[str, float]:
+        """
+        Time until ``start_services`` returns, in-process and from interpreter launch
+        """
+        return _median_run(lambda: _run_script(_SERVICES_SCRIPT), self.repeats)
+
+    def agent_benchmark(self) -> Dict[str, Any]:
+        """
+        Node agent construction and first job latency, lazy versus eager workers
+        """
+        return {
+            mode: _median_run(
+                lambda: _run_script(_AGENT_SCRIPT.format(workers=self.agent_workers, lazy=lazy)), self.repeats
+            )
+            for mode, lazy in (('lazy', True), ('eager', False))
+        }
+
+    def run(self, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        benchmarks = {
+            'imports': self.imports_benchmark,
+            'services': self.services_benchmark,
+            'agent': self.agent_benchmark
+        }
+        results = {name: benchmarks[name]() for name in (sections or benchmarks)}
+        return _report('startup', self.quick, self.repeats, results)
+
+
+# Benchmark suites runnable from the command line, with their sections
+SUITES = {
+    'scheduler': (SchedulerBenchmark, ('queue', 'memory', 'placement', 'api', 'end_to_end')),
+    'md': (MolecularDynamicsBenchmark, ('kernel', 'scaling', 'transfer')),
+    'startup': (StartupBenchmark, ('imports', 'services', 'agent'))
+}
+
+
+def _report(suite: str, quick: bool, repeats: int, results: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'suite': suite,
+        'quick': quick,
+        'repeats': repeats,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'timestamp': time.time(),
+        'results': results
+    }
+
+
+def _flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = float(value)
+    return flat
+
+
+def compare_to_baseline(report: Dict[str, Any],
+                        baseline: Dict[str, Any],
+                        tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Metrics that got worse than the baseline by more than ``tolerance``
+
+    Only metrics present in both reports are compared, so a quick run can
+    be checked against a full baseline. Throughput may not fall, latency
+    and memory may not rise, and drift may not grow in magnitude by more
+    than ``tolerance``.
+    """
+    current = _flatten(report['results'])
+    reference = _flatten(baseline['results'])
+    regressions = []
+    for name in sorted(current.keys() & reference.keys()):
+        value, expected = current[name], reference[name]
+        if name.endswith(SMALLER_MAGNITUDE_IS_BETTER):
+            if expected == 0:
+                continue
+            change = abs(value) / abs(expected) - 1
+        elif expected <= 0:
+            continue
+        elif name.endswith(HIGHER_IS_BETTER):
+            change = expected / value - 1 if value > 0 else float('inf')
+        elif name.endswith(LOWER_IS_BETTER):
+            change = value / expected - 1
+        else:
+            continue
+        if change > tolerance:
+            regressions.append({'metric': name, 'baseline': expected, 'current': value, 'change': change})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler, the MD kernel or startup")
+    parser.add_argument('--suite', choices=sorted(SUITES), default='scheduler')
+    parser.add_argument('--sections', nargs='+',
+                        choices=sorted({section for _, sections in SUITES.values() for section in sections}),
+                        help="Run only these sections of the suite")
+    parser.add_argument('--quick', action='store_true', help="Smaller sizes for a fast smoke run")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', help="Baseline report to compare against (default: baselines/<suite>.json)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--force', action='store_true',
+                        help="Compare even against a baseline recorded in a different environment")
+    args = parser.parse_args(argv)
+
+    benchmark_class, sections = SUITES[args.suite]
+    unknown = set(args.sections or ()) - set(sections)
+    if unknown:
+        parser.error(f"Suite {args.suite} has no sections {sorted(unknown)}")
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f'{args.suite}.json')
+
+    report = benchmark_class(repeats=args.repeats, quick=args.quick).run(args.sections)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, 'w') as baseline_file:
+            baseline_file.write(output + '\n')
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; skipping comparison", file=sys.stderr)
+        return 0
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('environment') != report['environment']:
+        if not args.force:
+            print(
+                "Baseline was recorded in a different environment; skipping comparison "
+                "(re-record it with --save-baseline, or pass --force)",
+                file=sys.stderr
+            )
+            return 0
+        print("Baseline was recorded in a different environment; expect noise", file=sys.stderr)
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['metric']}: {regression['current']:.4g} "
+            f"vs baseline {regression['baseline']:.4g} ({regression['change']:.0%} worse)",
+            file=sys.stderr
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
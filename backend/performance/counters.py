@@ -0,0 +1,180 @@
+# File: distributed-job-scheduler/backend/performance/counters.py
+
+import math
+import threading
+import weakref
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class _ShardOwner:
+    """
+    Held only by a thread's local storage, so it dies with the thread
+    """
+    __slots__ = ('__weakref__',)
+
+
+class ShardedCounter:
+    """
+    Monotonic counter with one shard per thread, summed only when scraped
+
+    ``inc`` touches nothing but the calling thread's own dict, so hot
+    paths never contend on a lock. A thread's shard is folded into a
+    retired total as soon as the thread exits and its local storage is
+    released, so short-lived request threads do not pile up shards even
+    when nothing scrapes. Samples are exposed as ``<name>_total``.
+    """
+    metric_type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.family = name if name.endswith('_total') else name + '_total'
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: Dict[int, Dict[LabelValues, float]] = {}  # Live threads' shards by id
+        self._retired: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()  # Guards the shards and retired total, not increments
+
+    def inc(self, amount: float = 1.0, labels: LabelValues = ()) -> None:
+        try:
+            values = self._local.values
+        except AttributeError:
+            values = self._new_shard()
+        values[labels] = values.get(labels, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        """
+        Current totals per label combination
+        """
+        with self._lock:
+            totals = dict(self._retired)
+            snapshots = [values.copy() for values in self._shards.values()]
+
+        for snapshot in snapshots:
+            for labels, value in snapshot.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def total(self) -> float:
+        return sum(self.values().values())
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [
+            (self.family, format_labels(self.labelnames, labels), value)
+            for labels, value in sorted(self.values().items())
+        ]
+
+    def _new_shard(self) -> Dict[LabelValues, float]:
+        values: Dict[LabelValues, float] = {}
+        owner = _ShardOwner()
+        with self._lock:
+            self._shards[id(values)] = values
+        weakref.finalize(owner, self._retire, values)
+        self._local.values = values
+        self._local.owner = owner
+        return values
+
+    def _retire(self, values: Dict[LabelValues, float]) -> None:
+        """
+        Fold an exited thread's shard into the retired total
+        """
+        with self._lock:
+            del self._shards[id(values)]
+            for labels, value in values.items():
+                self._retired[labels] = self._retired.get(labels, 0.0) + value
+
+
+class Gauge:
+    """
+    Value that can go up and down, set directly or computed at scrape time
+
+    ``set`` is a single dict store, so it needs no lock either.
+    """
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.family = name
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self._values[labels] = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        Compute the (unlabelled) value when scraped instead of on every change
+        """
+        self._function = function
+
+    def values(self) -> Dict[LabelValues, float]:
+        if self._function is not None:
+            return {(): float(self._function())}
+        return self._values.copy()
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [
+            (self.family, format_labels(self.labelnames, labels), value)
+            for labels, value in sorted(self.values().items())
+        ]
+
+
+class MetricsRegistry:
+    """
+    Named counters and gauges rendered in Prometheus text exposition format
+    """
+    def __init__(self):
+        self.metrics: Dict[str, Any] = {}
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> ShardedCounter:
+        return self._register(ShardedCounter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """
+        Register a callable returning extra exposition lines at scrape time
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.family} {metric.documentation}')
+            lines.append(f'# TYPE {metric.family} {metric.metric_type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        for collector in self.collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
@@ -0,0 +1,178 @@
+# File: distributed-job-scheduler/backend/performance/histogram.py
+
+import math
+import time
+from typing import Dict, Any, Iterable, Optional
+
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with bounded relative error
+
+    Values land in logarithmic buckets whose width grows with the value,
+    so every quantile is reported within ``relative_accuracy`` of an
+    actual sample (1% by default). Adding a value is a single dict
+    increment; sketches with the same accuracy merge by adding bucket
+    counts, so per-node or per-window sketches can be combined exactly.
+    Memory is capped at ``max_buckets`` by folding the lowest buckets
+    together, which only coarsens the smallest quantiles.
+    """
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.max_buckets = max_buckets
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0  # Values at or below min_value, including negatives
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: 'DDSketch') -> None:
+        """
+        Fold another sketch with the same accuracy into this one
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles((q,))[0]
+
+    def summary(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {'count': 0}
+        p50, p95, p99 = self.quantiles((0.50, 0.95, 0.99))
+        return {
+            'count': self.count,
+            'mean': self.sum / self.count,
+            'p50': p50,
+            'p95': p95,
+            'p99': p99,
+            'max': self.max
+        }
+
+    def quantiles(self, qs: Iterable[float]):
+        """
+        Several quantiles from one pass over the sorted buckets
+        """
+        qs = list(qs)
+        results = [None] * len(qs)
+        if self.count == 0:
+            return results
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        ranks = [qs[i] * (self.count - 1) for i in order]
+
+        position = 0
+        seen = self.zero_count
+        floor = max(self.min, 0.0) if self.min <= self.min_value else self.min
+        while position < len(ranks) and ranks[position] < seen:
+            results[order[position]] = floor
+            position += 1
+        for index in sorted(self.buckets):
+            if position == len(ranks):
+                break
+            seen += self.buckets[index]
+            estimate = min(max(2 * self.gamma ** index / (self.gamma + 1), self.min), self.max)
+            while position < len(ranks) and ranks[position] < seen:
+                results[order[position]] = estimate
+                position += 1
+        for i in order[position:]:
+            results[i] = self.max
+        return results
+
+    def copy(self) -> 'DDSketch':
+        sketch = DDSketch(self.relative_accuracy, self.min_value, self.max_buckets)
+        sketch.merge(self)
+        return sketch
+
+    def _collapse(self) -> None:
+        """
+        Merge the lowest buckets so at most max_buckets remain
+        """
+        indices = sorted(self.buckets)
+        excess = len(indices) - self.max_buckets
+        target = indices[excess]
+        for index in indices[:excess]:
+            self.buckets[target] += self.buckets.pop(index)
+
+
+class WindowedSketch:
+    """
+    All-time sketch plus a sliding window built from rotating sub-sketches
+
+    The window is split into ``slots`` intervals with one sketch each.
+    A value goes into the all-time sketch and the current interval's
+    sketch; intervals older than the window are dropped as time moves on.
+    Window queries merge the live intervals, so a 5-minute view costs a
+    handful of merges rather than a rescan of samples.
+    """
+    def __init__(self, window: float = 300.0, slots: int = 10, relative_accuracy: float = 0.01):
+        self.window = window
+        self.slot_width = window / slots
+        self.relative_accuracy = relative_accuracy
+        self.total = DDSketch(relative_accuracy)
+        self.slots: Dict[int, DDSketch] = {}  # Slot number -> sketch
+        self.num_slots = slots
+
+    def add(self, value: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        slot = int(now // self.slot_width)
+        sketch = self.slots.get(slot)
+        if sketch is None:
+            sketch = self.slots[slot] = DDSketch(self.relative_accuracy)
+            self._expire(slot)
+        sketch.add(value)
+        self.total.add(value)
+
+    def windowed(self, now: Optional[float] = None) -> DDSketch:
+        """
+        Merged sketch of values from the last ``window`` seconds
+        """
+        now = time.time() if now is None else now
+        current = int(now // self.slot_width)
+        merged = DDSketch(self.relative_accuracy)
+        for slot, sketch in self.slots.items():
+            if current - self.num_slots < slot <= current:
+                merged.merge(sketch)
+        return merged
+
+    def _expire(self, current: int) -> None:
+        for slot in [slot for slot in self.slots if slot <= current - self.num_slots]:
+            del self.slots[slot]
+
+
+def merge_sketches(sketches: Iterable[DDSketch], relative_accuracy: float = 0.01) -> DDSketch:
+    merged = DDSketch(relative_accuracy)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
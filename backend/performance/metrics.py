@@ -3,25 +3,63 @@
 import time
 import threading
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from .counters import MetricsRegistry, format_labels
+from .histogram import DDSketch, WindowedSketch, merge_sketches
+
+# Latency distributions kept per (job type, node)
+LATENCY_METRICS = ('wait_time', 'run_time', 'dispatch_latency')
+
+# Span of the sliding window reported next to the all-time figures
+LATENCY_WINDOW_SECONDS = 300
+
+# Quantiles exported for each latency summary on /metrics
+EXPORTED_QUANTILES = (0.5, 0.95, 0.99)
 
 
 class PerformanceMetrics:
     """
     Comprehensive performance metrics collection and analysis
+
+    Event counts (enqueue, dispatch, completion, failure) and gauges live
+    in a ``MetricsRegistry`` of per-thread counters, so the scheduling hot
+    paths never wait on ``self.lock``; they are only summed when a summary
+    or a ``/metrics`` scrape asks for them.
     """
 
-    def __init__(self, collection_interval: int = 60):
+    def __init__(self, collection_interval: int = 60, latency_window: float = LATENCY_WINDOW_SECONDS):
+        self.registry = MetricsRegistry()
+        self.jobs_enqueued = self.registry.counter(
+            'scheduler_jobs_enqueued', 'Jobs added to the queue', ('job_type',))
+        self.jobs_dispatched = self.registry.counter(
+            'scheduler_jobs_dispatched', 'Jobs handed to a node', ('node',))
+        self.jobs_completed = self.registry.counter(
+            'scheduler_jobs_completed', 'Jobs that finished successfully', ('job_type',))
+        self.jobs_failed = self.registry.counter(
+            'scheduler_jobs_failed', 'Job failures reported by nodes', ('job_type',))
+        self.processing_seconds = self.registry.counter(
+            'scheduler_job_processing_seconds', 'Run time of completed jobs')
+        self.artifact_bytes_local = self.registry.counter(
+            'scheduler_artifact_bytes_local', 'Job input bytes already cached on the chosen node')
+        self.artifact_bytes_fetched = self.registry.counter(
+            'scheduler_artifact_bytes_fetched', 'Job input bytes the chosen node had to fetch')
+        self.queue_length = self.registry.gauge(
+            'scheduler_queue_length', 'Jobs waiting in the queue')
+        self.node_utilization = self.registry.gauge(
+            'scheduler_node_utilization', 'Last reported utilization of each node', ('node',))
+        self.registry.add_collector(self._render_latencies)
+        self.registry.add_collector(self._render_prediction_errors)
+
         self.metrics = {
-            'jobs_processed': 0,
-            'total_processing_time': 0,
-            'average_job_duration': 0,
-            'node_utilization': {},
-            'queue_metrics': {
-                'queue_length': 0,
-                'wait_times': []
-            }
+            'owner_wait_times': {},
+            'time_to_start': {},
+            'prediction_error': {}
+        }
+        # metric -> (job type, node) -> sketch
+        self.latencies: Dict[str, Dict[Tuple[str, str], WindowedSketch]] = {
+            metric: {} for metric in LATENCY_METRICS
         }
+        self.latency_window = latency_window
         self.collection_interval = collection_interval
         self.logger = logging.getLogger('PerformanceMetrics')
         self.lock = threading.Lock()
@@ -30,18 +68,17 @@ class PerformanceMetrics:
         """
         Record metrics for a completed job
         """
+        now = time.time()
+        job_duration = job.get('end_time', now) - job.get('start_time', now)
+        wait_time = job.get('start_time', now) - job.get('submitted_at', now)
+        job_type = job.get('type') or 'unknown'
+        node_id = job.get('node_id') or 'unknown'
+        self.jobs_completed.inc(labels=(job_type,))
+        self.processing_seconds.inc(job_duration)
         with self.lock:
-            self.metrics['jobs_processed'] += 1
-            job_duration = job.get('end_time', time.time()) - job.get('start_time', time.time())
-
-            self.metrics['total_processing_time'] += job_duration
-            self.metrics['average_job_duration'] = (
-                self.metrics['total_processing_time'] / self.metrics['jobs_processed']
-            )
-
-            # Record wait time
-            wait_time = job.get('start_time', time.time()) - job.get('submitted_at', time.time())
-            self.metrics['queue_metrics']['wait_times'].append(wait_time)
+            # Record wait and run time distributions
+            self._record_latency('wait_time', job_type, node_id, wait_time, now)
+            self._record_latency('run_time', job_type, node_id, job_duration, now)
 
             # Additional molecular dynamics specific metrics
             if job.get('type') == 'molecular_dynamics':
@@ -58,39 +95,212 @@ class PerformanceMetrics:
                     )
                 }
 
+    def record_enqueue(self, job: Dict[str, Any]):
+        """
+        Count a job entering the queue
+        """
+        self.jobs_enqueued.inc(labels=(job.get('type') or 'unknown',))
+
+    def record_dispatch(self, job: Dict[str, Any], node_id: str):
+        """
+        Count a job handed to a node
+        """
+        self.jobs_dispatched.inc(labels=(node_id,))
+
+    def record_artifact_placement(self, local_bytes: int, total_bytes: int):
+        """
+        Count a dispatched job's input bytes found on its node versus transferred
+        """
+        self.artifact_bytes_local.inc(local_bytes)
+        self.artifact_bytes_fetched.inc(total_bytes - local_bytes)
+
+    def record_job_failure(self, job: Dict[str, Any]):
+        """
+        Count a job failure reported by a node
+        """
+        self.jobs_failed.inc(labels=(job.get('type') or 'unknown',))
+
+    def record_owner_wait(self, owner: str, wait_time: float):
+        """
+        Record queue wait time of a job dispatched for a fair-share owner
+        """
+        with self.lock:
+            self._sketch('owner_wait_times', owner).add(wait_time)
+
+    def record_time_to_start(self, job: Dict[str, Any], seconds: float):
+        """
+        Record how long a job waited between submission and dispatch, by priority
+        """
+        with self.lock:
+            self._sketch('time_to_start', job.get('priority', 5)).add(seconds)
+
+    def record_prediction_error(self, job: Dict[str, Any], predicted: float, actual: float):
+        """
+        Record the relative error of a job's predicted runtime, by job type
+        """
+        if actual <= 0:
+            return
+        with self.lock:
+            self._sketch('prediction_error', job.get('type') or 'unknown').add(abs(predicted - actual) / actual)
+
+    def record_dispatch_latency(self, job: Dict[str, Any], node_id: str, seconds: float):
+        """
+        Record how long handing a job to its node took
+        """
+        job_type = job.get('type') or 'unknown'
+        now = time.time()
+        with self.lock:
+            self._record_latency('dispatch_latency', job_type, node_id or 'unknown', seconds, now)
+
+    def get_latency_summary(self, metric: str, window: bool = True) -> Dict[str, Any]:
+        """
+        Quantiles of one latency metric overall, by job type and by node
+
+        With ``window`` set, only the last ``latency_window`` seconds count.
+        """
+        now = time.time()
+        with self.lock:
+            sketches = {
+                key: (sketch.windowed(now) if window else sketch.total.copy())
+                for key, sketch in self.latencies[metric].items()
+            }
+
+        by_type: Dict[str, DDSketch] = {}
+        by_node: Dict[str, DDSketch] = {}
+        for (job_type, node_id), sketch in sketches.items():
+            by_type.setdefault(job_type, DDSketch()).merge(sketch)
+            by_node.setdefault(node_id, DDSketch()).merge(sketch)
+        return {
+            'overall': merge_sketches(sketches.values()).summary(),
+            'by_job_type': {job_type: sketch.summary() for job_type, sketch in by_type.items()},
+            'by_node': {node_id: sketch.summary() for node_id, sketch in by_node.items()}
+        }
+
+    def _record_latency(self, metric: str, job_type: str, node_id: str, seconds: float, now: float):
+        """
+        Add a sample to the job type / node sketch (caller holds the lock)
+        """
+        key = (job_type, node_id)
+        sketch = self.latencies[metric].get(key)
+        if sketch is None:
+            sketch = self.latencies[metric][key] = WindowedSketch(self.latency_window)
+        sketch.add(seconds, now)
+
+    def _sketch(self, metric: str, key) -> DDSketch:
+        """
+        Sketch for one owner or priority (caller holds the lock)
+        """
+        sketch = self.metrics[metric].get(key)
+        if sketch is None:
+            sketch = self.metrics[metric][key] = DDSketch()
+        return sketch
+
     def update_node_utilization(self, node_id: str, utilization: float):
         """
         Update utilization for a specific node
         """
-        with self.lock:
-            self.metrics['node_utilization'][node_id] = utilization
+        self.node_utilization.set(utilization, labels=(node_id,))
 
     def update_queue_length(self, length: int):
         """
         Update current queue length
         """
-        with self.lock:
-            self.metrics['queue_metrics']['queue_length'] = length
+        self.queue_length.set(length)
 
     def get_performance_summary(self) -> Dict[str, Any]:
         """
         Generate a comprehensive performance summary
         """
+        jobs_processed = self.jobs_completed.total()
+        processing_time = self.processing_seconds.total()
+        queue_length = self.queue_length.values().get((), 0)
         with self.lock:
-            return {
-                'total_jobs_processed': self.metrics['jobs_processed'],
-                'average_job_duration': self.metrics['average_job_duration'],
-                'node_utilization': self.metrics['node_utilization'],
+            wait_times = merge_sketches(
+                sketch.total for sketch in self.latencies['wait_time'].values()
+            )
+            summary = {
+                'total_jobs_processed': int(jobs_processed),
+                'average_job_duration': processing_time / jobs_processed if jobs_processed else 0,
+                'node_utilization': {
+                    labels[0]: value for labels, value in self.node_utilization.values().items()
+                },
                 'queue_metrics': {
-                    'current_length': self.metrics['queue_metrics']['queue_length'],
-                    'average_wait_time': (
-                        sum(self.metrics['queue_metrics']['wait_times']) /
-                        len(self.metrics['queue_metrics']['wait_times'])
-                        if self.metrics['queue_metrics']['wait_times'] else 0
-                    )
+                    'current_length': queue_length,
+                    'average_wait_time': wait_times.sum / wait_times.count if wait_times.count else 0
+                },
+                'owner_wait_times': {
+                    owner: sketch.summary()
+                    for owner, sketch in self.metrics['owner_wait_times'].items()
+                },
+                'time_to_start': {
+                    priority: sketch.summary()
+                    for priority, sketch in self.metrics['time_to_start'].items()
+                },
+                'artifact_bytes': {
+                    'local': int(self.artifact_bytes_local.total()),
+                    'fetched': int(self.artifact_bytes_fetched.total())
+                },
+                'runtime_prediction_error': {
+                    job_type: sketch.summary()
+                    for job_type, sketch in self.metrics['prediction_error'].items()
                 },
                 'timestamp': time.time()
             }
+        summary['latency'] = {metric: self.get_latency_summary(metric) for metric in LATENCY_METRICS}
+        return summary
+
+    def render_prometheus(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format
+        """
+        return self.registry.render()
+
+    def _render_latencies(self):
+        """
+        Exposition lines for the all-time latency sketches, as summaries
+        """
+        with self.lock:
+            sketches = {
+                metric: {key: sketch.total.copy() for key, sketch in self.latencies[metric].items()}
+                for metric in LATENCY_METRICS
+            }
+
+        lines = []
+        for metric, by_key in sketches.items():
+            name = f'scheduler_{metric}_seconds'
+            lines.append(f'# HELP {name} {metric.replace("_", " ").capitalize()} by job type and node')
+            lines.append(f'# TYPE {name} summary')
+            for (job_type, node_id), sketch in sorted(by_key.items()):
+                labels = format_labels(('job_type', 'node'), (job_type, node_id))
+                for q, value in zip(EXPORTED_QUANTILES, sketch.quantiles(EXPORTED_QUANTILES)):
+                    quantile_labels = labels[:-1] + f',quantile="{q}"}}'
+                    lines.append(f'{name}{quantile_labels} {value!r}')
+                lines.append(f'{name}_sum{labels} {sketch.sum!r}')
+                lines.append(f'{name}_count{labels} {sketch.count}')
+        return lines
+
+    def _render_prediction_errors(self):
+        """
+        Exposition lines for the relative runtime prediction error, as a summary
+        """
+        with self.lock:
+            sketches = {job_type: sketch.copy() for job_type, sketch in self.metrics['prediction_error'].items()}
+        if not sketches:
+            return []
+
+        name = 'scheduler_runtime_prediction_error_ratio'
+        lines = [
+            f'# HELP {name} Relative error of predicted job runtimes by job type',
+            f'# TYPE {name} summary'
+        ]
+        for job_type, sketch in sorted(sketches.items()):
+            labels = format_labels(('job_type',), (job_type,))
+            for q, value in zip(EXPORTED_QUANTILES, sketch.quantiles(EXPORTED_QUANTILES)):
+                quantile_labels = labels[:-1] + f',quantile="{q}"}}'
+                lines.append(f'{name}{quantile_labels} {value!r}')
+            lines.append(f'{name}_sum{labels} {sketch.sum!r}')
+            lines.append(f'{name}_count{labels} {sketch.count}')
+        return lines
 
     def start_periodic_reporting(self):
         """
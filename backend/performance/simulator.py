@@ -0,0 +1,566 @@
+# File: distributed-job-scheduler/backend/performance/simulator.py
+
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+from backend.fault_tolerance.heartbeat import HeartbeatMonitor
+from backend.job_submission.job_queue import DistributedJobQueue
+from backend.scheduler.advanced_scheduler import AdvancedLoadBalancer, Job
+from backend.scheduler.algorithms import JobSchedulingAlgorithms
+from backend.scheduler.scheduler import Scheduler
+from .histogram import DDSketch
+from .workload_trace import load_workload, trace_files
+
+# Event kinds, in the order they run when due at the same instant
+ARRIVAL, COMPLETION, NODE_FAILURE, NODE_RECOVERY, HEARTBEAT, SCHEDULE = range(6)
+
+# Node sizes (cores, memory GB) the default fleet cycles through
+DEFAULT_NODE_SHAPES = ((8, 32), (16, 64), (32, 128))
+
+
+class VirtualClock:
+    """
+    Simulation time, advanced only by the event loop
+    """
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimulatedNode:
+    """
+    Compute node model with the interface the scheduler expects from an agent
+
+    Jobs start in arrival order once their cores and memory fit; a job
+    larger than the node runs alone. A failed node refuses dispatches
+    and loses everything it held until it recovers.
+    """
+    def __init__(self, simulation: 'ClusterSimulation', node_id: str, cpu_cores: int, memory_gb: float):
+        self.simulation = simulation
+        self.node_id = node_id
+        self.cpu_cores = cpu_cores
+        self.memory_gb = memory_gb
+        self.alive = True
+        self.epoch = 0  # Bumped on failure so stale completions are ignored
+        self.used_cores = 0.0
+        self.used_memory = 0.0
+        self.queued_cores = 0.0
+        self.running: Dict[str, Tuple[Dict[str, Any], float]] = {}  # job id -> (job, started at)
+        self.waiting = deque()
+        self.lost_jobs: List[Dict[str, Any]] = []
+
+    def receive_jobs(self, jobs: List[Dict[str, Any]]) -> List:
+        if not self.alive:
+            raise ConnectionError(f"Node {self.node_id} is unreachable")
+        for job in jobs:
+            self.waiting.append(job)
+            self.queued_cores += _cores(job)
+        self._start_waiting()
+        return []
+
+    def cancel_job(self, job_id: str) -> bool:
+        return False
+
+    def preempt_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def checkpoint_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Node record as a registry would report it
+        """
+        return {
+            'id': self.node_id,
+            'cpu_cores': self.cpu_cores,
+            'available_cpu': self.cpu_cores - self.used_cores,
+            'available_memory': self.memory_gb - self.used_memory,
+            'current_load': (self.used_cores + self.queued_cores) / self.cpu_cores
+        }
+
+    def complete(self, job_id: str, epoch: int) -> None:
+        if epoch != self.epoch or job_id not in self.running:
+            return
+        job, started_at = self.running.pop(job_id)
+        self.used_cores -= _cores(job)
+        self.used_memory -= _memory(job)
+        self.simulation.record_completion(job, self, started_at)
+        self._start_waiting()
+
+    def fail(self) -> None:
+        now = self.simulation.clock()
+        for job, started_at in self.running.values():
+            self.simulation.record_lost_work(job, now - started_at)
+        self.lost_jobs = [job for job, _ in self.running.values()] + list(self.waiting)
+        self.running.clear()
+        self.waiting.clear()
+        self.used_cores = self.used_memory = self.queued_cores = 0.0
+        self.alive = False
+        self.epoch += 1
+
+    def recover(self) -> None:
+        self.alive = True
+
+    def _start_waiting(self) -> None:
+        while self.waiting:
+            job = self.waiting[0]
+            cores, memory = _cores(job), _memory(job)
+            fits = (self.used_cores + cores <= self.cpu_cores and
+                    self.used_memory + memory <= self.memory_gb)
+            if not fits and self.running:
+                return
+            self.waiting.popleft()
+            self.queued_cores -= cores
+            self.used_cores += cores
+            self.used_memory += memory
+            now = self.simulation.clock()
+            self.running[job['id']] = (job, now)
+            self.simulation.record_start(job)
+            self.simulation.schedule(now + job['runtime'], COMPLETION, (self, job['id'], self.epoch))
+
+
+class SimulatedNodeRegistry:
+    """
+    Registry over simulated nodes, shared by the scheduler and heartbeat monitor
+    """
+    def __init__(self, nodes: List[SimulatedNode]):
+        self.nodes = {node.node_id: node for node in nodes}
+        self.inactive = set()
+
+    def get_active_nodes(self) -> List[Dict[str, Any]]:
+        return [node.describe() for node_id, node in self.nodes.items() if node_id not in self.inactive]
+
+    def get_node(self, node_id: str) -> SimulatedNode:
+        return self.nodes[node_id]
+
+    def mark_node_inactive(self, node_id: str) -> None:
+        self.inactive.add(node_id)
+
+    def mark_node_active(self, node_id: str) -> None:
+        self.inactive.discard(node_id)
+
+    def get_node_jobs(self, node_id: str) -> List[Dict[str, Any]]:
+        node = self.nodes[node_id]
+        jobs, node.lost_jobs = node.lost_jobs, []
+        return jobs
+
+
+class LoadBalancerPolicy:
+    """
+    Placement policy built on one of ``AdvancedLoadBalancer``'s strategies
+
+    The balancer only picks a node; after each pick the node's copy is
+    charged with the job so the next pick sees the updated load. The
+    balancer's round-robin position is the number of jobs it has placed,
+    which restarts with every scheduling pass, so the policy rotates the
+    node list by its running total to keep the rotation going.
+    """
+    STRATEGIES = ('round_robin', 'least_loaded', 'resource_match')
+
+    def __init__(self, strategy: str):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown load balancer strategy: {strategy}")
+        self.strategy = strategy
+        self.placements = 0
+
+    def __call__(self, jobs: List[Dict[str, Any]], nodes: List[Dict[str, Any]]):
+        if not nodes:
+            return {}, list(jobs)
+        offset = self.placements % len(nodes)
+        nodes = [dict(node) for node in nodes[offset:] + nodes[:offset]]
+        balancer = AdvancedLoadBalancer(nodes)
+        distribution: Dict[str, List[Dict[str, Any]]] = {}
+        unplaced, placed = [], []
+        for job in jobs:
+            task = Job.from_record(job)
+            if self.strategy == 'round_robin':
+                node = balancer.select_node_round_robin(placed)
+            elif self.strategy == 'least_loaded':
+                node = balancer.select_node_least_loaded(placed)
+            else:
+                node = balancer.select_node_resource_match(task)
+            if node is None:
+                unplaced.append(job)
+                continue
+            placed.append(task)
+            node['available_cpu'] -= _cores(job)
+            node['available_memory'] -= _memory(job)
+            node['current_load'] += _cores(job) / node.get('cpu_cores', 1)
+            distribution.setdefault(node['id'], []).append(job)
+        self.placements += len(placed)
+        return distribution, unplaced
+
+
+def _capacity_aware(jobs, nodes):
+    return JobSchedulingAlgorithms.capacity_aware_placement(jobs, nodes)
+
+
+# Policy name -> factory for a fresh Scheduler placement_policy
+# (None is the scheduler's built-in least-loaded heap)
+POLICIES: Dict[str, Callable[[], Optional[Callable]]] = {
+    'least_loaded': lambda: None,
+    'capacity_aware': lambda: _capacity_aware,
+    'balancer_round_robin': lambda: LoadBalancerPolicy('round_robin'),
+    'balancer_least_loaded': lambda: LoadBalancerPolicy('least_loaded'),
+    'balancer_resource_match': lambda: LoadBalancerPolicy('resource_match'),
+}
+
+
+def _cores(job: Dict[str, Any]) -> float:
+    return job.get('resources', {}).get('cpu_cores', 1)
+
+
+def _memory(job: Dict[str, Any]) -> float:
+    return job.get('resources', {}).get('memory_gb', 0)
+
+
+def build_fleet(num_nodes: int, shapes: Iterable[Tuple[int, float]] = DEFAULT_NODE_SHAPES) -> List[Tuple[str, int, float]]:
+    """
+    Node ids and sizes for a fleet cycling through the given shapes
+    """
+    shapes = list(shapes)
+    return [(f'node{i}', *shapes[i % len(shapes)]) for i in range(num_nodes)]
+
+
+def synthetic_workload(duration: float = 86400.0,
+                       arrival_rate: float = 0.2,
+                       mean_runtime: float = 600.0,
+                       diurnal_amplitude: float = 0.5,
+                       seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Poisson job arrivals with a daily cycle and log-normal runtimes
+
+    ``arrival_rate`` is the mean rate in jobs per second; the rate swings
+    by ``diurnal_amplitude`` over each day (thinning a Poisson process
+    at the peak rate).
+    """
+    rng = random.Random(seed)
+    peak = arrival_rate * (1 + diurnal_amplitude)
+    sigma = 1.0
+    mu = math.log(mean_runtime) - sigma * sigma / 2
+    jobs, now = [], 0.0
+    while True:
+        now += rng.expovariate(peak)
+        if now >= duration:
+            return jobs
+        rate = arrival_rate * (1 + diurnal_amplitude * math.sin(2 * math.pi * now / 86400.0))
+        if rng.random() * peak > rate:
+            continue
+        cores = rng.choice((1, 1, 2, 4, 8, 16))
+        jobs.append({
+            'submit_time': now,
+            'runtime': rng.lognormvariate(mu, sigma),
+            'priority': rng.choice((0, 1, 1, 2, 2, 2)),
+            'type': rng.choice(('compute', 'data_processing', 'molecular_dynamics')),
+            'resources': {'cpu_cores': cores, 'memory_gb': cores * rng.choice((1, 2, 4))}
+        })
+
+
+def load_job_trace(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a recorded workload: CSV with ``submit_time,runtime,cpu_cores,memory_gb[,priority][,type]``
+    """
+    jobs = []
+    with open(path, newline='') as trace_file:
+        for row in csv.DictReader(trace_file):
+            jobs.append({
+                'submit_time': float(row['submit_time']),
+                'runtime': float(row['runtime']),
+                'priority': int(row.get('priority') or 1),
+                'type': row.get('type') or 'compute',
+                'resources': {'cpu_cores': float(row['cpu_cores']), 'memory_gb': float(row['memory_gb'])}
+            })
+    jobs.sort(key=lambda job: job['submit_time'])
+    return jobs
+
+
+def load_recorded_workload(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Jobs that ran to completion or failure in workload traces from ``WorkloadRecorder``
+    """
+    files = []
+    for path in paths:
+        files.extend(trace_files(path) if os.path.isdir(path) else [path])
+    return [
+        {key: value for key, value in job.items() if key != 'status'}
+        for job in load_workload(files)
+        if job['status'] in ('COMPLETED', 'FAILED')
+    ]
+
+
+def failure_schedule(node_ids: Iterable[str], duration: float, mtbf: float,
+                     repair_time: float = 600.0, seed: int = 0) -> List[Tuple[float, str, float]]:
+    """
+    Exponentially distributed node failures as (time, node id, repair time)
+    """
+    rng = random.Random(seed)
+    failures = []
+    for node_id in node_ids:
+        now = rng.expovariate(1 / mtbf)
+        while now < duration:
+            failures.append((now, node_id, repair_time))
+            now += repair_time + rng.expovariate(1 / mtbf)
+    return sorted(failures)
+
+
+class ClusterSimulation:
+    """
+    Discrete-event run of the real queue, scheduler and heartbeat monitor
+
+    Job arrivals, completions, node failures and recoveries, heartbeat
+    rounds and scheduling passes are events on a heap ordered by virtual
+    time; the loop jumps from one event to the next, so idle stretches
+    cost nothing. ``DistributedJobQueue``, ``Scheduler`` (with the chosen
+    placement policy) and ``HeartbeatMonitor`` run unmodified on the
+    virtual clock: failed nodes stop heartbeating, are detected after the
+    monitor's timeout, and their jobs are redistributed by the monitor. A
+    node repaired before it is detected requeues its lost jobs itself.
+
+    The run ends once every job has finished, or once nothing but
+    heartbeat rounds is left to happen, e.g. when no node can ever take a
+    job under the chosen policy; such jobs are reported as ``stranded``.
+    """
+    def __init__(self,
+                 workload: List[Dict[str, Any]],
+                 fleet: List[Tuple[str, int, float]],
+                 policy: Optional[Callable] = None,
+                 failures: Iterable[Tuple[float, str, float]] = (),
+                 heartbeat_interval: float = 30.0,
+                 max_missed_heartbeats: int = 3):
+        self.clock = VirtualClock()
+        self.events: List = []
+        self._sequence = itertools.count()
+        self._pending_events = 0  # Events on the heap other than heartbeat rounds
+        self._schedule_pending = False
+
+        self.nodes = [SimulatedNode(self, node_id, cores, memory) for node_id, cores, memory in fleet]
+        self.registry = SimulatedNodeRegistry(self.nodes)
+        self.queue = DistributedJobQueue(max_size=len(workload) + 1)
+        self.scheduler = Scheduler(self.queue, self.registry, placement_policy=policy, clock=self.clock)
+        self.monitor = HeartbeatMonitor(
+            self.registry,
+            check_interval=heartbeat_interval,
+            max_missed_heartbeats=max_missed_heartbeats,
+            clock=self.clock,
+            requeue_job=self._requeue_orphan
+        )
+        self.heartbeat_interval = heartbeat_interval
+
+        self.jobs = workload
+        self.unfinished = len(workload)
+        self.started: Dict[str, float] = {}
+        self.wait_times = DDSketch()
+        self.busy_core_seconds = 0.0
+        self.lost_core_seconds = 0.0
+        self.node_failures = 0
+        self.last_completion = 0.0
+
+        for index, job in enumerate(workload):
+            self.schedule(job['submit_time'], ARRIVAL, index)
+        for failed_at, node_id, repair_time in failures:
+            self.schedule(failed_at, NODE_FAILURE, (node_id, repair_time))
+
+    def schedule(self, at: float, kind: int, payload: Any = None) -> None:
+        if kind != HEARTBEAT:
+            self._pending_events += 1
+        heapq.heappush(self.events, (at, kind, next(self._sequence), payload))
+
+    def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        for node in self.nodes:
+            self.monitor.record_heartbeat(node.node_id, 0.0, timestamp=0.0)
+        self.schedule(self.heartbeat_interval, HEARTBEAT)
+
+        events = 0
+        while self.events and self.unfinished:
+            if not self._pending_events and not self._awaiting_reactivation():
+                break  # Heartbeats alone cannot move any job forward
+            at, kind, _, payload = heapq.heappop(self.events)
+            if kind != HEARTBEAT:
+                self._pending_events -= 1
+            self.clock.now = at
+            events += 1
+            if kind == ARRIVAL:
+                self._arrive(payload)
+            elif kind == COMPLETION:
+                node, job_id, epoch = payload
+                node.complete(job_id, epoch)
+            elif kind == NODE_FAILURE:
+                self._fail_node(*payload)
+            elif kind == NODE_RECOVERY:
+                self._recover_node(payload)
+            elif kind == HEARTBEAT:
+                self._heartbeat_round()
+            elif kind == SCHEDULE:
+                self._schedule_pending = False
+                self.scheduler.distribute_jobs()
+
+        return self._report(events, time.perf_counter() - started)
+
+    def record_start(self, job: Dict[str, Any]) -> None:
+        if job['id'] not in self.started:
+            self.started[job['id']] = self.clock()
+            self.wait_times.add(self.clock() - job['submitted_at'])
+
+    def record_completion(self, job: Dict[str, Any], node: SimulatedNode, started_at: float) -> None:
+        now = self.clock()
+        self.busy_core_seconds += min(_cores(job), node.cpu_cores) * (now - started_at)
+        self.unfinished -= 1
+        self.last_completion = now
+        self.scheduler.handle_job_completion(job['id'], job.get('gang_rank'), now - started_at)
+        self._request_schedule()
+
+    def record_lost_work(self, job: Dict[str, Any], seconds: float) -> None:
+        self.lost_core_seconds += _cores(job) * seconds
+
+    def _arrive(self, index: int) -> None:
+        spec = self.jobs[index]
+        job = dict(spec, id=f'sim-{index}', submitted_at=self.clock())
+        self.queue.enqueue(job)
+        self._request_schedule()
+
+    def _requeue_orphan(self, job: Dict[str, Any]) -> None:
+        self.queue.enqueue(job)
+        self._request_schedule()
+
+    def _request_schedule(self) -> None:
+        if not self._schedule_pending:
+            self._schedule_pending = True
+            self.schedule(self.clock(), SCHEDULE)
+
+    def _fail_node(self, node_id: str, repair_time: float) -> None:
+        node = self.registry.get_node(node_id)
+        if not node.alive:
+            return
+        node.fail()
+        self.node_failures += 1
+        self.schedule(self.clock() + repair_time, NODE_RECOVERY, node_id)
+
+    def _recover_node(self, node_id: str) -> None:
+        self.registry.get_node(node_id).recover()
+        # Back before the monitor noticed, so nothing has rerun its jobs yet
+        for job in self.registry.get_node_jobs(node_id):
+            self._requeue_orphan(job)
+
+    def _awaiting_reactivation(self) -> bool:
+        """
+        Whether a live node is still marked inactive until its next heartbeat
+        """
+        return any(self.registry.nodes[node_id].alive for node_id in self.registry.inactive)
+
+    def _heartbeat_round(self) -> None:
+        now = self.clock()
+        for node in self.nodes:
+            if node.alive:
+                if node.node_id in self.registry.inactive:
+                    self.registry.mark_node_active(node.node_id)
+                    self._request_schedule()
+                self.monitor.record_heartbeat(node.node_id, node.describe()['current_load'], timestamp=now)
+        self.monitor.check_deadlines(now)
+        if self.monitor.orphaned_jobs:
+            self.monitor.redistribute_orphaned_jobs()
+        self.schedule(now + self.heartbeat_interval, HEARTBEAT)
+
+    def _report(self, events: int, wall_seconds: float) -> Dict[str, Any]:
+        first_submit = self.jobs[0]['submit_time'] if self.jobs else 0.0
+        makespan = self.last_completion - first_submit
+        total_cores = sum(node.cpu_cores for node in self.nodes)
+        if self.unfinished:
+            logging.getLogger('ClusterSimulation').warning(
+                f"{self.unfinished} jobs could never be placed and were left unfinished"
+            )
+        return {
+            'jobs': len(self.jobs),
+            'completed': len(self.jobs) - self.unfinished,
+            'stranded': self.unfinished,
+            'makespan': makespan,
+            'utilization': self.busy_core_seconds / (total_cores * makespan) if makespan > 0 else 0.0,
+            'lost_core_seconds': self.lost_core_seconds,
+            'wait_time': self.wait_times.summary(),
+            'node_failures': self.node_failures,
+            'events': events,
+            'wall_seconds': wall_seconds
+        }
+
+
+def compare_policies(workload: List[Dict[str, Any]],
+                     fleet: List[Tuple[str, int, float]],
+                     policies: Iterable[str] = tuple(POLICIES),
+                     failures: Iterable[Tuple[float, str, float]] = (),
+                     heartbeat_interval: float = 30.0) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the same workload, fleet and failures under each placement policy
+    """
+    failures = list(failures)
+    return {
+        name: ClusterSimulation(
+            workload, fleet, POLICIES[name](), failures, heartbeat_interval
+        ).run()
+        for name in policies
+    }
+
+
+def format_report(reports: Dict[str, Dict[str, Any]]) -> str:
+    lines = [
+        f"{'policy':<26}{'done':>8}{'makespan h':>12}{'util':>8}"
+        f"{'wait p50 s':>12}{'wait p95 s':>12}{'wait p99 s':>12}{'wall s':>9}"
+    ]
+    for name, report in reports.items():
+        wait = report['wait_time']
+        lines.append(
+            f"{name:<26}{report['completed']:>8}{report['makespan'] / 3600:>12.2f}{report['utilization']:>8.1%}"
+            f"{wait.get('p50', 0):>12.1f}{wait.get('p95', 0):>12.1f}{wait.get('p99', 0):>12.1f}"
+            f"{report['wall_seconds']:>9.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the cluster under different placement policies")
+    parser.add_argument('--trace', nargs='+',
+                        help="Workload CSV, or recorded workload trace files/directories (default: synthetic)")
+    parser.add_argument('--duration', type=float, default=86400.0, help="Synthetic workload length in seconds")
+    parser.add_argument('--arrival-rate', type=float, default=0.2, help="Synthetic jobs per second")
+    parser.add_argument('--mean-runtime', type=float, default=600.0)
+    parser.add_argument('--nodes', type=int, default=64)
+    parser.add_argument('--mtbf', type=float, default=0.0, help="Mean seconds between failures per node (0: none)")
+    parser.add_argument('--repair-time', type=float, default=600.0)
+    parser.add_argument('--heartbeat-interval', type=float, default=30.0)
+    parser.add_argument('--policies', nargs='+', choices=sorted(POLICIES), default=list(POLICIES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print full reports as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Show scheduler and monitor logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    if args.trace and args.trace[0].endswith('.csv'):
+        workload = load_job_trace(args.trace[0])
+    elif args.trace:
+        workload = load_recorded_workload(args.trace)
+    else:
+        workload = synthetic_workload(args.duration, args.arrival_rate, args.mean_runtime, seed=args.seed)
+    fleet = build_fleet(args.nodes)
+    horizon = workload[-1]['submit_time'] if workload else 0.0
+    failures = (
+        failure_schedule([node_id for node_id, _, _ in fleet], horizon, args.mtbf, args.repair_time, args.seed)
+        if args.mtbf > 0 else []
+    )
+
+    reports = compare_policies(workload, fleet, args.policies, failures, args.heartbeat_interval)
+    print(json.dumps(reports, indent=2) if args.json else format_report(reports))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# File: distributed-job-scheduler/backend/performance/tracing.py
+
+import argparse
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List, Optional
+from .histogram import DDSketch
+
+# Key under which a sampled job carries its trace
+TRACE_KEY = 'trace'
+
+# Top-level stages in lifecycle order; dotted names are sub-stages of these
+STAGES = (
+    'api_parse',
+    'queue_wait',
+    'placement',
+    'dispatch',
+    'node_queue',
+    'worker_start',
+    'execute',
+    'result_transfer',
+)
+
+
+def is_traced(job: Dict[str, Any]) -> bool:
+    return TRACE_KEY in job
+
+
+def record_span(job: Dict[str, Any], stage: str, start: float, end: float) -> None:
+    trace = job.get(TRACE_KEY)
+    if trace is not None:
+        trace['spans'].append([stage, start, end])
+
+
+def begin_span(job: Dict[str, Any], stage: str, at: Optional[float] = None) -> None:
+    """
+    Open a stage that ends in another component, such as queue wait
+    """
+    trace = job.get(TRACE_KEY)
+    if trace is not None:
+        trace['open'][stage] = time.monotonic() if at is None else at
+
+
+def end_span(job: Dict[str, Any], stage: str, at: Optional[float] = None) -> None:
+    """
+    Close a stage opened with ``begin_span``; does nothing if it is not open
+    """
+    trace = job.get(TRACE_KEY)
+    if trace is not None:
+        start = trace['open'].pop(stage, None)
+        if start is not None:
+            trace['spans'].append([stage, start, time.monotonic() if at is None else at])
+
+
+@contextmanager
+def span(job: Dict[str, Any], stage: str):
+    """
+    Time a block as one stage of the job's trace
+    """
+    if TRACE_KEY not in job:
+        yield
+        return
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        record_span(job, stage, start, time.monotonic())
+
+
+def merge_trace(job: Dict[str, Any], remote: Dict[str, Any]) -> None:
+    """
+    Adopt the trace of a copy of the job (e.g. in a worker) that moved on
+
+    The copy started from this trace, so its spans are a superset of
+    ours and its open stages are the current ones.
+    """
+    trace = job.get(TRACE_KEY)
+    if trace is None:
+        return
+    known = {tuple(entry) for entry in trace['spans']}
+    trace['spans'].extend(entry for entry in remote['spans'] if tuple(entry) not in known)
+    trace['open'] = dict(remote['open'])
+
+
+class Tracer:
+    """
+    Samples jobs for lifecycle tracing and exports finished traces
+
+    A sampled job carries its trace in the job dict, so spans follow it
+    through the queue, scheduler, node agent and worker without any
+    shared state; unsampled jobs cost one dict lookup per stage.
+    Timestamps are ``time.monotonic`` readings, which are comparable
+    across processes on one host. Finished traces are appended to
+    ``path`` as JSON lines.
+    """
+    def __init__(self, sample_rate: float = 0.0, path: Optional[str] = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Trace sample rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = None
+
+    def start_trace(self, job: Dict[str, Any], started_at: Optional[float] = None) -> bool:
+        """
+        Decide whether to trace a job; returns True when it is sampled
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return False
+        job[TRACE_KEY] = {
+            'started_at': time.monotonic() if started_at is None else started_at,
+            'spans': [],
+            'open': {}
+        }
+        return True
+
+    def finish_trace(self, job: Dict[str, Any], status: str = 'COMPLETED') -> Optional[Dict[str, Any]]:
+        """
+        Close a job's trace and export it; returns the exported record
+        """
+        trace = job.pop(TRACE_KEY, None)
+        if trace is None:
+            return None
+        finished_at = time.monotonic()
+        record = {
+            'job_id': job.get('id'),
+            'type': job.get('type'),
+            'status': status,
+            'duration': finished_at - trace['started_at'],
+            'spans': [
+                {'stage': stage, 'start': start - trace['started_at'], 'duration': end - start}
+                for stage, start, end in sorted(trace['spans'], key=lambda entry: entry[1])
+            ]
+        }
+        if self.path is not None:
+            line = json.dumps(record) + '\n'
+            with self.lock:
+                if self._file is None:
+                    self._file = open(self.path, 'a', buffering=1)
+                self._file.write(line)
+        return record
+
+    def close(self) -> None:
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def load_traces(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    traces = []
+    for path in paths:
+        with open(path) as trace_file:
+            traces.extend(json.loads(line) for line in trace_file if line.strip())
+    return traces
+
+
+def summarize_traces(traces: Iterable[Dict[str, Any]], job_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Per-stage latency distribution and each stage's share of end-to-end time
+
+    A stage that occurs several times in one trace (a requeued job waits
+    in the queue twice) counts once with its summed duration. Shares are
+    computed over top-level stages only, so sub-stages like
+    ``execute.simulate`` do not count twice.
+    """
+    end_to_end = DDSketch()
+    stages: Dict[str, DDSketch] = {}
+    for trace in traces:
+        if job_type is not None and trace.get('type') != job_type:
+            continue
+        end_to_end.add(trace['duration'])
+        per_stage: Dict[str, float] = {}
+        for entry in trace['spans']:
+            per_stage[entry['stage']] = per_stage.get(entry['stage'], 0.0) + entry['duration']
+        for stage, duration in per_stage.items():
+            stages.setdefault(stage, DDSketch()).add(duration)
+
+    order = {stage: index for index, stage in enumerate(STAGES)}
+    summary = {'traces': end_to_end.count, 'end_to_end': end_to_end.summary(), 'stages': {}}
+    for stage in sorted(stages, key=lambda name: (order.get(name.split('.')[0], len(order)), name)):
+        sketch = stages[stage]
+        stats = sketch.summary()
+        stats['total'] = sketch.sum
+        if '.' not in stage and end_to_end.sum > 0:
+            stats['share'] = sketch.sum / end_to_end.sum
+        summary['stages'][stage] = stats
+    return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"{summary['traces']} traces"]
+    if not summary['traces']:
+        return lines[0]
+    header = f"{'stage':<24}{'count':>8}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'share':>8}"
+    lines.append(header)
+    rows = list(summary['stages'].items()) + [('end_to_end', summary['end_to_end'])]
+    for stage, stats in rows:
+        share = f"{stats['share']:.1%}" if 'share' in stats else ''
+        lines.append(
+            f"{stage:<24}{stats['count']:>8}{stats['mean'] * 1000:>12.2f}{stats['p50'] * 1000:>12.2f}"
+            f"{stats['p95'] * 1000:>12.2f}{stats['p99'] * 1000:>12.2f}{share:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize where job lifecycle time goes")
+    parser.add_argument('traces', nargs='+', help="JSON-lines trace files written by the scheduler")
+    parser.add_argument('--job-type', default=None, help="Only summarize jobs of this type")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = summarize_traces(load_traces(args.traces), args.job_type)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
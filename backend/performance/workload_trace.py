@@ -0,0 +1,367 @@
+# File: distributed-job-scheduler/backend/performance/workload_trace.py
+
+import argparse
+import glob
+import json
+import logging
+import os
+import random
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# File header: magic and the recorder session, so job sequence numbers
+# from different scheduler runs never join up
+MAGIC = b'WTR1'
+HEADER = struct.Struct('<4sQ')
+
+# Record kinds, each a fixed-size struct
+TYPE_NAME, SUBMIT, FINISH = range(3)
+KIND = struct.Struct('<B')
+TYPE_NAME_RECORD = struct.Struct('<BB')         # code, name length; name bytes follow
+SUBMIT_RECORD = struct.Struct('<IdBhffB')       # seq, time, type code, priority, cores, memory GB, GPU
+FINISH_RECORD = struct.Struct('<IdBf')          # seq, time, status, runtime seconds
+
+STATUSES = ('COMPLETED', 'FAILED', 'CANCELLED', 'UPSTREAM_FAILED')
+MAX_TYPE_CODES = 255
+UNKNOWN_TYPE = 255
+
+FILE_PATTERN = 'workload-*.wtr'
+
+
+class WorkloadRecorder:
+    """
+    Appends job arrivals and outcomes to rotating binary trace files
+
+    The API records each submitted job (one the queue then refuses ends
+    as CANCELLED) and the scheduler records how it ended and how long it
+    ran. A submission costs one struct pack and a buffered write of 25
+    bytes; jobs are identified by a per-recorder sequence number and job
+    types by a one-byte code defined once per file, so every file can be
+    read on its own. When the current file reaches ``max_bytes`` a new
+    one is started and only the newest ``max_files`` are kept. Job
+    arrays are not recorded. Only the ``max_live`` most recent unfinished
+    jobs are tracked; older ones that never report an outcome stay
+    unfinished in the trace.
+    """
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024, max_files: int = 10,
+                 max_live: int = 100000, clock: Callable[[], float] = time.time):
+        if max_bytes <= HEADER.size or max_files < 1:
+            raise ValueError("Workload trace files need room for records and at least one file")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.max_live = max_live
+        self.clock = clock
+        self.session = random.getrandbits(64)
+        self.lock = threading.Lock()
+        self._file = None
+        self._file_index = 0
+        self._sequence = 0
+        self._live: "OrderedDict[str, int]" = OrderedDict()  # job id -> sequence number, until the job finishes
+        self._type_codes: Dict[str, int] = {}
+        self._written_types = set()  # Codes already defined in the current file
+        os.makedirs(directory, exist_ok=True)
+
+    def record_submit(self, job: Dict[str, Any]) -> None:
+        resources = job.get('resources') or {}
+        now = self.clock()
+        with self.lock:
+            seq = self._sequence
+            self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+            self._live[job['id']] = seq
+            if len(self._live) > self.max_live:
+                self._live.popitem(last=False)
+            code = self._type_code(job.get('type'))
+            self._write(SUBMIT, SUBMIT_RECORD.pack(
+                seq, now, code,
+                max(-32768, min(32767, int(job.get('priority', 5)))),
+                float(resources.get('cpu_cores', 0)),
+                float(resources.get('memory_gb', 0)),
+                bool(resources.get('gpu_required'))
+            ))
+
+    def record_finish(self, job_id: str, status: str = 'COMPLETED', runtime: float = 0.0) -> None:
+        """
+        Record how a job ended; jobs submitted before recording began are ignored
+        """
+        now = self.clock()
+        with self.lock:
+            seq = self._live.pop(job_id, None)
+            if seq is not None:
+                self._write(FINISH, FINISH_RECORD.pack(seq, now, STATUSES.index(status), runtime))
+
+    def close(self) -> None:
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _type_code(self, job_type: Optional[str]) -> int:
+        """
+        One-byte code for a job type, defining it in the current file if needed (caller holds the lock)
+        """
+        name = job_type or 'unknown'
+        code = self._type_codes.get(name)
+        if code is None:
+            if len(self._type_codes) >= MAX_TYPE_CODES:
+                return UNKNOWN_TYPE
+            code = self._type_codes[name] = len(self._type_codes)
+        if self._file is None or code not in self._written_types:
+            encoded = name.encode()[:255]
+            self._write(TYPE_NAME, TYPE_NAME_RECORD.pack(code, len(encoded)) + encoded)
+            self._written_types.add(code)
+        return code
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        if self._file is None:
+            self._open_next()
+        self._file.write(KIND.pack(kind) + payload)
+        if kind != TYPE_NAME and self._file.tell() >= self.max_bytes:
+            self._file.close()
+            self._file = None
+
+    def _open_next(self) -> None:
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime())
+        path = os.path.join(self.directory, f'workload-{stamp}-{self._file_index:06d}.wtr')
+        self._file_index += 1
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, self.session))
+        self._written_types = set()
+        for old in trace_files(self.directory)[:-self.max_files]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def trace_files(directory: str) -> List[str]:
+    """
+    Trace files in a directory, oldest first
+    """
+    return sorted(glob.glob(os.path.join(directory, FILE_PATTERN)))
+
+
+def read_records(paths: Iterable[str]) -> Iterator[Tuple]:
+    """
+    Yield ``('submit', session, seq, time, type, priority, cores, memory, gpu)``
+    and ``('finish', session, seq, time, status, runtime)`` records
+
+    A record cut short by a crash ends its file quietly.
+    """
+    for path in paths:
+        with open(path, 'rb') as trace_file:
+            data = trace_file.read()
+        magic, session = HEADER.unpack_from(data, 0) if len(data) >= HEADER.size else (b'', 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a workload trace")
+        types = {UNKNOWN_TYPE: 'unknown'}
+        offset = HEADER.size
+        try:
+            while offset < len(data):
+                kind = data[offset]
+                offset += KIND.size
+                if kind == TYPE_NAME:
+                    code, length = TYPE_NAME_RECORD.unpack_from(data, offset)
+                    offset += TYPE_NAME_RECORD.size
+                    if offset + length > len(data):
+                        break
+                    types[code] = data[offset:offset + length].decode()
+                    offset += length
+                elif kind == SUBMIT:
+                    seq, at, code, priority, cores, memory, gpu = SUBMIT_RECORD.unpack_from(data, offset)
+                    offset += SUBMIT_RECORD.size
+                    yield ('submit', session, seq, at, types.get(code, 'unknown'), priority, cores, memory, bool(gpu))
+                elif kind == FINISH:
+                    seq, at, status, runtime = FINISH_RECORD.unpack_from(data, offset)
+                    offset += FINISH_RECORD.size
+                    yield ('finish', session, seq, at, STATUSES[status], runtime)
+                else:
+                    raise ValueError(f"Corrupt record in {path} at byte {offset - KIND.size}")
+        except struct.error:
+            pass
+
+
+def load_workload(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Jobs from recorded traces, in the simulator's workload format
+
+    ``submit_time`` is relative to the first arrival. ``runtime`` and
+    ``status`` are None for jobs still running when recording stopped.
+    """
+    jobs: List[Dict[str, Any]] = []
+    pending: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for record in read_records(paths):
+        if record[0] == 'submit':
+            _, session, seq, at, job_type, priority, cores, memory, gpu = record
+            job = {
+                'submit_time': at,
+                'runtime': None,
+                'status': None,
+                'priority': priority,
+                'type': job_type,
+                'resources': {'cpu_cores': cores, 'memory_gb': memory, 'gpu_required': gpu}
+            }
+            pending[(session, seq)] = job
+            jobs.append(job)
+        else:
+            _, session, seq, at, status, runtime = record
+            job = pending.pop((session, seq), None)
+            if job is not None:
+                job['status'] = status
+                job['runtime'] = runtime
+
+    jobs.sort(key=lambda job: job['submit_time'])
+    start = jobs[0]['submit_time'] if jobs else 0.0
+    for job in jobs:
+        job['submit_time'] -= start
+    return jobs
+
+
+def http_submitter(url: str, timeout: float = 10.0) -> Callable[[Dict[str, Any]], int]:
+    """
+    Submit replayed jobs to a running scheduler's ``POST /jobs``
+    """
+    endpoint = url.rstrip('/') + '/jobs'
+
+    def submit(payload: Dict[str, Any]) -> int:
+        request = urllib.request.Request(
+            endpoint, data=json.dumps(payload).encode(), headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    return submit
+
+
+class WorkloadReplayer:
+    """
+    Re-submits a recorded workload with its original arrival pattern
+
+    Arrivals are compressed by ``speed``; so are runtimes, which become
+    the ``duration`` of the replayed job, unless ``scale_runtimes`` is
+    off (a pure load test of the API and queue at ``speed`` times the
+    recorded rate). Submissions go out from a small thread pool so a
+    slow response does not delay the following arrivals; the report's
+    ``max_lag`` shows how far behind schedule the replay fell.
+    """
+    def __init__(self, submit: Callable[[Dict[str, Any]], int], speed: float = 1.0,
+                 scale_runtimes: bool = True, concurrency: int = 8):
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        self.submit = submit
+        self.speed = speed
+        self.scale_runtimes = scale_runtimes
+        self.concurrency = concurrency
+        self.logger = logging.getLogger('WorkloadReplayer')
+
+    def payload(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {
+            'command': 'replay',
+            'type': job['type'],
+            'priority': job['priority'],
+            'resources': {key: value for key, value in job['resources'].items() if value}
+        }
+        if job.get('runtime') is not None:
+            payload['duration'] = job['runtime'] / self.speed if self.scale_runtimes else job['runtime']
+        return payload
+
+    def replay(self, workload: List[Dict[str, Any]]) -> Dict[str, Any]:
+        accepted = rejected = 0
+        max_lag = 0.0
+        lock = threading.Lock()
+
+        def send(payload):
+            nonlocal accepted, rejected
+            try:
+                ok = 200 <= self.submit(payload) < 300
+            except OSError as e:
+                self.logger.warning(f"Replay submission failed: {e}")
+                ok = False
+            with lock:
+                if ok:
+                    accepted += 1
+                else:
+                    rejected += 1
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for job in workload:
+                due = started + job['submit_time'] / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+                executor.submit(send, self.payload(job))
+
+        return {
+            'jobs': len(workload),
+            'accepted': accepted,
+            'rejected': rejected,
+            'elapsed': time.monotonic() - started,
+            'max_lag': max_lag
+        }
+
+
+def summarize_workload(workload: List[Dict[str, Any]]) -> Dict[str, Any]:
+    span = workload[-1]['submit_time'] if workload else 0.0
+    by_type: Dict[str, int] = {}
+    by_status: Dict[str, int] = {}
+    for job in workload:
+        by_type[job['type']] = by_type.get(job['type'], 0) + 1
+        status = job['status'] or 'UNFINISHED'
+        by_status[status] = by_status.get(status, 0) + 1
+    runtimes = [job['runtime'] for job in workload if job['runtime'] is not None]
+    return {
+        'jobs': len(workload),
+        'span_seconds': span,
+        'arrival_rate': len(workload) / span if span > 0 else 0.0,
+        'mean_runtime': sum(runtimes) / len(runtimes) if runtimes else 0.0,
+        'by_type': by_type,
+        'by_status': by_status
+    }
+
+
+def _expand(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        files.extend(trace_files(path) if os.path.isdir(path) else [path])
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay recorded scheduler workloads")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    show = subcommands.add_parser('show', help="Summarize recorded traces")
+    show.add_argument('traces', nargs='+', help="Trace files or directories")
+    replay = subcommands.add_parser('replay', help="Re-submit recorded jobs to a scheduler")
+    replay.add_argument('traces', nargs='+', help="Trace files or directories")
+    replay.add_argument('--url', default='http://localhost:8000', help="Scheduler API base URL")
+    replay.add_argument('--speed', type=float, default=1.0, help="Arrival speed-up, e.g. 10 for 10x")
+    replay.add_argument('--keep-runtimes', action='store_true',
+                        help="Do not scale job durations down by the speed-up")
+    replay.add_argument('--limit', type=int, default=None, help="Replay only the first N jobs")
+    replay.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    workload = load_workload(_expand(args.traces))
+    if args.command == 'show':
+        print(json.dumps(summarize_workload(workload), indent=2))
+        return
+    replayer = WorkloadReplayer(
+        http_submitter(args.url), args.speed, not args.keep_runtimes, args.concurrency
+    )
+    print(json.dumps(replayer.replay(workload[:args.limit]), indent=2))
+
+
+if __name__ == '__main__':
+    main()
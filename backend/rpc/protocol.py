@@ -0,0 +1,220 @@
+# File: distributed-job-scheduler/backend/rpc/protocol.py
+
+import json
+import struct
+from typing import Dict, Any, Tuple, Optional
+from backend.job_submission.job_record import JobRecord, to_json
+
+# Protobuf wire types
+VARINT, FIXED64, LENGTH_DELIMITED, FIXED32 = 0, 1, 2, 5
+
+SCALAR_KINDS = {
+    'uint32': (VARINT, 0),
+    'uint64': (VARINT, 0),
+    'bool': (VARINT, False),
+    'double': (FIXED64, 0.0),
+    'string': (LENGTH_DELIMITED, ''),
+    'bytes': (LENGTH_DELIMITED, b''),
+}
+
+# Field number -> (name, kind, repeated), mirroring proto/job_scheduler.proto
+MESSAGES: Dict[str, Dict[int, Tuple[str, str, bool]]] = {
+    'Job': {
+        1: ('id', 'string', False),
+        2: ('type', 'string', False),
+        3: ('spec', 'bytes', False),
+    },
+    'DispatchJobs': {
+        1: ('jobs', 'Job', True),
+    },
+    'DispatchAck': {
+        1: ('accepted', 'uint32', False),
+        2: ('job_ids', 'string', True),
+    },
+    'JobRequest': {
+        1: ('job_id', 'string', False),
+    },
+    'Checkpoint': {
+        1: ('path', 'string', False),
+        2: ('saved_at', 'double', False),
+    },
+    'JobReply': {
+        1: ('found', 'bool', False),
+        2: ('checkpoint', 'Checkpoint', False),
+    },
+    'Error': {
+        1: ('message', 'string', False),
+    },
+    'Envelope': {
+        1: ('request_id', 'uint64', False),
+        2: ('dispatch', 'DispatchJobs', False),
+        3: ('dispatch_ack', 'DispatchAck', False),
+        4: ('cancel', 'JobRequest', False),
+        5: ('preempt', 'JobRequest', False),
+        6: ('checkpoint_status', 'JobRequest', False),
+        7: ('job_reply', 'JobReply', False),
+        8: ('error', 'Error', False),
+    },
+}
+
+# Members of the Envelope ``body`` oneof
+ENVELOPE_BODIES = tuple(name for number, (name, _, _) in MESSAGES['Envelope'].items() if number > 1)
+
+_FIELDS_BY_NAME = {
+    message: {name: (number, kind, repeated) for number, (name, kind, repeated) in fields.items()}
+    for message, fields in MESSAGES.items()
+}
+
+_DOUBLE = struct.Struct('<d')
+
+
+class DecodeError(Exception):
+    """
+    Raised for bytes that are not a valid encoding of the expected message
+    """
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        if pos >= len(data):
+            raise DecodeError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise DecodeError("Varint too long")
+
+
+def _encode_into(out: bytearray, message: str, values: Dict[str, Any]) -> None:
+    fields = _FIELDS_BY_NAME[message]
+    for name, value in values.items():
+        if value is None or name not in fields:
+            continue
+        number, kind, repeated = fields[name]
+        for item in (value if repeated else (value,)):
+            _encode_field(out, number, kind, item, repeated)
+
+
+def _encode_field(out: bytearray, number: int, kind: str, value: Any, repeated: bool) -> None:
+    if kind in MESSAGES:
+        body = bytearray()
+        _encode_into(body, kind, value)
+        _write_varint(out, number << 3 | LENGTH_DELIMITED)
+        _write_varint(out, len(body))
+        out += body
+        return
+
+    wire_type, default = SCALAR_KINDS[kind]
+    if not repeated and value == default:
+        return  # proto3 leaves default scalars off the wire
+    _write_varint(out, number << 3 | wire_type)
+    if wire_type == VARINT:
+        _write_varint(out, int(value))
+    elif wire_type == FIXED64:
+        out += _DOUBLE.pack(value)
+    else:
+        raw = value.encode('utf-8') if kind == 'string' else bytes(value)
+        _write_varint(out, len(raw))
+        out += raw
+
+
+def encode(message: str, values: Dict[str, Any]) -> bytes:
+    """
+    Serialize a message given as a dict of field values
+    """
+    out = bytearray()
+    _encode_into(out, message, values)
+    return bytes(out)
+
+
+def decode(message: str, data: bytes) -> Dict[str, Any]:
+    """
+    Parse a message into a dict
+
+    Scalars and repeated fields always appear (with proto3 defaults);
+    sub-messages only when present. Unknown fields are skipped so older
+    peers can talk to newer ones.
+    """
+    fields = MESSAGES[message]
+    values: Dict[str, Any] = {}
+    for name, kind, repeated in fields.values():
+        if repeated:
+            values[name] = []
+        elif kind not in MESSAGES:
+            values[name] = SCALAR_KINDS[kind][1]
+
+    pos, end = 0, len(data)
+    while pos < end:
+        key, pos = _read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+
+        if wire_type == VARINT:
+            raw, pos = _read_varint(data, pos)
+        elif wire_type == FIXED64:
+            raw, pos = data[pos:pos + 8], pos + 8
+        elif wire_type == LENGTH_DELIMITED:
+            length, pos = _read_varint(data, pos)
+            raw, pos = data[pos:pos + length], pos + length
+        elif wire_type == FIXED32:
+            raw, pos = data[pos:pos + 4], pos + 4
+        else:
+            raise DecodeError(f"Unsupported wire type {wire_type}")
+        if pos > end:
+            raise DecodeError(f"Truncated field {number} in {message}")
+
+        field = fields.get(number)
+        if field is None:
+            continue
+        name, kind, repeated = field
+
+        if kind in MESSAGES:
+            value = decode(kind, raw)
+        elif kind == 'string':
+            value = bytes(raw).decode('utf-8')
+        elif kind == 'bytes':
+            value = bytes(raw)
+        elif kind == 'double':
+            value = _DOUBLE.unpack(raw)[0]
+        elif kind == 'bool':
+            value = bool(raw)
+        else:
+            value = raw
+
+        if repeated:
+            values[name].append(value)
+        else:
+            values[name] = value
+    return values
+
+
+def job_to_message(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': job['id'],
+        'type': job.get('type') or '',
+        'spec': json.dumps(to_json(job), default=str).encode('utf-8')
+    }
+
+
+def job_from_message(message: Dict[str, Any]) -> JobRecord:
+    return JobRecord.from_dict(json.loads(message['spec']))
+
+
+def envelope_body(envelope: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    The set member of an Envelope's ``body`` oneof
+    """
+    for name in ENVELOPE_BODIES:
+        if name in envelope:
+            return name, envelope[name]
+    return None, None
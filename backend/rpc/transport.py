@@ -0,0 +1,279 @@
+# File: distributed-job-scheduler/backend/rpc/transport.py
+
+import itertools
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
+from .protocol import (
+    encode, decode, envelope_body, job_to_message, job_from_message, DecodeError
+)
+
+# 4-byte big-endian length prefix before every Envelope
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+class RPCError(Exception):
+    """
+    Raised when a call fails in transport or the agent reports an error
+    """
+
+
+def parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """
+    ``unix:/path/to.sock`` or ``host:port`` to a socket family and address
+    """
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytearray]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            return None
+        received += count
+    return buffer
+
+
+def recv_frame(sock: socket.socket) -> Optional[bytes]:
+    """
+    Read one frame; None when the peer closed the connection between frames
+    """
+    header = _recv_exactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise RPCError(f"Frame of {size} bytes exceeds limit")
+    payload = _recv_exactly(sock, size)
+    if payload is None:
+        raise RPCError("Connection closed mid-frame")
+    return bytes(payload)
+
+
+class _AgentRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Serve framed requests on one persistent connection until the client leaves
+    """
+    def handle(self):
+        if self.request.family != socket.AF_UNIX:
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server = self.server.rpc_server
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except (OSError, RPCError):
+                return
+            if frame is None:
+                return
+
+            try:
+                envelope = decode('Envelope', frame)
+            except DecodeError as e:
+                server.logger.error(f"Dropping connection after malformed frame: {e}")
+                return
+
+            reply = server.handle_request(envelope)
+            reply['request_id'] = envelope['request_id']
+            try:
+                send_frame(self.request, encode('Envelope', reply))
+            except OSError:
+                return
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class AgentRPCServer:
+    """
+    Exposes a NodeAgent's dispatch, cancel and preemption calls over a socket
+
+    Each client connection gets its own thread and may carry any number of
+    requests, so the scheduler pays connection setup once per pooled
+    connection rather than once per call.
+    """
+    def __init__(self, agent, address: str):
+        self.agent = agent
+        self.family, bind_address = parse_address(address)
+        if self.family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+
+        server_class = _ThreadingUnixServer if self.family == socket.AF_UNIX else _ThreadingTCPServer
+        self.server = server_class(bind_address, _AgentRequestHandler)
+        self.server.rpc_server = self
+        self.thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger('AgentRPCServer')
+
+    @property
+    def address(self) -> str:
+        """
+        Address clients should connect to, with the real port when bound to port 0
+        """
+        if self.family == socket.AF_UNIX:
+            return f"unix:{self.server.server_address}"
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name='AgentRPCServer', daemon=True
+        )
+        self.thread.start()
+        self.logger.info(f"Serving node agent RPC on {self.address}")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.family == socket.AF_UNIX and os.path.exists(self.server.server_address):
+            os.unlink(self.server.server_address)
+
+    def handle_request(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one request against the agent and build the reply body
+        """
+        method, body = envelope_body(envelope)
+        try:
+            if method == 'dispatch':
+                jobs = [job_from_message(message) for message in body['jobs']]
+                self.agent.receive_jobs(jobs)
+                return {'dispatch_ack': {
+                    'accepted': len(jobs),
+                    'job_ids': [job['id'] for job in jobs]
+                }}
+            if method == 'cancel':
+                return {'job_reply': {'found': bool(self.agent.cancel_job(body['job_id']))}}
+            if method == 'preempt':
+                progress = self.agent.preempt_job(body['job_id'])
+                return {'job_reply': {
+                    'found': progress is not None,
+                    'checkpoint': (progress or {}).get('checkpoint')
+                }}
+            if method == 'checkpoint_status':
+                status = self.agent.checkpoint_status(body['job_id'])
+                return {'job_reply': {'found': status is not None, 'checkpoint': status}}
+            return {'error': {'message': f"Unsupported request: {method}"}}
+        except Exception as e:
+            self.logger.error(f"RPC {method} failed: {e}")
+            return {'error': {'message': str(e)}}
+
+
+class AgentRPCClient:
+    """
+    Scheduler-side handle on a remote node agent
+
+    Offers the same calls the scheduler makes on an in-process
+    ``NodeAgent`` (``receive_jobs``, ``cancel_job``, ``preempt_job``,
+    ``checkpoint_status``), so a node registry can hand it out in its
+    place. Up to ``pool_size`` connections are kept open and reused; a
+    connection that fails mid-call is discarded rather than returned.
+    """
+    def __init__(self, address: str, pool_size: int = 4, timeout: float = 10.0):
+        self.address = address
+        self.family, self.connect_address = parse_address(address)
+        self.timeout = timeout
+        self.idle: queue.LifoQueue = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(pool_size)
+        self.request_ids = itertools.count(1)
+        self.closed = False
+
+    def receive_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Dispatch a batch of jobs in one message; returns the agent's acknowledgement
+        """
+        ack = self._call('dispatch', {'jobs': [job_to_message(job) for job in jobs]}, 'dispatch_ack')
+        if ack['accepted'] != len(jobs):
+            raise RPCError(f"Agent accepted {ack['accepted']} of {len(jobs)} jobs")
+        return ack
+
+    def cancel_job(self, job_id: str) -> bool:
+        return self._call('cancel', {'job_id': job_id}, 'job_reply')['found']
+
+    def preempt_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        reply = self._call('preempt', {'job_id': job_id}, 'job_reply')
+        if not reply['found']:
+            return None
+        return {'job_id': job_id, 'checkpoint': reply.get('checkpoint')}
+
+    def checkpoint_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        reply = self._call('checkpoint_status', {'job_id': job_id}, 'job_reply')
+        return reply.get('checkpoint') if reply['found'] else None
+
+    def close(self):
+        """
+        Close pooled connections
+        """
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _call(self, method: str, body: Dict[str, Any], reply_type: str) -> Dict[str, Any]:
+        request_id = next(self.request_ids)
+        payload = encode('Envelope', {'request_id': request_id, method: body})
+
+        with self.slots:
+            sock = self._acquire()
+            try:
+                send_frame(sock, payload)
+                frame = recv_frame(sock)
+                if frame is None:
+                    raise RPCError(f"Agent at {self.address} closed the connection")
+                reply = decode('Envelope', frame)
+            except (OSError, DecodeError, RPCError) as e:
+                sock.close()
+                raise RPCError(f"{method} to {self.address} failed: {e}") from e
+            self._release(sock)
+
+        if reply['request_id'] != request_id:
+            raise RPCError(f"Reply {reply['request_id']} does not match request {request_id}")
+        reply_method, reply_body = envelope_body(reply)
+        if reply_method == 'error':
+            raise RPCError(reply_body['message'])
+        if reply_method != reply_type:
+            raise RPCError(f"Expected {reply_type} reply, got {reply_method}")
+        return reply_body
+
+    def _acquire(self) -> socket.socket:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.connect_address)
+        except OSError as e:
+            sock.close()
+            raise RPCError(f"Cannot connect to agent at {self.address}: {e}") from e
+        if self.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _release(self, sock: socket.socket):
+        if self.closed:
+            sock.close()
+        else:
+            self.idle.put(sock)
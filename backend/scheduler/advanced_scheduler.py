@@ -1,23 +1,11 @@
 import asyncio
-import enum
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Mapping, Optional, Callable
 import logging
 import time
 import uuid
 import random
-
-class JobStatus(enum.Enum):
-    """
-    Comprehensive job status management
-    """
-    PENDING = "PENDING"
-    QUEUED = "QUEUED"
-    RUNNING = "RUNNING"
-    COMPLETED = "COMPLETED"
-    FAILED = "FAILED"
-    RETRY = "RETRY"
-    CANCELLED = "CANCELLED"
+from backend.job_submission.job_record import JobStatus
 
 @dataclass
 class ResourceRequirements:
@@ -33,7 +21,12 @@ class ResourceRequirements:
 @dataclass
 class Job:
     """
-    Comprehensive job representation
+    A job as run by the asyncio ``DistributedJobScheduler``
+
+    Queued jobs are ``JobRecord`` mappings, which share this class's
+    ``JobStatus``; a ``Job`` adds the per-run state (start and end times,
+    result, error, retry count) that this scheduler keeps on the job
+    itself. ``from_record`` builds one from a queued job.
     """
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: str = "Unnamed Job"
@@ -48,13 +41,37 @@ class Job:
     payload: Dict[str, Any] = field(default_factory=dict)
     result: Optional[Any] = None
     error: Optional[str] = None
+    artifacts: List[Dict[str, Any]] = field(default_factory=list)  # Content-hashed inputs
+
+    @classmethod
+    def from_record(cls, job: Mapping[str, Any]) -> 'Job':
+        """
+        Job for a queued job mapping, such as a ``JobRecord``
+
+        Resources the job does not ask for count as zero.
+        """
+        resources = job.get('resources') or {}
+        status = job.get('status')
+        return cls(
+            id=job['id'],
+            status=JobStatus[status] if status in JobStatus.__members__ else JobStatus.PENDING,
+            priority=job.get('priority', 5),
+            created_at=job.get('submitted_at') or time.time(),
+            resource_requirements=ResourceRequirements(
+                cpu_cores=resources.get('cpu_cores', 0),
+                memory_gb=resources.get('memory_gb', 0),
+                gpu_required=bool(resources.get('gpu_required'))
+            ),
+            artifacts=job.get('artifacts') or []
+        )
 
 class AdvancedLoadBalancer:
     """
     Intelligent load balancing with multiple strategies
     """
-    def __init__(self, nodes: List[Dict[str, Any]]):
+    def __init__(self, nodes: List[Dict[str, Any]], artifact_registry=None):
         self.nodes = nodes
+        self.artifact_registry = artifact_registry
     
     def select_node_round_robin(self, jobs: List[Job]) -> Dict[str, Any]:
         """
@@ -85,6 +102,35 @@ class AdvancedLoadBalancer:
             matching_nodes, 
             key=lambda node: node.get('current_load', 0)
         ) if matching_nodes else None
+    
+    def select_node_locality(self, job: Job, locality_weight: float = 1.0) -> Optional[Dict[str, Any]]:
+        """
+        Select the matching node with the best mix of low load and local input data
+        
+        A node's score is its load plus ``locality_weight`` times the share
+        of the job's artifact bytes it would have to fetch, so with the
+        default weight holding every input is worth a whole unit of load.
+        Without artifacts or a registry this is ``select_node_resource_match``.
+        """
+        requirements = job.resource_requirements
+        matching_nodes = [
+            node for node in self.nodes
+            if (node.get('available_cpu', 0) >= requirements.cpu_cores and
+                node.get('available_memory', 0) >= requirements.memory_gb and
+                (not requirements.gpu_required or node.get('gpu_available', False)))
+        ]
+        if not matching_nodes:
+            return None
+        
+        total_bytes = sum(artifact.get('size', 0) for artifact in job.artifacts)
+        if self.artifact_registry is None or total_bytes <= 0:
+            return min(matching_nodes, key=lambda node: node.get('current_load', 0))
+        
+        def score(node):
+            missing = total_bytes - self.artifact_registry.local_bytes(job.artifacts, node['id'])
+            return node.get('current_load', 0) + locality_weight * missing / total_bytes
+        
+        return min(matching_nodes, key=score)
 
 class DistributedJobScheduler:
     """
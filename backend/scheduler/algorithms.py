@@ -1,8 +1,11 @@
 # File: distributed-job-scheduler/backend/scheduler/algorithms.py
 
 import heapq
+import math
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from backend.job_submission.fair_share_queue import job_owner
+from .gang import node_matches_job
 
 class JobSchedulingAlgorithms:
     """
@@ -19,17 +22,158 @@ class JobSchedulingAlgorithms:
             distributed_jobs[node_index].append(job)
         return distributed_jobs
     
+    @staticmethod
+    def least_loaded_node_scheduling(
+        jobs: List[Dict[str, Any]],
+        node_loads: Dict[str, float],
+        job_load: float = 1.0
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Assign each job, in the order given, to the node with the lowest projected load
+
+        Callers order the batch themselves, e.g. by ``shortest_job_first``
+        or as the queue handed it out.
+        """
+        load_heap = [(load, node_id) for node_id, load in node_loads.items()]
+        heapq.heapify(load_heap)
+        
+        distribution: Dict[str, List[Dict[str, Any]]] = {}
+        if not load_heap:
+            return distribution
+        
+        for job in jobs:
+            load, node_id = heapq.heappop(load_heap)
+            distribution.setdefault(node_id, []).append(job)
+            heapq.heappush(load_heap, (load + job_load, node_id))
+        return distribution
+    
+    @staticmethod
+    def capacity_aware_placement(
+        jobs: List[Dict[str, Any]],
+        nodes: List[Dict[str, Any]],
+        node_loads: Optional[Dict[str, float]] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Place a batch of jobs on the least loaded nodes that still have room
+
+        Jobs are taken in ``shortest_job_first`` order. Every placement deducts the job's cores and memory from the node's
+        remaining capacity and raises its load by the share of cores taken,
+        so the batch spreads out instead of piling onto the node that looked
+        emptiest. Returns the distribution and the jobs that fit nowhere.
+
+        Capacity only shrinks during a batch, so once a demand fits nowhere
+        any job asking for at least as much is rejected without a scan;
+        a deep backlog on a full cluster costs one pass, not one per node.
+        """
+        node_loads = node_loads or {}
+        remaining = {node['id']: dict(node) for node in nodes}
+        load_heap = [
+            (node_loads.get(node['id'], node.get('current_load', 0)), node['id'])
+            for node in nodes
+        ]
+        heapq.heapify(load_heap)
+
+        distribution: Dict[str, List[Dict[str, Any]]] = {}
+        unplaced = []
+        unplaceable: List[Tuple[float, float, bool]] = []  # Demands that fit on no node
+        for job in JobSchedulingAlgorithms.shortest_job_first(jobs):
+            resources = job.get('resources', {})
+            demand = (
+                resources.get('cpu_cores', 0),
+                resources.get('memory_gb', 0),
+                bool(resources.get('gpu_required'))
+            )
+            if any(all(failed <= wanted for failed, wanted in zip(seen, demand)) for seen in unplaceable):
+                unplaced.append(job)
+                continue
+            skipped = []
+            while load_heap and not node_matches_job(remaining[load_heap[0][1]], job):
+                skipped.append(heapq.heappop(load_heap))
+
+            if load_heap:
+                load, node_id = heapq.heappop(load_heap)
+                node = remaining[node_id]
+                cores = resources.get('cpu_cores', 0)
+                share = max(cores, 1) / max(node.get('available_cpu', 0), 1)
+                node['available_cpu'] = node.get('available_cpu', 0) - cores
+                node['available_memory'] = node.get('available_memory', 0) - resources.get('memory_gb', 0)
+                distribution.setdefault(node_id, []).append(job)
+                heapq.heappush(load_heap, (load + share, node_id))
+            else:
+                unplaced.append(job)
+                unplaceable.append(demand)
+
+            for entry in skipped:
+                heapq.heappush(load_heap, entry)
+        return distribution, unplaced
+
     @staticmethod
     def priority_scheduling(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Schedule jobs based on priority and submission time
         """
         priority_queue = []
-        for job in jobs:
+        for index, job in enumerate(jobs):
             heapq.heappush(priority_queue, (
                 job.get('priority', 10),  # Default priority
                 job.get('submitted_at', time.time()),
+                index,  # Tie-breaker so job dicts are never compared
                 job
             ))
         
-        return [heapq.heappop(priority_queue)[2] for _ in range(len(priority_queue))]
\ No newline at end of file
+        return [heapq.heappop(priority_queue)[3] for _ in range(len(priority_queue))]
+    
+    @staticmethod
+    def shortest_job_first(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Order by priority, then predicted runtime, then submission time
+
+        Jobs without a ``predicted_runtime`` go after predicted ones of the
+        same priority; with no predictions this is ``priority_scheduling``.
+        """
+        now = time.time()
+        return sorted(jobs, key=lambda job: (
+            job.get('priority', 10),
+            job.get('predicted_runtime', math.inf),
+            job.get('submitted_at', now)
+        ))
+    
+    @staticmethod
+    def fair_share_scheduling(
+        jobs: List[Dict[str, Any]],
+        owner_usage: Optional[Dict[str, float]] = None,
+        owner_weights: Optional[Dict[str, float]] = None,
+        job_cost: float = 1.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Interleave jobs across owners by weighted virtual time
+
+        Within an owner jobs keep priority/submission order; across owners the
+        next job always comes from the owner with the lowest usage / weight.
+        """
+        owner_usage = owner_usage or {}
+        owner_weights = owner_weights or {}
+        
+        per_owner: Dict[str, List[Dict[str, Any]]] = {}
+        for job in JobSchedulingAlgorithms.priority_scheduling(jobs):
+            per_owner.setdefault(job_owner(job), []).append(job)
+        
+        owner_heap = [
+            (owner_usage.get(owner, 0.0) / owner_weights.get(owner, 1.0), owner)
+            for owner in per_owner
+        ]
+        heapq.heapify(owner_heap)
+        positions = {owner: 0 for owner in per_owner}
+        
+        ordered = []
+        while owner_heap:
+            virtual_time, owner = heapq.heappop(owner_heap)
+            owner_jobs = per_owner[owner]
+            ordered.append(owner_jobs[positions[owner]])
+            positions[owner] += 1
+            if positions[owner] < len(owner_jobs):
+                heapq.heappush(owner_heap, (
+                    virtual_time + job_cost / owner_weights.get(owner, 1.0),
+                    owner
+                ))
+        return ordered
\ No newline at end of file
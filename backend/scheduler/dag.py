@@ -0,0 +1,184 @@
+# File: distributed-job-scheduler/backend/scheduler/dag.py
+
+import threading
+import logging
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Callable
+
+# Status of jobs held back by their dependencies
+BLOCKED = 'BLOCKED'
+UPSTREAM_FAILED = 'UPSTREAM_FAILED'
+
+
+class DependencyGraph:
+    """
+    Job dependency DAG with ready-set tracking
+
+    Every submitted job is registered here. Jobs listing ``depends_on``
+    wait until all parents complete; each job keeps a counter of
+    unfinished parents, so releasing a child when its last parent
+    completes is O(1) per edge and nothing is ever rescanned. Parents must
+    already be known when a child is submitted, which also rules out
+    cycles. A failed or cancelled job fails all of its descendants, and
+    so does a released job the queue refuses.
+
+    Only the ``max_outcomes`` most recent outcomes are remembered, so a
+    long-running scheduler does not keep every job id it ever saw; a job
+    may not depend on a parent that finished longer ago than that.
+    """
+    def __init__(self,
+                 on_ready: Callable[[Dict[str, Any]], None],
+                 on_failed: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 max_outcomes: int = 100000):
+        self.on_ready = on_ready
+        self.on_failed = on_failed
+        self.max_outcomes = max_outcomes
+        self.waiting: Dict[str, Dict[str, Any]] = {}  # Blocked jobs
+        self.in_degree: Dict[str, int] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.released = set()  # Ready or running, outcome unknown
+        self.outcomes: "OrderedDict[str, str]" = OrderedDict()  # COMPLETED / FAILED / UPSTREAM_FAILED
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger('DependencyGraph')
+
+    def add_job(self, job: Dict[str, Any]) -> str:
+        """
+        Register a job, releasing it immediately if it has nothing to wait for
+
+        Returns the job's initial status.
+        """
+        job_id = job['id']
+        parents = list(dict.fromkeys(job.get('depends_on') or []))
+
+        with self.lock:
+            if job_id in self.waiting or job_id in self.released or job_id in self.outcomes:
+                raise ValueError(f"Duplicate job id: {job_id}")
+
+            unknown = [
+                parent for parent in parents
+                if parent not in self.waiting and parent not in self.released
+                and parent not in self.outcomes
+            ]
+            if unknown:
+                raise ValueError(f"Unknown dependencies: {', '.join(unknown)}")
+
+            failed_parent = any(
+                self.outcomes.get(parent) in ('FAILED', UPSTREAM_FAILED) for parent in parents
+            )
+            pending = [parent for parent in parents if parent not in self.outcomes]
+
+            if failed_parent:
+                job['status'] = UPSTREAM_FAILED
+                self._record_outcome(job_id, UPSTREAM_FAILED)
+            elif pending:
+                job['status'] = BLOCKED
+                self.waiting[job_id] = job
+                self.in_degree[job_id] = len(pending)
+                for parent in pending:
+                    self.children.setdefault(parent, []).append(job_id)
+            else:
+                self.released.add(job_id)
+
+        if failed_parent:
+            self._notify_failed([job])
+            return UPSTREAM_FAILED
+        if pending:
+            return BLOCKED
+
+        try:
+            self.on_ready(job)
+        except Exception:
+            with self.lock:
+                self.released.discard(job_id)
+            raise
+        return job.get('status', 'QUEUED')
+
+    def mark_completed(self, job_id: str) -> None:
+        """
+        Record a completed job and release children whose last parent it was
+        """
+        ready = []
+        with self.lock:
+            self.released.discard(job_id)
+            self._record_outcome(job_id, 'COMPLETED')
+            for child_id in self.children.pop(job_id, ()):
+                if child_id not in self.waiting:
+                    continue
+                self.in_degree[child_id] -= 1
+                if self.in_degree[child_id] == 0:
+                    del self.in_degree[child_id]
+                    child = self.waiting.pop(child_id)
+                    child['status'] = 'QUEUED'
+                    self.released.add(child_id)
+                    ready.append(child)
+
+        for child in ready:
+            try:
+                self.on_ready(child)
+            except Exception as e:
+                # Nothing would ever release it again, so fail it and its dependents
+                self.logger.error(f"Failed to release job {child['id']}, failing it: {e}")
+                child['status'] = 'FAILED'
+                self.mark_failed(child['id'])
+                self._notify_failed([child])
+
+    def mark_failed(self, job_id: str) -> List[str]:
+        """
+        Record a failed or cancelled job and fail everything downstream of it
+
+        Returns the ids of the dependents that were failed.
+        """
+        failed = []
+        with self.lock:
+            self.released.discard(job_id)
+            if job_id in self.waiting:
+                del self.waiting[job_id]
+                self.in_degree.pop(job_id, None)
+            self._record_outcome(job_id, 'FAILED')
+
+            frontier = deque([job_id])
+            while frontier:
+                for child_id in self.children.pop(frontier.popleft(), ()):
+                    child = self.waiting.pop(child_id, None)
+                    if child is None:
+                        continue
+                    self.in_degree.pop(child_id, None)
+                    child['status'] = UPSTREAM_FAILED
+                    self._record_outcome(child_id, UPSTREAM_FAILED)
+                    failed.append(child)
+                    frontier.append(child_id)
+
+        if failed:
+            self.logger.warning(f"Job {job_id} failed, cancelling {len(failed)} dependent jobs")
+            self._notify_failed(failed)
+        return [child['id'] for child in failed]
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job held back by the graph
+        """
+        with self.lock:
+            job = self.waiting.get(job_id)
+            if job is not None:
+                return job
+            if self.outcomes.get(job_id) == UPSTREAM_FAILED:
+                return {'id': job_id, 'status': UPSTREAM_FAILED}
+            return None
+
+    def get_waiting_jobs(self) -> List[Dict[str, Any]]:
+        """
+        All jobs still blocked on their dependencies
+        """
+        with self.lock:
+            return list(self.waiting.values())
+
+    def _record_outcome(self, job_id: str, outcome: str) -> None:
+        self.outcomes[job_id] = outcome
+        self.outcomes.move_to_end(job_id)
+        while len(self.outcomes) > self.max_outcomes:
+            self.outcomes.popitem(last=False)
+
+    def _notify_failed(self, jobs: List[Dict[str, Any]]) -> None:
+        if self.on_failed is not None:
+            for job in jobs:
+                self.on_failed(job)
@@ -0,0 +1,201 @@
+# File: distributed-job-scheduler/backend/scheduler/gang.py
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple
+
+
+def gang_size(job: Dict[str, Any]) -> int:
+    """
+    Number of nodes a job must start on together
+    """
+    return max(1, int(job.get('nodes', 1)))
+
+
+def node_matches_job(node: Dict[str, Any], job: Dict[str, Any]) -> bool:
+    """
+    Check a node satisfies a job's per-node resource requirements
+    """
+    resources = job.get('resources', {})
+    return (
+        node.get('available_cpu', 0) >= resources.get('cpu_cores', 0) and
+        node.get('available_memory', 0) >= resources.get('memory_gb', 0) and
+        (not resources.get('gpu_required') or node.get('gpu_available', False))
+    )
+
+
+def node_could_host(node: Dict[str, Any], job: Dict[str, Any]) -> bool:
+    """
+    Check a node's total capacity covers a job's per-node requirements, busy or not
+    """
+    resources = job.get('resources', {})
+    return (
+        node.get('cpu_cores', node.get('available_cpu', 0)) >= resources.get('cpu_cores', 0) and
+        node.get('memory_gb', node.get('available_memory', 0)) >= resources.get('memory_gb', 0) and
+        (not resources.get('gpu_required') or node.get('gpu_available', False))
+    )
+
+
+@dataclass
+class GangReservation:
+    """
+    Nodes held for a multi-node job until all of its members can start
+    """
+    job: Dict[str, Any]
+    size: int
+    node_ids: List[str] = field(default_factory=list)
+    expires_at: Optional[float] = None
+    launched: bool = False
+    finished_ranks: Set[int] = field(default_factory=set)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.node_ids) >= self.size
+
+
+class GangScheduler:
+    """
+    Co-scheduling of multi-node jobs
+
+    A job declaring ``nodes: k`` only starts once k matching nodes are
+    reserved. Nodes are reserved as they become free; a partial
+    reservation that cannot be completed within ``reservation_timeout`` is
+    released so two gangs holding half the cluster each cannot deadlock.
+    A gang needing more nodes than the cluster has that could ever host
+    it holds none, and is rejected if the cluster is still too small once
+    ``reservation_timeout`` has passed, as nodes may only be down for a
+    while. ``clock`` is the scheduler's, so timeouts follow virtual time
+    in the simulator.
+    """
+    def __init__(self, reservation_timeout: float = 120.0, clock: Callable[[], float] = time.time):
+        self.reservation_timeout = reservation_timeout
+        self.clock = clock
+        self.pending: "OrderedDict[str, GangReservation]" = OrderedDict()
+        self.running: Dict[str, GangReservation] = {}
+        self.reserved_nodes: Dict[str, str] = {}  # node_id -> job_id
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger('GangScheduler')
+
+    def add_job(self, job: Dict[str, Any]) -> None:
+        """
+        Queue a multi-node job for reservation
+        """
+        with self.lock:
+            self.pending[job['id']] = GangReservation(job=job, size=gang_size(job))
+
+    def reserve(
+        self,
+        available_nodes: List[Dict[str, Any]]
+    ) -> Tuple[List[GangReservation], List[GangReservation], List[GangReservation]]:
+        """
+        Extend reservations with free nodes
+
+        Returns the gangs that are now complete and ready to launch, the
+        gangs whose partial reservation timed out and was released, and the
+        gangs that stayed larger than the number of nodes that could host
+        them until their timeout.
+        """
+        now = self.clock()
+        ready, expired, rejected = [], [], []
+        too_large = set()
+
+        with self.lock:
+            for job_id, reservation in list(self.pending.items()):
+                hosts = sum(1 for node in available_nodes if node_could_host(node, reservation.job))
+                if hosts < reservation.size:
+                    self._release_nodes(reservation)
+                    reservation.node_ids = []
+                    if reservation.expires_at is None:
+                        reservation.expires_at = now + self.reservation_timeout
+                    elif now >= reservation.expires_at:
+                        del self.pending[job_id]
+                        rejected.append(reservation)
+                        continue
+                    too_large.add(job_id)
+                elif reservation.expires_at is not None and now >= reservation.expires_at:
+                    self._release_nodes(reservation)
+                    del self.pending[job_id]
+                    expired.append(reservation)
+
+            free_nodes = sorted(
+                (node for node in available_nodes if node['id'] not in self.reserved_nodes),
+                key=lambda node: node.get('current_load', 0)
+            )
+
+            for job_id, reservation in list(self.pending.items()):
+                if not free_nodes:
+                    break
+                if job_id in too_large:
+                    continue
+
+                needed = reservation.size - len(reservation.node_ids)
+                taken = [node for node in free_nodes if node_matches_job(node, reservation.job)][:needed]
+                if not taken:
+                    continue
+
+                for node in taken:
+                    free_nodes.remove(node)
+                    reservation.node_ids.append(node['id'])
+                    self.reserved_nodes[node['id']] = job_id
+
+                if reservation.expires_at is None:
+                    reservation.expires_at = now + self.reservation_timeout
+
+                if reservation.complete:
+                    del self.pending[job_id]
+                    self.running[job_id] = reservation
+                    ready.append(reservation)
+
+        for reservation in expired:
+            self.logger.warning(
+                f"Gang reservation for job {reservation.job['id']} timed out "
+                f"with {len(reservation.node_ids)}/{reservation.size} nodes"
+            )
+        return ready, expired, rejected
+
+    def finish_member(self, job_id: str, rank: Optional[int]) -> bool:
+        """
+        Record a gang member finishing; True once the whole job has finished
+
+        Nodes are released only when the last rank finishes. Jobs that are
+        not running gangs, and a ``rank`` of None, finish the job at once.
+        """
+        with self.lock:
+            reservation = self.running.get(job_id)
+            if reservation is None:
+                return True
+            if rank is not None:
+                reservation.finished_ranks.add(rank)
+                if len(reservation.finished_ranks) < reservation.size:
+                    return False
+            del self.running[job_id]
+            self._release_nodes(reservation)
+            return True
+
+    def release(self, job_id: str) -> Optional[GangReservation]:
+        """
+        Release every node held by a gang job (pending or running)
+        """
+        with self.lock:
+            reservation = self.running.pop(job_id, None) or self.pending.pop(job_id, None)
+            if reservation is not None:
+                self._release_nodes(reservation)
+            return reservation
+
+    def pending_reservations(self) -> List[GangReservation]:
+        """
+        Gangs still waiting for nodes, oldest first
+        """
+        with self.lock:
+            return list(self.pending.values())
+
+    def is_gang_job(self, job_id: str) -> bool:
+        return job_id in self.running or job_id in self.pending
+
+    def _release_nodes(self, reservation: GangReservation) -> None:
+        for node_id in reservation.node_ids:
+            if self.reserved_nodes.get(node_id) == reservation.job['id']:
+                del self.reserved_nodes[node_id]
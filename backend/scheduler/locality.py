@@ -0,0 +1,103 @@
+# File: distributed-job-scheduler/backend/scheduler/locality.py
+
+import threading
+from typing import Dict, Any, List, Set, Tuple
+
+
+def job_artifacts(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Input files a job reads, as ``{'digest', 'size', 'source'}`` entries
+    """
+    return job.get('artifacts') or []
+
+
+class ArtifactRegistry:
+    """
+    Which content-hashed artifacts each node holds in its local cache
+
+    Nodes report their caches with each heartbeat (see
+    ``ArtifactCache.report``): a full listing now and then and only what
+    was added or removed in between. Keeps both directions of the mapping
+    so locality lookups cost one set probe per artifact.
+    """
+    def __init__(self):
+        self.by_node: Dict[str, Dict[str, int]] = {}  # node id -> digest -> size
+        self.holders: Dict[str, Set[str]] = {}  # digest -> node ids
+        self.lock = threading.Lock()
+
+    def update(self, node_id: str, report: Dict[str, Any]) -> None:
+        with self.lock:
+            held = self.by_node.setdefault(node_id, {})
+            if report.get('full'):
+                for digest in held:
+                    self._drop_holder(digest, node_id)
+                held.clear()
+            for digest in report.get('removed', ()):
+                if held.pop(digest, None) is not None:
+                    self._drop_holder(digest, node_id)
+            for digest, size in report.get('added', {}).items():
+                held[digest] = size
+                self.holders.setdefault(digest, set()).add(node_id)
+
+    def remove_node(self, node_id: str) -> None:
+        with self.lock:
+            for digest in self.by_node.pop(node_id, {}):
+                self._drop_holder(digest, node_id)
+
+    def local_bytes(self, artifacts: List[Dict[str, Any]], node_id: str) -> int:
+        """
+        Bytes of the given artifacts a node already holds
+        """
+        with self.lock:
+            return sum(
+                artifact.get('size', 0) for artifact in artifacts
+                if node_id in self.holders.get(artifact['digest'], ())
+            )
+
+    def nodes_holding(self, digest: str) -> Set[str]:
+        with self.lock:
+            return set(self.holders.get(digest, ()))
+
+    def _drop_holder(self, digest: str, node_id: str) -> None:
+        nodes = self.holders.get(digest)
+        if nodes is not None:
+            nodes.discard(node_id)
+            if not nodes:
+                del self.holders[digest]
+
+
+class LocalityPlacement:
+    """
+    Scheduler placement policy preferring nodes that already hold a job's inputs
+
+    Each job goes to the node ``AdvancedLoadBalancer.select_node_locality``
+    picks among those with room for it; the node's copy is then charged
+    with the job so the rest of the batch sees the updated load. Jobs
+    that fit nowhere are returned as unplaced.
+    """
+    def __init__(self, registry: ArtifactRegistry, locality_weight: float = 1.0):
+        self.registry = registry
+        self.locality_weight = locality_weight
+
+    def __call__(self, jobs: List[Dict[str, Any]],
+                 nodes: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        # Imported here so the scheduler can use the registry without asyncio
+        from .advanced_scheduler import AdvancedLoadBalancer, Job
+
+        nodes = [dict(node) for node in nodes]
+        balancer = AdvancedLoadBalancer(nodes, artifact_registry=self.registry)
+        distribution: Dict[str, List[Dict[str, Any]]] = {}
+        unplaced = []
+        for job in jobs:
+            task = Job.from_record(job)
+            node = balancer.select_node_locality(task, self.locality_weight)
+            if node is None:
+                unplaced.append(job)
+                continue
+            node['available_cpu'] = node.get('available_cpu', 0) - task.resource_requirements.cpu_cores
+            node['available_memory'] = node.get('available_memory', 0) - task.resource_requirements.memory_gb
+            node['current_load'] = node.get('current_load', 0) + (
+                task.resource_requirements.cpu_cores / node['cpu_cores'] if node.get('cpu_cores') else 0
+            )
+            distribution.setdefault(node['id'], []).append(job)
+        return distribution, unplaced
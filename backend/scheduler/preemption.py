@@ -0,0 +1,192 @@
+# File: distributed-job-scheduler/backend/scheduler/preemption.py
+
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from .gang import node_matches_job
+
+
+@dataclass
+class RunningJob:
+    """
+    A dispatched job as seen by the preemption policy
+    """
+    job: Dict[str, Any]
+    node_id: str
+    started_at: float
+    checkpoint_saved_at: Optional[float] = None
+
+    @property
+    def cpu_cores(self) -> float:
+        return self.job.get('resources', {}).get('cpu_cores', 1)
+
+    @property
+    def memory_gb(self) -> float:
+        return self.job.get('resources', {}).get('memory_gb', 0)
+
+    @property
+    def node_ids(self) -> List[str]:
+        """
+        Every node the job occupies, all members' for a gang
+        """
+        return self.job.get('gang_nodes') or [self.node_id]
+
+
+@dataclass
+class PreemptionPlan:
+    """
+    Victims to evict from a node so an urgent job can start there
+    """
+    node_id: str
+    victims: List[RunningJob]
+    cost: float
+
+
+class PreemptionPolicy:
+    """
+    Checkpoint-aware victim selection for urgent jobs
+
+    Priorities use the job queue's scale: a lower number is more urgent,
+    clamped to ``priority_levels`` levels with the same default, so the
+    jobs allowed to preempt are also the ones the queue hands out first.
+    Only jobs at or above ``max_priority`` in urgency may preempt, and
+    only jobs at a strictly less urgent level can be evicted. The cost of
+    evicting a job grows with its urgency, plus the work that would be
+    lost, i.e. the runtime since its last checkpoint (or since it started
+    when there is none), on each of its nodes: evicting one member of a
+    gang stops all of them.
+
+    Times are the caller's clock: the scheduler passes its own ``now`` so
+    costs follow virtual time in the simulator.
+    """
+    def __init__(self,
+                 max_priority: int = 0,
+                 priority_levels: int = 3,
+                 priority_weight: float = 600.0,
+                 lost_work_weight: float = 1.0):
+        self.max_priority = max_priority
+        self.priority_levels = priority_levels
+        self.priority_weight = priority_weight
+        self.lost_work_weight = lost_work_weight
+
+    def level(self, job: Dict[str, Any]) -> int:
+        """
+        Queue priority level of a job, as ``DistributedJobQueue`` clamps it
+        """
+        return max(0, min(job.get('priority', self.priority_levels // 2), self.priority_levels - 1))
+
+    def can_preempt(self, job: Dict[str, Any]) -> bool:
+        return self.level(job) <= self.max_priority
+
+    def victim_cost(self, running: RunningJob, now: Optional[float] = None) -> float:
+        """
+        Cost of evicting a running job, in seconds of equivalent lost work
+        """
+        if now is None:
+            now = time.time()
+        progress_since = max(running.started_at, running.checkpoint_saved_at or 0)
+        lost_work = max(0.0, now - progress_since) * len(running.node_ids)
+        urgency = self.priority_levels - self.level(running.job)
+        return self.priority_weight * urgency + self.lost_work_weight * lost_work
+
+    def select_victims(
+        self,
+        job: Dict[str, Any],
+        nodes: List[Dict[str, Any]],
+        running_jobs: List[RunningJob],
+        now: Optional[float] = None
+    ) -> Optional[PreemptionPlan]:
+        """
+        Pick the cheapest set of victims on a single node that frees enough
+        cores and memory for the job
+
+        Nodes without a GPU are skipped for jobs that need one, as no
+        eviction can change that, and a plan is only accepted if the job
+        fits the node once its victims are gone.
+        """
+        if not self.can_preempt(job):
+            return None
+
+        if now is None:
+            now = time.time()
+        resources = job.get('resources', {})
+        needed_cpu = resources.get('cpu_cores', 1)
+        needed_memory = resources.get('memory_gb', 0)
+        level = self.level(job)
+
+        per_node: Dict[str, List[RunningJob]] = {}
+        for running in running_jobs:
+            if self.level(running.job) > level:
+                for node_id in running.node_ids:
+                    per_node.setdefault(node_id, []).append(running)
+
+        best = None
+        for node in nodes:
+            candidates = per_node.get(node['id'])
+            if not candidates or (resources.get('gpu_required') and not node.get('gpu_available', False)):
+                continue
+            shortfall = (
+                needed_cpu - node.get('available_cpu', 0),
+                needed_memory - node.get('available_memory', 0)
+            )
+            plan = self._cheapest_cover(node['id'], candidates, shortfall, now)
+            if plan is None or (best is not None and plan.cost >= best.cost):
+                continue
+            freed = dict(
+                node,
+                available_cpu=node.get('available_cpu', 0) + sum(r.cpu_cores for r in plan.victims),
+                available_memory=node.get('available_memory', 0) + sum(r.memory_gb for r in plan.victims)
+            )
+            if node_matches_job(freed, job):
+                best = plan
+        return best
+
+    def _cheapest_cover(
+        self,
+        node_id: str,
+        candidates: List[RunningJob],
+        shortfall: Tuple[float, float],
+        now: float
+    ) -> Optional[PreemptionPlan]:
+        """
+        Greedy cover of the (cores, memory) shortfall by cost per share of it
+        freed, then prune victims that turned out to be unnecessary
+        """
+        short_cpu, short_memory = shortfall
+        costs = {id(running): self.victim_cost(running, now) for running in candidates}
+
+        def covered(running: RunningJob) -> float:
+            share = 0.0
+            if short_cpu > 0:
+                share += min(running.cpu_cores, short_cpu) / short_cpu
+            if short_memory > 0:
+                share += min(running.memory_gb, short_memory) / short_memory
+            return share
+
+        ordered = sorted(
+            candidates,
+            key=lambda running: costs[id(running)] / max(covered(running), 1e-9)
+        )
+
+        victims, freed_cpu, freed_memory = [], 0.0, 0.0
+        for running in ordered:
+            if freed_cpu >= short_cpu and freed_memory >= short_memory:
+                break
+            victims.append(running)
+            freed_cpu += running.cpu_cores
+            freed_memory += running.memory_gb
+        if freed_cpu < short_cpu or freed_memory < short_memory or not victims:
+            return None
+
+        for running in sorted(victims, key=lambda r: costs[id(r)], reverse=True):
+            if freed_cpu - running.cpu_cores >= short_cpu and \
+                    freed_memory - running.memory_gb >= short_memory:
+                victims.remove(running)
+                freed_cpu -= running.cpu_cores
+                freed_memory -= running.memory_gb
+
+        return PreemptionPlan(
+            node_id=node_id,
+            victims=victims,
+            cost=sum(costs[id(running)] for running in victims)
+        )
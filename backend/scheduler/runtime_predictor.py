@@ -0,0 +1,148 @@
+# File: distributed-job-scheduler/backend/scheduler/runtime_predictor.py
+
+import math
+import threading
+from typing import Dict, Any, Optional
+import numpy as np
+
+# Defaults the molecular dynamics runner applies to missing parameters
+MD_DEFAULT_PARTICLES = 1000
+MD_DEFAULT_STEPS = 1000
+
+NUM_FEATURES = 5
+
+
+def job_features(job: Dict[str, Any]) -> np.ndarray:
+    """
+    Log-scale feature vector of a job
+
+    Intercept, particle count, step count, the user's ``duration`` hint
+    and requested cores. Working in logs turns power laws such as
+    ``runtime ~ particles^a * steps`` into linear fits, so the model
+    learns the exponents rather than assuming them.
+    """
+    params = job.get('simulation_parameters') or {}
+    is_md = job.get('type') == 'molecular_dynamics'
+    particles = params.get('num_particles', MD_DEFAULT_PARTICLES if is_md else 0)
+    steps = params.get('simulation_steps', MD_DEFAULT_STEPS if is_md else 0)
+    return np.array([
+        1.0,
+        math.log1p(max(float(particles), 0.0)),
+        math.log1p(max(float(steps), 0.0)),
+        math.log1p(max(float(job.get('duration', 0) or 0), 0.0)),
+        math.log1p(max(float(job.get('resources', {}).get('cpu_cores', 1)), 0.0))
+    ])
+
+
+class RecursiveLeastSquares:
+    """
+    Linear regression updated one sample at a time in O(d^2)
+
+    ``forgetting`` below 1 discounts old samples geometrically so the fit
+    follows hardware or code changes. The running variance of the
+    a-priori residuals measures how far off predictions have been.
+    """
+    def __init__(self, dimension: int, forgetting: float = 0.98, initial_covariance: float = 1000.0):
+        self.forgetting = forgetting
+        self.theta = np.zeros(dimension)
+        self.covariance = np.eye(dimension) * initial_covariance
+        self.residual_variance = 1.0
+        self.count = 0
+
+    def predict(self, x: np.ndarray) -> float:
+        return float(self.theta @ x)
+
+    def update(self, x: np.ndarray, y: float) -> float:
+        """
+        Fit one sample; returns the error of the prediction made before it
+        """
+        px = self.covariance @ x
+        gain = px / (self.forgetting + x @ px)
+        error = y - self.theta @ x
+        self.theta = self.theta + gain * error
+        self.covariance = (self.covariance - np.outer(gain, px)) / self.forgetting
+        if self.count:
+            # Plain mean over the first samples, then exponential forgetting
+            weight = max(1 - self.forgetting, 1 / self.count)
+            self.residual_variance += weight * (error * error - self.residual_variance)
+        self.count += 1
+        return float(error)
+
+
+class RuntimePredictor:
+    """
+    Online runtime estimates per job type, fitted from completed jobs
+
+    Each job type has its own ``RecursiveLeastSquares`` model of log
+    runtime over ``job_features``. Until a type has ``min_samples``
+    completions there is no estimate and callers keep their old
+    behaviour. Timeouts allow for the model's observed error: the
+    estimate is stretched by ``exp(timeout_sigmas * sigma)`` (at least
+    ``min_timeout_factor``) and doubled for every retry, so a job killed
+    by a tight timeout gets more room next time.
+    """
+    def __init__(self,
+                 forgetting: float = 0.98,
+                 min_samples: int = 5,
+                 timeout_sigmas: float = 4.0,
+                 min_timeout_factor: float = 2.0,
+                 min_timeout: float = 60.0,
+                 max_timeout: float = 86400.0):
+        self.forgetting = forgetting
+        self.min_samples = min_samples
+        self.timeout_sigmas = timeout_sigmas
+        self.min_timeout_factor = min_timeout_factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.models: Dict[str, RecursiveLeastSquares] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, job: Dict[str, Any], runtime: float) -> None:
+        """
+        Fit a completed job's runtime into its type's model
+        """
+        if runtime <= 0:
+            return
+        x = job_features(job)
+        with self.lock:
+            model = self.models.get(job.get('type') or 'unknown')
+            if model is None:
+                model = self.models[job.get('type') or 'unknown'] = RecursiveLeastSquares(
+                    NUM_FEATURES, self.forgetting
+                )
+            model.update(x, math.log(runtime))
+
+    def predict(self, job: Dict[str, Any]) -> Optional[float]:
+        """
+        Estimated runtime in seconds, or None while the type has too few samples
+        """
+        x = job_features(job)
+        with self.lock:
+            model = self.models.get(job.get('type') or 'unknown')
+            if model is None or model.count < self.min_samples:
+                return None
+            return math.exp(model.predict(x))
+
+    def timeout_for(self, job: Dict[str, Any]) -> Optional[float]:
+        """
+        Timeout covering the estimate with room for model error, or None
+        """
+        estimate = self.predict(job)
+        if estimate is None:
+            return None
+        with self.lock:
+            sigma = math.sqrt(self.models[job.get('type') or 'unknown'].residual_variance)
+        factor = max(self.min_timeout_factor, math.exp(self.timeout_sigmas * sigma))
+        timeout = estimate * factor * 2 ** job.get('retries', 0)
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                job_type: {
+                    'samples': model.count,
+                    'log_error_sigma': math.sqrt(model.residual_variance),
+                    'coefficients': model.theta.tolist()
+                }
+                for job_type, model in self.models.items()
+            }
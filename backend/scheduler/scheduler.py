@@ -1,44 +1,541 @@
 # File: distributed-job-scheduler/backend/scheduler/scheduler.py
 
 import logging
-from typing import List, Dict, Any
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Optional, Tuple
 from backend.config import Config
+from backend.fault_tolerance.recovery import JobRecoveryManager
+from backend.performance.tracing import begin_span, end_span
 from .algorithms import JobSchedulingAlgorithms
+from .dag import DependencyGraph
+from .gang import GangScheduler, GangReservation, gang_size, node_matches_job
+from .locality import ArtifactRegistry, job_artifacts
+from .preemption import PreemptionPolicy, PreemptionPlan, RunningJob
+
+if TYPE_CHECKING:
+    # Needs numpy; only callers that enable prediction should pay for importing it
+    from .runtime_predictor import RuntimePredictor
+
+# Splits jobs over nodes, returning the distribution and the jobs placed nowhere
+PlacementPolicy = Callable[
+    [List[Dict[str, Any]], List[Dict[str, Any]]],
+    Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]
+]
+
 
 class Scheduler:
     """
     Central job scheduling and distribution system
+
+    Single jobs go to the least loaded node unless a ``placement_policy``
+    is given. ``clock`` stamps dispatch and completion times, which lets
+    the simulator run the scheduler on virtual time.
+
+    With a ``runtime_predictor``, jobs carry a ``predicted_runtime`` and
+    are placed shortest first within a priority, jobs without their own
+    ``timeout`` get one from the prediction, and short jobs may backfill
+    nodes held for a waiting gang. With an ``artifact_registry``, the
+    input bytes each dispatch finds already on its node are counted.
     """
-    def __init__(self, job_queue, node_registry):
+    def __init__(self, job_queue, node_registry,
+                 gang_reservation_timeout: float = Config.GANG_RESERVATION_TIMEOUT,
+                 preemption_policy: Optional[PreemptionPolicy] = None,
+                 metrics=None,
+                 tracer=None,
+                 recorder=None,
+                 runtime_predictor: Optional['RuntimePredictor'] = None,
+                 artifact_registry: Optional[ArtifactRegistry] = None,
+                 placement_policy: Optional[PlacementPolicy] = None,
+                 clock: Callable[[], float] = time.time):
         self.job_queue = job_queue
         self.node_registry = node_registry
+        self.gang_scheduler = GangScheduler(reservation_timeout=gang_reservation_timeout, clock=clock)
+        self.preemption_policy = preemption_policy
+        self.metrics = metrics
+        self.tracer = tracer
+        self.recorder = recorder
+        self.runtime_predictor = runtime_predictor
+        self.artifact_registry = artifact_registry
+        self.placement_policy = placement_policy
+        self.clock = clock
+        self.running_jobs: Dict[str, RunningJob] = {}
+        self.dependency_graph = DependencyGraph(
+            on_ready=self.job_queue.enqueue,
+            on_failed=self._dependency_failed,
+            max_outcomes=Config.DAG_MAX_OUTCOMES
+        )
+        self.recovery_manager = JobRecoveryManager(max_retries=Config.FAULT_TOLERANCE_RETRY_LIMIT)
         self.logger = logging.getLogger('Scheduler')
-    
+
     def distribute_jobs(self):
         """
         Distribute jobs across available nodes
         """
         available_nodes = self.node_registry.get_active_nodes()
-        pending_jobs = self.job_queue.get_all_jobs()
-        
-        # Use least loaded node scheduling
-        node_loads = {node['id']: node['current_load'] for node in available_nodes}
-        job_distribution = JobSchedulingAlgorithms.least_loaded_node_scheduling(
-            pending_jobs, node_loads
-        )
-        
+        if not available_nodes:
+            return
+
+        pending_jobs = []
+        while True:
+            job = self.job_queue.dequeue()
+            if job is None:
+                break
+            begin_span(job, 'placement')
+            self._apply_runtime_prediction(job)
+            if gang_size(job) > 1:
+                self.gang_scheduler.add_job(job)
+            else:
+                pending_jobs.append(job)
+        if self.runtime_predictor is not None:
+            pending_jobs = JobSchedulingAlgorithms.shortest_job_first(pending_jobs)
+
+        # Multi-node jobs reserve nodes first so they are not starved by singles
+        self.schedule_gangs(available_nodes)
+
+        free_nodes = [
+            node for node in available_nodes
+            if node['id'] not in self.gang_scheduler.reserved_nodes
+        ]
+
+        # Urgent jobs that fit nowhere may evict lower-priority work, running gangs included
+        if self.preemption_policy is not None:
+            gang_nodes = [
+                node for node in available_nodes
+                if self.gang_scheduler.reserved_nodes.get(node['id']) in self.gang_scheduler.running
+            ]
+            pending_jobs = [
+                job for job in pending_jobs
+                if not self._try_preempt_for(job, free_nodes, gang_nodes)
+            ]
+
+        # Use least loaded node scheduling on nodes not held by a gang
+        node_loads = {node['id']: node.get('current_load', 0) for node in free_nodes}
+        if not node_loads:
+            for job in self._backfill(pending_jobs, available_nodes):
+                self._requeue(job)
+            return
+
+        if self.placement_policy is None:
+            job_distribution = JobSchedulingAlgorithms.least_loaded_node_scheduling(
+                pending_jobs, node_loads
+            )
+        else:
+            job_distribution, unplaced = self.placement_policy(pending_jobs, free_nodes)
+            for job in self._backfill(unplaced, available_nodes):
+                self._requeue(job)
+
         # Send jobs to respective nodes
         for node_id, jobs in job_distribution.items():
-            self._send_jobs_to_node(node_id, jobs)
-    
-    def _send_jobs_to_node(self, node_id: str, jobs: List[Dict[str, Any]]):
+            if not self._send_jobs_to_node(node_id, jobs):
+                for job in jobs:
+                    self._requeue(job)
+
+    def schedule_gangs(self, available_nodes: Optional[List[Dict[str, Any]]] = None):
+        """
+        Reserve nodes for waiting gang jobs and launch those fully reserved
+
+        Part of every ``distribute_jobs`` pass. In pull mode nothing else
+        places gangs, so this has to be run periodically on its own.
+        """
+        if available_nodes is None:
+            available_nodes = self.node_registry.get_active_nodes()
+        if not available_nodes:
+            return
+
+        ready, expired, rejected = self.gang_scheduler.reserve(available_nodes)
+        for reservation in expired:
+            self._requeue(reservation.job)
+        for reservation in rejected:
+            self.logger.error(
+                f"Gang job {reservation.job['id']} needs {reservation.size} nodes, "
+                f"more than the cluster has that can host it"
+            )
+            self._fail(reservation.job)
+        for reservation in ready:
+            self._launch_gang(reservation)
+
+    def request_work(self, node_id: str, max_jobs: int) -> List[Dict[str, Any]]:
+        """
+        Hand up to max_jobs queued jobs to a node agent asking for work
+
+        Used by agents in pull mode instead of ``distribute_jobs``. Gang jobs
+        still need a coordinated start, so they are set aside for
+        ``schedule_gangs`` rather than handed out.
+        """
+        jobs = []
+        while len(jobs) < max_jobs:
+            job = self.job_queue.dequeue()
+            if job is None:
+                break
+            self._apply_runtime_prediction(job)
+            if gang_size(job) > 1:
+                self.gang_scheduler.add_job(job)
+            else:
+                jobs.append(job)
+
+        self._record_dispatch(node_id, jobs)
+        return jobs
+
+    def handle_jobs_stolen(self, node_id: str, jobs: List[Dict[str, Any]]):
+        """
+        Track jobs an idle agent took over from a peer's backlog
+        """
+        for job in jobs:
+            running = self.running_jobs.get(job['id'])
+            if running is not None:
+                running.node_id = node_id
+
+    def handle_job_completion(self, job_id: str, rank: Optional[int] = None,
+                              execution_time: Optional[float] = None):
+        """
+        Release resources held for a finished job and unblock its dependents
+
+        Gang members pass their ``gang_rank``; the gang only completes, and
+        frees its nodes, once every rank has finished. ``execution_time``
+        is how long the job actually ran, as reported by its node; runtime
+        prediction learns from it rather than from the time since dispatch.
+        """
+        if not self.gang_scheduler.finish_member(job_id, rank):
+            return
+        running = self.running_jobs.pop(job_id, None)
+        if running is not None and self.metrics is not None:
+            self.metrics.record_job_completion(dict(
+                running.job,
+                node_id=running.node_id,
+                start_time=running.started_at,
+                end_time=self.clock()
+            ))
+        if running is not None and self.tracer is not None:
+            self.tracer.finish_trace(running.job, 'COMPLETED')
+        if running is not None and self.recorder is not None:
+            self.recorder.record_finish(job_id, 'COMPLETED', self.clock() - running.started_at)
+        if running is not None and self.runtime_predictor is not None:
+            self._learn_runtime(running, execution_time)
+        self.job_queue.update_job_status(job_id, 'COMPLETED')
+        self.dependency_graph.mark_completed(job_id)
+
+    def handle_job_failure(self, job_id: str, node_id: str = None):
+        """
+        Retry a failed job, or fail it together with its dependents
+
+        A failed gang member tears down the whole gang. Failures of jobs
+        that are no longer running, such as the other members of a gang
+        already torn down or a preempted job, are ignored.
+        """
+        running = self.running_jobs.pop(job_id, None)
+        reservation = self.gang_scheduler.release(job_id)
+        if running is None and reservation is None:
+            self.logger.info(f"Ignoring failure of job {job_id} on node {node_id}, it is not running")
+            return
+        if running is not None and self.metrics is not None:
+            self.metrics.record_job_failure(running.job)
+        if reservation is not None:
+            self.logger.warning(f"Gang job {job_id} member on node {node_id} failed, releasing gang")
+            self._cancel_members(reservation, [n for n in reservation.node_ids if n != node_id])
+            job = reservation.job
+        else:
+            job = running.job
+
+        recovered = self.recovery_manager.recover_failed_job(job)
+        if recovered['status'] == 'QUEUED':
+            self._requeue(recovered)
+        else:
+            self._fail(job, self.clock() - running.started_at if running is not None else 0.0)
+
+    def _fail(self, job: Dict[str, Any], runtime: float = 0.0):
+        """
+        Mark a job failed for good and fail its dependents with it
+        """
+        if self.tracer is not None:
+            self.tracer.finish_trace(job, 'FAILED')
+        if self.recorder is not None:
+            self.recorder.record_finish(job['id'], 'FAILED', runtime)
+        self.job_queue.update_job_status(job['id'], 'FAILED')
+        self.dependency_graph.mark_failed(job['id'])
+
+    def _apply_runtime_prediction(self, job: Dict[str, Any]):
+        """
+        Attach a runtime estimate and, unless the user set one, a timeout
+        """
+        if self.runtime_predictor is None:
+            return
+        estimate = self.runtime_predictor.predict(job)
+        if estimate is None:
+            return
+        job['predicted_runtime'] = estimate
+        if 'timeout' not in job or job.get('timeout_predicted'):
+            job['timeout'] = self.runtime_predictor.timeout_for(job)
+            job['timeout_predicted'] = True
+
+    def _learn_runtime(self, running: RunningJob, execution_time: Optional[float] = None):
+        """
+        Fit a completed job's runtime and record how far off its estimate was
+
+        Without a reported ``execution_time`` the runtime is measured from
+        dispatch, which includes any wait on the node.
+        """
+        runtime = self.clock() - running.started_at if execution_time is None else execution_time
+        predicted = running.job.get('predicted_runtime')
+        if predicted is not None and self.metrics is not None:
+            self.metrics.record_prediction_error(running.job, predicted, runtime)
+        self.runtime_predictor.observe(running.job, runtime)
+
+    def _backfill(self, jobs: List[Dict[str, Any]], nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run short jobs on nodes held idle for a gang that is still waiting
+
+        A job may use a held node only if its predicted runtime ends by the
+        gang's shadow time, the earliest the rest of its nodes are expected
+        to free up, so backfilling does not delay the gang (EASY backfill).
+        Returns the jobs that were not backfilled.
+        """
+        if self.runtime_predictor is None or not jobs:
+            return jobs
+        now = self.clock()
+        by_id = {node['id']: dict(node) for node in nodes}
+        windows = []  # (held node copy, shadow time)
+        for reservation in self.gang_scheduler.pending_reservations():
+            shadow = self._shadow_time(reservation, nodes, now)
+            if shadow is not None:
+                windows.extend(
+                    (by_id[node_id], shadow) for node_id in reservation.node_ids if node_id in by_id
+                )
+        if not windows:
+            return jobs
+
+        remaining = []
+        backfilled: Dict[str, List[Dict[str, Any]]] = {}
+        for job in jobs:
+            runtime = job.get('predicted_runtime')
+            node = None
+            if runtime is not None:
+                node = next((
+                    node for node, shadow in windows
+                    if now + runtime <= shadow and node_matches_job(node, job)
+                ), None)
+            if node is None:
+                remaining.append(job)
+                continue
+            resources = job.get('resources', {})
+            node['available_cpu'] = node.get('available_cpu', 0) - resources.get('cpu_cores', 0)
+            node['available_memory'] = node.get('available_memory', 0) - resources.get('memory_gb', 0)
+            backfilled.setdefault(node['id'], []).append(job)
+
+        for node_id, node_jobs in backfilled.items():
+            self.logger.info(f"Backfilling {len(node_jobs)} jobs onto gang-held node {node_id}")
+            if not self._send_jobs_to_node(node_id, node_jobs):
+                remaining.extend(node_jobs)
+        return remaining
+
+    def _shadow_time(self, reservation: GangReservation, nodes: List[Dict[str, Any]],
+                     now: float) -> Optional[float]:
+        """
+        When a waiting gang can expect its remaining nodes, or None if unknown
+
+        A node is expected free once its running jobs reach their predicted
+        runtimes, nodes of a running gang included; nodes running a job
+        without an estimate, nodes held by waiting gangs, and idle nodes
+        the gang cannot use, are not counted.
+        """
+        needed = reservation.size - len(reservation.node_ids)
+        ends: Dict[str, List[Optional[float]]] = {}
+        for running in self.running_jobs.values():
+            predicted = running.job.get('predicted_runtime')
+            end = running.started_at + predicted if predicted is not None else None
+            for node_id in running.node_ids:
+                ends.setdefault(node_id, []).append(end)
+        free_at = []
+        for node in nodes:
+            holder = self.gang_scheduler.reserved_nodes.get(node['id'])
+            if holder is not None and holder not in self.gang_scheduler.running:
+                continue
+            node_ends = ends.get(node['id'], [])
+            if not node_ends and not node_matches_job(node, reservation.job):
+                continue  # Idle yet unsuitable, so freeing up will not help
+            if None not in node_ends:
+                free_at.append(max(node_ends, default=now))
+        if needed <= 0 or len(free_at) < needed:
+            return None
+        return sorted(free_at)[needed - 1]
+
+    def _try_preempt_for(self, job: Dict[str, Any], nodes: List[Dict[str, Any]],
+                         gang_nodes: List[Dict[str, Any]] = ()) -> bool:
+        """
+        Evict the cheapest victim set for an urgent job that fits on no node
+
+        ``gang_nodes`` are held by running gangs: the job cannot go there,
+        but a gang on them may be evicted. Returns True when the job was
+        dispatched onto the freed node.
+        """
+        if not self.preemption_policy.can_preempt(job):
+            return False
+        if any(node_matches_job(node, job) for node in nodes):
+            return False
+
+        for running in self.running_jobs.values():
+            running.checkpoint_saved_at = self._checkpoint_saved_at(running)
+
+        plan = self.preemption_policy.select_victims(
+            job, list(nodes) + list(gang_nodes), list(self.running_jobs.values()), now=self.clock()
+        )
+        if plan is None:
+            return False
+
+        self._preempt(plan)
+        return self._send_jobs_to_node(plan.node_id, [job])
+
+    def _preempt(self, plan: PreemptionPlan):
+        """
+        Stop victims on a node and requeue them with their progress preserved
+
+        A gang victim is stopped on all of its nodes and requeued whole.
+        """
+        node = self.node_registry.get_node(plan.node_id)
+        for running in plan.victims:
+            victim = running.job
+            self.running_jobs.pop(victim['id'], None)
+            reservation = self.gang_scheduler.release(victim['id'])
+            if reservation is not None:
+                self._cancel_members(reservation, [n for n in reservation.node_ids if n != plan.node_id])
+                victim = reservation.job
+            try:
+                progress = node.preempt_job(victim['id']) or {}
+            except Exception as e:
+                self.logger.error(f"Failed to preempt job {victim['id']} on node {plan.node_id}: {e}")
+                progress = {}
+
+            # One rank's checkpoint cannot restart a whole gang
+            if progress.get('checkpoint') and reservation is None:
+                victim['checkpoint'] = progress['checkpoint']
+            victim['preemptions'] = victim.get('preemptions', 0) + 1
+            victim['status'] = 'QUEUED'
+            self.logger.info(
+                f"Preempted job {victim['id']} on node {plan.node_id} "
+                f"(checkpoint: {bool(progress.get('checkpoint'))})"
+            )
+            self._requeue(victim)
+
+    def _checkpoint_saved_at(self, running: RunningJob) -> Optional[float]:
+        """
+        Ask a node when a running job last wrote a checkpoint
+        """
+        try:
+            status = self.node_registry.get_node(running.node_id).checkpoint_status(running.job['id'])
+        except Exception:
+            return None
+        return status.get('saved_at') if status else None
+
+    def _launch_gang(self, reservation: GangReservation):
+        """
+        Start every member of a gang job, all or nothing
+        """
+        job = reservation.job
+        launched = []
+        for rank, node_id in enumerate(reservation.node_ids):
+            member = dict(
+                job,
+                gang_rank=rank,
+                gang_size=reservation.size,
+                gang_nodes=list(reservation.node_ids)
+            )
+            if not self._send_jobs_to_node(node_id, [member]):
+                self.logger.error(f"Gang job {job['id']} failed to launch on node {node_id}")
+                self._cancel_members(reservation, launched)
+                self.gang_scheduler.release(job['id'])
+                self.running_jobs.pop(job['id'], None)
+                self._requeue(job)
+                return
+            launched.append(node_id)
+
+        reservation.launched = True
+        self.logger.info(f"Gang job {job['id']} started on nodes {reservation.node_ids}")
+
+    def _cancel_members(self, reservation: GangReservation, node_ids: List[str]):
+        """
+        Stop gang members already running on the given nodes
+        """
+        for node_id in node_ids:
+            try:
+                self.node_registry.get_node(node_id).cancel_job(reservation.job['id'])
+            except Exception as e:
+                self.logger.error(f"Failed to cancel gang member on node {node_id}: {e}")
+
+    def _dependency_failed(self, job: Dict[str, Any]):
+        """
+        Record the outcome of a job the dependency graph failed before it ran
+        """
+        if self.recorder is not None:
+            self.recorder.record_finish(job['id'], job['status'])
+
+    def _requeue(self, job: Dict[str, Any]):
+        """
+        Put an undispatched job back on the queue
+        """
+        try:
+            self.job_queue.enqueue(job)
+        except Exception as e:
+            self.logger.error(f"Failed to requeue job {job.get('id')}: {e}")
+
+    def _send_jobs_to_node(self, node_id: str, jobs: List[Dict[str, Any]]) -> bool:
         """
         Send jobs to a specific node
         """
+        sent_at = time.monotonic()
+        for job in jobs:
+            end_span(job, 'placement', sent_at)
+            begin_span(job, 'dispatch', sent_at)
+
+        # A short job can finish before receive_jobs returns, so track it first
+        started_at = self.clock()
+        self._track_running(node_id, jobs, started_at)
         try:
-            # Placeholder for actual job dispatch mechanism
+            # Either an in-process NodeAgent or an AgentRPCClient; each call is one batch
             node = self.node_registry.get_node(node_id)
-            # In real implementation, this would use RPC or message queue
             node.receive_jobs(jobs)
         except Exception as e:
-            self.logger.error(f"Failed to send jobs to node {node_id}: {e}")
\ No newline at end of file
+            self.logger.error(f"Failed to send jobs to node {node_id}: {e}")
+            for job in jobs:
+                running = self.running_jobs.get(job['id'])
+                if running is not None and running.job is job:
+                    del self.running_jobs[job['id']]
+            return False
+
+        acked_at = time.monotonic()
+        for job in jobs:
+            end_span(job, 'dispatch', acked_at)  # Already closed by an in-process agent
+        if self.metrics is not None:
+            latency = acked_at - sent_at
+            for job in jobs:
+                self.metrics.record_dispatch_latency(job, node_id, latency)
+        self._record_dispatch_metrics(node_id, jobs, started_at)
+        return True
+
+    def _record_dispatch(self, node_id: str, jobs: List[Dict[str, Any]]):
+        """
+        Track jobs handed to a node and record their time to start
+        """
+        now = self.clock()
+        self._track_running(node_id, jobs, now)
+        self._record_dispatch_metrics(node_id, jobs, now)
+
+    def _track_running(self, node_id: str, jobs: List[Dict[str, Any]], started_at: float):
+        """
+        Track dispatched jobs; a gang is tracked once, through its rank 0
+        """
+        for job in jobs:
+            if job.get('gang_rank', 0) == 0:
+                self.running_jobs[job['id']] = RunningJob(job=job, node_id=node_id, started_at=started_at)
+
+    def _record_dispatch_metrics(self, node_id: str, jobs: List[Dict[str, Any]], now: float):
+        if self.metrics is None:
+            return
+        for job in jobs:
+            self.metrics.record_dispatch(job, node_id)
+            if job.get('gang_rank', 0) == 0:
+                self.metrics.record_time_to_start(job, now - job.get('submitted_at', now))
+            artifacts = job_artifacts(job)
+            if artifacts and self.artifact_registry is not None:
+                self.metrics.record_artifact_placement(
+                    self.artifact_registry.local_bytes(artifacts, node_id),
+                    sum(artifact.get('size', 0) for artifact in artifacts)
+                )
@@ -0,0 +1,62 @@
+import json
+from backend.performance.benchmarking import (
+    SchedulerBenchmark, SystemBenchmark, _md_worker, compare_to_baseline, import_profile, main
+)
+
+def test_cpu_benchmark_runs_in_a_process_pool():
+    result = SystemBenchmark.cpu_benchmark(duration=0.1)
+    assert result['total_primes_found'] > 0
+
+def test_compare_to_baseline_flags_only_slowdowns_beyond_tolerance():
+    baseline = {'results': {
+        'queue': {'100': {'enqueue_per_second': 1000.0, 'dequeue_per_second': 1000.0}},
+        'placement': {'10': {'per_job_us': 2.0}},
+        'api': {'latency_p50_ms': 1.0}
+    }}
+    report = {'results': {
+        'queue': {'100': {'enqueue_per_second': 700.0, 'dequeue_per_second': 5000.0}},
+        'placement': {'10': {'per_job_us': 2.2}},
+        'api': {'latency_p50_ms': 1.5},
+        'end_to_end': {'jobs_per_second': 1.0}  # Not in the baseline
+    }}
+    regressions = compare_to_baseline(report, baseline, tolerance=0.25)
+    assert [r['metric'] for r in regressions] == ['api.latency_p50_ms', 'queue.100.enqueue_per_second']
+
+def test_baseline_from_another_environment_is_only_compared_with_force(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({
+        'environment': {'python': '0.0', 'platform': 'elsewhere', 'cpu_count': 1},
+        'results': {'queue': {'DistributedJobQueue': {'100': {'enqueue_per_second': 1e12}}}}
+    }))
+    argv = ['--sections', 'queue', '--quick', '--repeats', '1',
+            '--baseline', str(baseline), '--output', str(tmp_path / 'report.json')]
+    assert main(argv) == 0
+    assert main(argv + ['--force']) == 1
+
+def test_quick_queue_benchmark_reports_every_depth():
+    results = SchedulerBenchmark(repeats=1, quick=True).queue_benchmark()
+    for queue in ('DistributedJobQueue', 'FairShareJobQueue'):
+        assert set(results[queue]) == {'100', '1000'}
+        assert results[queue]['100']['enqueue_per_second'] > 0
+
+def test_md_run_is_reproducible_and_drift_regressions_use_magnitude():
+    first, second = _md_worker(12, 4, seed=3), _md_worker(12, 4, seed=3)
+    assert first['energy_drift'] == second['energy_drift']
+    assert first['force_eval_ms'] > 0 and first['peak_rss_mb'] > 0
+
+    baseline = {'results': {'kernel': {'12x4': {'energy_drift': -0.001, 'peak_rss_mb': 40.0}}}}
+    steady = {'results': {'kernel': {'12x4': {'energy_drift': 0.0011, 'peak_rss_mb': 44.0}}}}
+    worse = {'results': {'kernel': {'12x4': {'energy_drift': 0.002, 'peak_rss_mb': 60.0}}}}
+    assert compare_to_baseline(steady, baseline, tolerance=0.25) == []
+    assert [r['metric'] for r in compare_to_baseline(worse, baseline, tolerance=0.25)] == [
+        'kernel.12x4.energy_drift', 'kernel.12x4.peak_rss_mb'
+    ]
+
+def test_startup_paths_do_not_import_heavy_optional_modules():
+    # numpy, asyncio and the HTTP client are only needed once a feature using them is enabled
+    for entry_point in ('backend.scheduler.scheduler', 'backend.node_agent.agent'):
+        modules = {name for name, _, _ in import_profile(entry_point)}
+        assert modules.isdisjoint({'numpy', 'asyncio', 'psutil', 'urllib.request', 'flask'}), entry_point
+    # Importing main loads only the config; components are imported as startup builds them
+    main_modules = {name for name, _, _ in import_profile('backend.main')}
+    assert {name for name in main_modules if name.startswith('backend.')} == {'backend.config', 'backend.main'}
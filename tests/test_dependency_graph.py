@@ -0,0 +1,76 @@
+import pytest
+from backend.scheduler.dag import DependencyGraph, BLOCKED, UPSTREAM_FAILED
+
+def test_job_released_when_last_parent_completes():
+    ready = []
+    graph = DependencyGraph(on_ready=ready.append)
+
+    assert graph.add_job({'id': 'md1'}) == 'QUEUED'
+    assert graph.add_job({'id': 'md2'}) == 'QUEUED'
+    assert graph.add_job({'id': 'analysis', 'depends_on': ['md1', 'md2']}) == BLOCKED
+
+    graph.mark_completed('md1')
+    assert [job['id'] for job in ready] == ['md1', 'md2']
+
+    graph.mark_completed('md2')
+    assert ready[-1]['id'] == 'analysis'
+    assert graph.get_waiting_jobs() == []
+
+    with pytest.raises(ValueError):
+        graph.add_job({'id': 'orphan', 'depends_on': ['missing']})
+
+def test_failure_cascades_to_all_descendants():
+    failed = []
+    graph = DependencyGraph(on_ready=lambda job: None, on_failed=failed.append)
+
+    graph.add_job({'id': 'root'})
+    graph.add_job({'id': 'a', 'depends_on': ['root']})
+    graph.add_job({'id': 'b', 'depends_on': ['a']})
+    graph.add_job({'id': 'c', 'depends_on': ['b', 'root']})
+
+    assert sorted(graph.mark_failed('root')) == ['a', 'b', 'c']
+    assert graph.get_job('c')['status'] == UPSTREAM_FAILED
+    assert graph.add_job({'id': 'late', 'depends_on': ['b']}) == UPSTREAM_FAILED
+    assert len(failed) == 4
+
+def test_child_the_queue_refuses_fails_with_its_dependents():
+    failed = []
+
+    def on_ready(job):
+        if job['id'] == 'child':
+            raise Exception("Job queue is full")
+
+    graph = DependencyGraph(on_ready=on_ready, on_failed=failed.append)
+    graph.add_job({'id': 'parent'})
+    graph.add_job({'id': 'child', 'depends_on': ['parent']})
+    graph.add_job({'id': 'grandchild', 'depends_on': ['child']})
+
+    graph.mark_completed('parent')
+    assert sorted(job['id'] for job in failed) == ['child', 'grandchild']
+    assert 'child' not in graph.released
+    assert graph.get_waiting_jobs() == []
+
+def test_only_recent_outcomes_are_kept():
+    graph = DependencyGraph(on_ready=lambda job: None, max_outcomes=3)
+    for i in range(10):
+        graph.add_job({'id': f'job{i}'})
+        graph.mark_completed(f'job{i}')
+
+    assert list(graph.outcomes) == ['job7', 'job8', 'job9']
+    assert not graph.released
+    assert graph.add_job({'id': 'recent', 'depends_on': ['job9']}) == 'QUEUED'
+    with pytest.raises(ValueError):
+        graph.add_job({'id': 'stale', 'depends_on': ['job0']})
+
+def test_wide_fan_in_is_released_without_rescanning():
+    ready = []
+    graph = DependencyGraph(on_ready=ready.append)
+
+    parents = [f'p{i}' for i in range(100000)]
+    for parent in parents:
+        graph.add_job({'id': parent})
+    graph.add_job({'id': 'reduce', 'depends_on': parents})
+
+    for parent in parents:
+        graph.mark_completed(parent)
+    assert ready[-1]['id'] == 'reduce'
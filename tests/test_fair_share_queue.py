@@ -0,0 +1,64 @@
+import pytest
+from backend.job_submission.fair_share_queue import FairShareJobQueue
+from backend.performance.metrics import PerformanceMetrics
+
+def test_fair_share_interleaves_owners():
+    metrics = PerformanceMetrics()
+    queue = FairShareJobQueue(max_size=100, metrics=metrics)
+
+    # One owner floods the queue before another submits a single job
+    for i in range(20):
+        queue.enqueue({'id': f'a{i}', 'owner': 'team-a', 'priority': 1, 'submitted_at': i})
+    queue.enqueue({'id': 'b0', 'owner': 'team-b', 'priority': 1, 'submitted_at': 100})
+
+    dispatched = [queue.dequeue()['id'] for _ in range(3)]
+    assert 'b0' in dispatched
+
+    summary = metrics.get_performance_summary()
+    assert set(summary['owner_wait_times']) == {'team-a', 'team-b'}
+
+def test_fair_share_respects_weights_and_usage():
+    queue = FairShareJobQueue(max_size=100, weights={'heavy': 3.0})
+    for i in range(8):
+        queue.enqueue({'id': f'h{i}', 'owner': 'heavy', 'submitted_at': i})
+        queue.enqueue({'id': f'l{i}', 'owner': 'light', 'submitted_at': i})
+
+    first_eight = [queue.dequeue()['owner'] for _ in range(8)]
+    assert first_eight.count('heavy') == 6
+
+    # Historical usage pushes an owner behind
+    queue.record_usage('heavy', 1000.0)
+    assert queue.dequeue()['owner'] == 'light'
+
+    assert queue.cancel_job('l7')
+    assert queue.get_job('l7') is None
+    remaining = []
+    while True:
+        job = queue.dequeue()
+        if job is None:
+            break
+        remaining.append(job['id'])
+    assert 'l7' not in remaining and len(remaining) == 6
+
+def test_fair_share_reclaims_cancelled_entries_and_empty_owners():
+    queue = FairShareJobQueue(max_size=100)
+    for i in range(10):
+        queue.enqueue({'id': f'a{i}', 'owner': 'team-a', 'submitted_at': i})
+    queue.enqueue({'id': 'b0', 'owner': 'team-b', 'submitted_at': 0})
+
+    for i in range(6):
+        assert queue.cancel_job(f'a{i}')
+    # Compacted as soon as cancelled entries outnumbered live ones
+    assert len(queue._sub_queues['team-a']) == 4
+
+    assert queue.cancel_job('b0')
+    assert 'team-b' not in queue._sub_queues and 'team-b' not in queue._owner_entries
+
+    remaining = []
+    while True:
+        job = queue.dequeue()
+        if job is None:
+            break
+        remaining.append(job['id'])
+    assert remaining == ['a6', 'a7', 'a8', 'a9']
+    assert queue._sub_queues == {} and queue._owner_entries == {}
@@ -0,0 +1,216 @@
+import time
+from backend.fault_tolerance.heartbeat import HeartbeatMonitor
+
+class MockNode:
+    def __init__(self, registry, node_id):
+        self.registry = registry
+        self.node_id = node_id
+
+    def receive_jobs(self, jobs):
+        self.registry.sends.append((self.node_id, [job['id'] for job in jobs]))
+
+class MockNodeRegistry:
+    def __init__(self, nodes=(), node_jobs=None):
+        self.nodes = list(nodes)
+        self.node_jobs = node_jobs or {}
+        self.inactive = []
+        self.sends = []
+
+    def get_active_nodes(self):
+        return [node for node in self.nodes if node['id'] not in self.inactive]
+
+    def get_node(self, node_id):
+        return MockNode(self, node_id)
+
+    def mark_node_inactive(self, node_id):
+        self.inactive.append(node_id)
+
+    def get_node_jobs(self, node_id):
+        return self.node_jobs.get(node_id, [])
+
+def test_only_silent_nodes_expire():
+    clock = [0.0]
+    registry = MockNodeRegistry()
+    monitor = HeartbeatMonitor(registry, check_interval=1, max_missed_heartbeats=3, clock=lambda: clock[0])
+
+    for node_id in ('a', 'b', 'c'):
+        monitor.record_heartbeat(node_id, load=0.5, resources={'cpu': 8})
+    clock[0] = 2.0
+    monitor.record_heartbeat('a')
+    monitor.record_heartbeat('b')
+
+    assert monitor.check_deadlines(now=2.9) == []
+    assert monitor.check_deadlines(now=3.0) == ['c']
+    assert monitor.check_deadlines(now=4.9) == []
+    # One re-armed heap entry per live node, nothing for the failed one
+    assert len(monitor.deadlines) == 2
+    assert sorted(monitor.check_deadlines(now=5.0)) == ['a', 'b']
+    assert registry.inactive == ['c', 'a', 'b']
+    assert monitor.node_health['a']['resources'] == {'cpu': 8}
+
+    # A failed node that reports in is monitored again
+    monitor.record_heartbeat('c', timestamp=6.0)
+    assert monitor.node_health['c']['status'] == 'HEALTHY'
+    assert monitor.check_deadlines(now=9.0) == ['c']
+
+def test_monitor_thread_sleeps_until_deadline_with_many_nodes():
+    registry = MockNodeRegistry()
+    monitor = HeartbeatMonitor(registry, check_interval=0.25, max_missed_heartbeats=2)
+    live = [f'node{i}' for i in range(10000)]
+    silent = ['silent0', 'silent1']
+
+    for node_id in live + silent:
+        monitor.record_heartbeat(node_id, load=0.1)
+    monitor.start_monitoring()
+
+    start = time.monotonic()
+    while time.monotonic() - start < 1.0:
+        beat_started = time.monotonic()
+        for node_id in live:
+            monitor.record_heartbeat(node_id, load=0.1)
+        # 10k heartbeats take a small fraction of a heartbeat interval
+        assert time.monotonic() - beat_started < 0.2
+        time.sleep(0.1)
+
+    monitor.stop_monitoring()
+    assert sorted(registry.inactive) == silent
+
+def test_phi_accrual_adapts_to_jitter(tmp_path):
+    from backend.fault_tolerance.phi_accrual import (
+        PhiAccrualDetector, FixedTimeoutDetector, load_heartbeat_trace, replay_heartbeat_trace
+    )
+
+    # 'steady' beats every second and dies at t=60; 'spiky' stalls 2.5s every 10th beat
+    rows, t = [], 0.0
+    for i in range(60):
+        rows.append(f"{i:.1f},steady")
+        rows.append(f"{t:.1f},spiky")
+        t += 3.5 if i % 10 == 9 else 1.0
+    rows.append("59.5,steady,failed")
+    trace = tmp_path / 'heartbeats.csv'
+    trace.write_text("timestamp,node_id,event\n" + "\n".join(rows) + "\n")
+    heartbeats, failures = load_heartbeat_trace(str(trace))
+
+    fixed = replay_heartbeat_trace(heartbeats, failures, FixedTimeoutDetector(3.0))
+    phi = replay_heartbeat_trace(heartbeats, failures, PhiAccrualDetector(threshold=8))
+
+    assert fixed['false_positives'] == 5
+    assert phi['false_positives'] < fixed['false_positives']
+    assert phi['detection_latency']['max'] < fixed['detection_latency']['max']
+
+    detector = PhiAccrualDetector(threshold=8, capacity=1)
+    for i in range(10):
+        detector.heartbeat('a', float(i))
+        detector.heartbeat('b', i * 2.0)
+    assert abs(detector.phi('a', detector.deadline('a')) - 8) < 1e-6
+    assert detector.phi('a', 9.5) < 1 < detector.phi('a', 12)
+
+def test_removed_node_row_is_reused_without_touching_live_nodes():
+    from backend.fault_tolerance.phi_accrual import PhiAccrualDetector
+
+    detector = PhiAccrualDetector(threshold=8, min_samples=1, capacity=2)
+    for i in range(5):
+        detector.heartbeat('a', float(i))
+        detector.heartbeat('b', i * 2.0)
+    detector.remove('a')
+    detector.heartbeat('c', 100.0)
+    detector.heartbeat('c', 103.0)
+
+    assert len(detector.counts) == 2
+    assert detector.statistics('b') == (2.0, 0.1)
+    assert detector.statistics('c') == (3.0, 0.1)
+    assert detector.deadline('b') < detector.deadline('c')
+
+def test_deregistered_node_is_dropped_from_monitor_and_detector():
+    from backend.fault_tolerance.phi_accrual import PhiAccrualDetector
+
+    detector = PhiAccrualDetector(threshold=8)
+    monitor = HeartbeatMonitor(MockNodeRegistry(), check_interval=1,
+                               failure_detector=detector, clock=lambda: 0.0)
+    for i in range(5):
+        monitor.record_heartbeat('gone', timestamp=float(i))
+        monitor.record_heartbeat('kept', timestamp=float(i))
+    monitor.remove_node('gone')
+
+    assert list(detector.slots) == ['kept'] and detector.free_slots == [0]
+    assert [node_id for _, node_id in monitor.deadlines] == ['kept']
+    assert monitor.check_deadlines(now=1000.0) == ['kept']
+
+def test_monitor_uses_detector_deadlines():
+    from backend.fault_tolerance.phi_accrual import PhiAccrualDetector
+
+    registry = MockNodeRegistry()
+    monitor = HeartbeatMonitor(registry, check_interval=1,
+                               failure_detector=PhiAccrualDetector(threshold=8), clock=lambda: 0.0)
+    for i in range(20):
+        monitor.record_heartbeat('steady', timestamp=float(i))
+    assert monitor.check_deadlines(now=20.0) == []
+    assert monitor.check_deadlines(now=21.0) == ['steady']
+
+def test_failed_node_jobs_are_spread_in_rate_limited_batches():
+    clock = [0.0]
+    nodes = [
+        {'id': 'dead', 'current_load': 0.0, 'available_cpu': 8, 'available_memory': 64},
+        {'id': 'big', 'current_load': 0.0, 'available_cpu': 16, 'available_memory': 64},
+        {'id': 'small', 'current_load': 0.0, 'available_cpu': 4, 'available_memory': 64},
+        {'id': 'busy', 'current_load': 0.0, 'available_cpu': 16, 'available_memory': 64},
+    ]
+    orphans = [{'id': f'job{i}', 'resources': {'cpu_cores': 2}} for i in range(12)]
+    orphans.append({'id': 'huge', 'resources': {'cpu_cores': 32}})
+    registry = MockNodeRegistry(nodes, {'dead': orphans})
+    requeued = []
+    monitor = HeartbeatMonitor(registry, check_interval=1, max_missed_heartbeats=3,
+                               clock=lambda: clock[0], requeue_job=requeued.append,
+                               redistribution_rate=2, redistribution_burst=10)
+
+    monitor.record_heartbeat('dead')
+    monitor.record_heartbeat('big', load=0.1)
+    monitor.record_heartbeat('small', load=0.1)
+    monitor.record_heartbeat('busy', load=0.9)
+    clock[0] = 2.9
+    for node_id in ('big', 'small', 'busy'):
+        monitor.record_heartbeat(node_id)
+
+    assert monitor.check_deadlines(now=3.0) == ['dead']
+    # One send per target node; the burst is spent and the rest waits
+    first_round = dict(registry.sends)
+    assert len(registry.sends) == len(first_round)
+    assert sum(len(jobs) for jobs in first_round.values()) == 10
+    assert len(first_round['small']) == 2  # Capacity-bound
+    assert len(first_round['big']) > len(first_round.get('busy', []))
+    assert len(monitor.orphaned_jobs) == 3
+
+    clock[0] = 4.5  # Three more tokens
+    monitor.redistribute_orphaned_jobs()
+    assert sum(len(jobs) for _, jobs in registry.sends) == 12
+    assert [job['id'] for job in requeued] == ['huge']
+    assert not monitor.orphaned_jobs
+
+def test_redistribution_remembers_capacity_across_batches_and_keeps_unplaced_jobs():
+    clock = [0.0]
+    nodes = [
+        {'id': 'dead', 'current_load': 0.0, 'available_cpu': 8, 'available_memory': 64},
+        {'id': 'only', 'current_load': 0.0, 'available_cpu': 4, 'available_memory': 64},
+    ]
+    orphans = [{'id': f'job{i}', 'resources': {'cpu_cores': 2}} for i in range(3)]
+    registry = MockNodeRegistry(nodes, {'dead': orphans})
+    monitor = HeartbeatMonitor(registry, check_interval=1, max_missed_heartbeats=3,
+                               clock=lambda: clock[0], redistribution_rate=1, redistribution_burst=2)
+    monitor.record_heartbeat('dead')
+    clock[0] = 2.9
+    monitor.record_heartbeat('only')
+
+    assert monitor.check_deadlines(now=3.0) == ['dead']
+    assert registry.sends == [('only', ['job0', 'job1'])]
+
+    # The next batch sees the node already full instead of its last report
+    clock[0] = 4.0
+    assert monitor.redistribute_orphaned_jobs() == {}
+    assert [job['id'] for job in monitor.orphaned_jobs] == ['job2']
+    assert monitor._next_redistribution_at() == 5.0
+
+    # Once the node reports in with room again, the kept job is placed
+    clock[0] = 5.0
+    monitor.record_heartbeat('only')
+    assert monitor.redistribute_orphaned_jobs() == {'only': [orphans[2]]}
+    assert not monitor.orphaned_jobs
@@ -14,4 +14,146 @@ def test_job_queue_enqueue_and_dequeue():
     
     # Test dequeue
     dequeued_job = queue.dequeue()
-    assert dequeued_job == job
\ No newline at end of file
+    assert dequeued_job == job
+
+def test_job_array_expands_lazily_and_aggregates_status():
+    from backend.job_submission.job_array import JobArray
+
+    queue = DistributedJobQueue(max_size=10)
+    template = {
+        'id': 'sweep', 'command': 'md', 'type': 'molecular_dynamics', 'priority': 1,
+        'simulation_parameters': {'num_particles': 100, 'simulation_steps': 10}
+    }
+    overrides = {1: {'simulation_parameters': {'num_particles': 200}}}
+    queue.enqueue_array(JobArray(template, 0, 9999, overrides))
+
+    # One queue slot and one listing row for the whole sweep
+    assert queue.queue.qsize() == 1
+    assert len(queue.get_all_jobs()) == 1
+
+    first, second = queue.dequeue(), queue.dequeue()
+    assert first['id'] == 'sweep_0'
+    assert second['simulation_parameters'] == {'num_particles': 200, 'simulation_steps': 10}
+
+    assert queue.cancel_job('sweep_2')
+    assert queue.dequeue()['id'] == 'sweep_3'
+
+    queue.update_job_status('sweep_0', 'COMPLETED')
+    summary = queue.get_job('sweep')
+    assert summary['task_counts']['COMPLETED'] == 1
+    assert summary['task_counts']['CANCELLED'] == 1
+    assert summary['task_counts']['QUEUED'] == 9996
+
+def test_oversized_arrays_are_rejected_and_finished_arrays_evicted():
+    from backend.job_submission.api import JobSubmissionAPI
+    from backend.job_submission.job_array import JobArray, JobArrayStore
+
+    queue = DistributedJobQueue(max_size=10)
+    client = JobSubmissionAPI(queue, max_array_size=100).app.test_client()
+    response = client.post('/jobs', json={'command': 'md', 'type': 'compute', 'array': {'size': 10 ** 10}})
+    assert response.status_code == 400
+    assert queue.queue.qsize() == 0
+    assert client.post('/jobs', json={'command': 'md', 'type': 'compute',
+                                      'array': {'size': 100}}).status_code == 201
+
+    store = JobArrayStore(max_finished=2)
+    for i in range(4):
+        store.add(JobArray({'id': f'a{i}'}, 0, 1))
+    for i in (0, 1, 2):
+        store.update_status(f'a{i}_0', 'COMPLETED')
+        store.update_status(f'a{i}_1', 'FAILED')
+    store.cancel('a3_0')
+    assert sorted(store.arrays) == ['a1', 'a2', 'a3']
+    assert store.get_job('a0') is None and store.get_job('a2')['status'] == 'FAILED'
+
+def test_api_queues_compact_records_and_returns_plain_json():
+    import pickle
+    from backend.job_submission.api import JobSubmissionAPI
+    from backend.job_submission.job_record import JobRecord, JobStatus
+    from backend.rpc.protocol import job_from_message, job_to_message
+
+    queue = DistributedJobQueue(max_size=10)
+    client = JobSubmissionAPI(queue).app.test_client()
+    job_id = client.post('/jobs', json={
+        'command': 'run.sh', 'type': 'molecular_dynamics', 'priority': 1,
+        'resources': {'cpu_cores': 4, 'memory_gb': 8.0},
+        'simulation_parameters': {'num_particles': 100}
+    }).get_json()['job_id']
+
+    record = queue.get_job(job_id)
+    assert isinstance(record, JobRecord) and not hasattr(record, '__dict__')
+    assert record.status is JobStatus.QUEUED and record['status'] == 'QUEUED'
+    assert record.get('resources', {}).get('cpu_cores') == 4 and record.get('nodes', 1) == 1
+    assert record.extra == {'simulation_parameters': {'num_particles': 100}}
+
+    as_json = client.get(f'/jobs/{job_id}').get_json()
+    assert as_json['resources'] == {'cpu_cores': 4, 'memory_gb': 8.0}
+    assert as_json['simulation_parameters'] == {'num_particles': 100}
+
+    # Workers and remote agents see the same fields
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert job_from_message(job_to_message(record)) == record
+
+    record['status'] = 'RUNNING'
+    record['checkpoint_path'] = '/tmp/ckpt.npz'
+    del record['simulation_parameters']
+    assert dict(record) == {
+        'id': job_id, 'type': 'molecular_dynamics', 'priority': 1, 'submitted_at': record['submitted_at'],
+        'command': 'run.sh', 'status': 'RUNNING', 'resources': {'cpu_cores': 4, 'memory_gb': 8.0},
+        'checkpoint_path': '/tmp/ckpt.npz'
+    }
+    assert queue.dequeue() is record
+
+def test_api_ignores_server_owned_fields_in_submissions():
+    from backend.job_submission.api import JobSubmissionAPI
+
+    queue = DistributedJobQueue()
+    client = JobSubmissionAPI(queue).app.test_client()
+    job_id = client.post('/jobs', json={
+        'command': 'run', 'type': 'compute', 'id': 'chosen', 'status': 'COMPLETED',
+        'submitted_at': 0, 'artifact_cache': '/etc', 'trace': {'spans': []},
+        'checkpoint_path': '/etc/passwd', 'checkpoint': {'path': '/root/.ssh/authorized_keys'}
+    }).get_json()['job_id']
+
+    record = queue.get_job(job_id)
+    assert job_id != 'chosen' and record['status'] == 'QUEUED' and record['submitted_at'] > 0
+    assert 'artifact_cache' not in record and 'trace' not in record
+    assert 'checkpoint_path' not in record and 'checkpoint' not in record
+
+def test_api_accepts_only_sha256_artifacts_from_enabled_schemes():
+    from backend.job_submission.api import JobSubmissionAPI
+
+    client = JobSubmissionAPI(DistributedJobQueue(), artifact_source_schemes=('https',)).app.test_client()
+    digest = 'sha256:' + 'ab' * 32
+
+    def submit(artifact):
+        return client.post('/jobs', json={'command': 'run', 'type': 'compute', 'artifacts': [artifact]}).status_code
+
+    assert submit({'digest': digest, 'source': 'https://data.example/traj.bin', 'size': 10}) == 201
+    assert submit({'digest': 'sha256:../../etc/cron.d/x', 'source': 'https://data.example/x'}) == 400
+    assert submit({'digest': digest.upper(), 'source': 'https://data.example/x'}) == 400
+    assert submit({'digest': digest, 'source': '/etc/shadow'}) == 400
+    assert submit({'digest': digest, 'source': 'ftp://data.example/x'}) == 400
+    assert submit({'digest': digest, 'source': 'https://data.example/x', 'size': 'big'}) == 400
+
+    def restart(restart_from, artifacts):
+        return client.post('/jobs', json={
+            'command': 'md', 'type': 'molecular_dynamics', 'artifacts': artifacts,
+            'simulation_parameters': {'restart_from': restart_from}
+        }).status_code
+
+    checkpoint = {'digest': digest, 'source': 'https://data.example/ckpt.npz'}
+    assert restart(digest, [checkpoint]) == 201
+    assert restart('sha256:' + 'cd' * 32, [checkpoint]) == 400
+    assert restart(digest, []) == 400
+
+def test_api_rejects_invalid_gang_sizes():
+    from backend.job_submission.api import JobSubmissionAPI
+
+    client = JobSubmissionAPI(DistributedJobQueue()).app.test_client()
+
+    def submit(nodes):
+        return client.post('/jobs', json={'command': 'run', 'type': 'compute', 'nodes': nodes}).status_code
+
+    assert submit(2) == 201
+    assert [submit(nodes) for nodes in ('2', 0, 1.5, True, None)] == [400] * 5
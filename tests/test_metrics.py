@@ -0,0 +1,95 @@
+import threading
+import numpy as np
+from backend.job_submission.api import JobSubmissionAPI
+from backend.job_submission.job_queue import DistributedJobQueue
+from backend.performance.counters import ShardedCounter
+from backend.performance.histogram import DDSketch, WindowedSketch
+from backend.performance.metrics import PerformanceMetrics
+
+def test_sketch_quantiles_within_relative_accuracy_and_merge():
+    values = np.random.default_rng(0).lognormal(0, 2, 50000)
+    halves = DDSketch(), DDSketch()
+    for i, value in enumerate(values.tolist()):
+        halves[i % 2].add(value)
+
+    merged = DDSketch()
+    for sketch in halves:
+        merged.merge(sketch)
+    assert merged.count == len(values)
+    for q in (0.5, 0.95, 0.99):
+        assert abs(merged.quantile(q) / np.quantile(values, q) - 1) < 0.02
+    assert len(merged.buckets) < 2048
+
+def test_sliding_window_forgets_old_samples():
+    sketch = WindowedSketch(window=60, slots=6)
+    for t in range(100):
+        sketch.add(100.0, now=float(t))
+    for t in range(100, 160):
+        sketch.add(1.0, now=float(t))
+
+    assert sketch.windowed(now=159.0).quantile(0.99) == 1.0
+    assert sketch.total.count == 160
+    assert len(sketch.slots) <= 6
+
+def test_latency_summary_by_job_type_and_node():
+    metrics = PerformanceMetrics()
+    for i in range(100):
+        metrics.record_job_completion({
+            'type': 'md' if i % 2 else 'compute',
+            'node_id': f'node{i % 4}',
+            'submitted_at': 0.0,
+            'start_time': float(i),
+            'end_time': float(i) + 10.0
+        })
+    metrics.record_dispatch_latency({'type': 'md'}, 'node0', 0.002)
+
+    summary = metrics.get_performance_summary()
+    assert summary['queue_metrics']['average_wait_time'] == 49.5
+    waits = summary['latency']['wait_time']
+    assert waits['overall']['count'] == 100
+    assert set(waits['by_job_type']) == {'md', 'compute'}
+    assert set(waits['by_node']) == {'node0', 'node1', 'node2', 'node3'}
+    assert abs(waits['overall']['p95'] - 94) < 1.5
+    assert summary['latency']['run_time']['overall']['p50'] == 10.0
+    assert summary['latency']['dispatch_latency']['by_node']['node0']['count'] == 1
+
+def test_sharded_counter_sums_threads_including_exited_ones():
+    counter = ShardedCounter('events', 'Events', ('kind',))
+
+    def bump():
+        for i in range(10000):
+            counter.inc(labels=('a' if i % 2 else 'b',))
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(5, labels=('a',))
+
+    # Exited threads were folded away without waiting for a scrape
+    assert len(counter._shards) == 1
+    assert counter.values() == {('a',): 40005, ('b',): 40000}
+    assert counter.total() == 80005
+
+def test_metrics_endpoint_renders_prometheus_text():
+    metrics = PerformanceMetrics()
+    queue = DistributedJobQueue(metrics=metrics)
+    metrics.queue_length.set_function(lambda: len(queue.jobs))
+    queue.enqueue({'id': 'job1', 'type': 'compute', 'priority': 1})
+    metrics.record_dispatch({'id': 'job0'}, 'node"1')
+    metrics.record_job_completion({'type': 'md', 'node_id': 'node1', 'start_time': 1.0, 'end_time': 3.0})
+
+    client = JobSubmissionAPI(queue, metrics=metrics).app.test_client()
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    lines = response.get_data(as_text=True).splitlines()
+    assert '# TYPE scheduler_jobs_enqueued_total counter' in lines
+    assert '# HELP scheduler_jobs_enqueued_total Jobs added to the queue' in lines
+    assert 'scheduler_jobs_enqueued_total{job_type="compute"} 1' in lines
+    assert 'scheduler_jobs_dispatched_total{node="node\\"1"} 1' in lines
+    assert 'scheduler_queue_length 1' in lines
+    assert 'scheduler_run_time_seconds{job_type="md",node="node1",quantile="0.5"} 2.0' in lines
+    assert 'scheduler_run_time_seconds_count{job_type="md",node="node1"} 1' in lines
+    assert JobSubmissionAPI(queue).app.test_client().get('/metrics').status_code == 404
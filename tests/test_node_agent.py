@@ -1,5 +1,19 @@
 import pytest
+import threading
+import time
+import os
+import json
+import subprocess
+import sys
+import numpy as np
 from backend.node_agent.agent import NodeAgent
+from backend.node_agent.artifact_cache import ArtifactCache, artifact_path, hash_file
+from backend.node_agent.molecular_dynamics import run_molecular_dynamics_job
+from backend.node_agent.worker_pool import WorkerPool, get_worker_context, preload_modules
+
+def loaded_modules(names):
+    import sys
+    return [name for name in names if name in sys.modules]
 
 def test_job_execution():
     agent = NodeAgent(max_workers=2)
@@ -13,4 +27,338 @@ def test_job_execution():
     result = agent.execute_job(test_job)
     
     assert result['job_id'] == 'test_job_1'
-    assert result['status'] in ['RUNNING', 'COMPLETED']
\ No newline at end of file
+    assert result['status'] in ['RUNNING', 'COMPLETED']
+    agent.shutdown()
+
+def test_submit_job_is_non_blocking_and_fires_callbacks():
+    completed, failed = [], []
+    done = threading.Event()
+
+    def on_complete(job, result):
+        completed.append(job['id'])
+        if len(completed) + len(failed) == 3:
+            done.set()
+
+    def on_failure(job, error):
+        failed.append((job['id'], type(error).__name__))
+        if len(completed) + len(failed) == 3:
+            done.set()
+
+    agent = NodeAgent(max_workers=3, on_job_complete=on_complete, on_job_failure=on_failure)
+    start = time.monotonic()
+    futures = agent.receive_jobs([
+        {'id': 'a', 'type': 'compute', 'duration': 0.5},
+        {'id': 'b', 'type': 'compute', 'duration': 0.5},
+        {'id': 'stuck', 'type': 'compute', 'duration': 60, 'timeout': 0.5}
+    ])
+    assert time.monotonic() - start < 0.5
+    assert len(futures) == 3
+
+    assert done.wait(10)
+    assert sorted(completed) == ['a', 'b']
+    assert failed == [('stuck', 'JobTimeoutError')]
+    # All three ran side by side rather than one after another
+    assert time.monotonic() - start < 1.4
+    assert agent.active_jobs == {}
+
+    # The terminated worker was replaced and the pool still runs jobs
+    assert agent.execute_job({'id': 'after', 'type': 'compute', 'duration': 0})['status'] == 'COMPLETED'
+    agent.shutdown()
+
+def test_cancel_running_job_terminates_worker():
+    agent = NodeAgent(max_workers=1)
+    future = agent.submit_job({'id': 'long', 'type': 'compute', 'duration': 60})
+    time.sleep(0.2)
+
+    assert agent.cancel_job('long')
+    with pytest.raises(Exception):
+        future.result(timeout=5)
+    assert 'long' not in agent.active_jobs
+    agent.shutdown()
+
+def test_molecular_dynamics_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / 'md.npz')
+    job = {
+        'id': 'md_job',
+        'checkpoint_path': checkpoint_path,
+        'stop_path': str(tmp_path / 'md.stop'),
+        'simulation_parameters': {
+            'num_particles': 4,
+            'simulation_steps': 6,
+            'checkpoint_interval': 2
+        }
+    }
+
+    first = run_molecular_dynamics_job(dict(job, simulation_parameters=dict(
+        job['simulation_parameters'], simulation_steps=4)))
+    assert first['status'] == 'COMPLETED'
+
+    # A stop request halts the run before it makes more progress
+    (tmp_path / 'md.stop').touch()
+    stopped = run_molecular_dynamics_job(job)
+    assert stopped['status'] == 'PREEMPTED'
+    assert stopped['simulation_result']['stopped_at_step'] == 4
+
+    (tmp_path / 'md.stop').unlink()
+    resumed = run_molecular_dynamics_job(job)
+    assert resumed['status'] == 'COMPLETED'
+    assert len(resumed['simulation_result']['total_energy']) == 6
+    assert len(resumed['simulation_result']['final_particle_states']) == 4
+
+
+def test_restart_from_artifact_needs_a_cache_and_a_known_digest():
+    digest = 'sha256:' + 'ab' * 32
+    job = {'id': 'md', 'simulation_parameters': {'num_particles': 4, 'simulation_steps': 1,
+                                                  'restart_from': digest}}
+    with pytest.raises(ValueError, match='no artifact cache'):
+        run_molecular_dynamics_job(job)
+    with pytest.raises(ValueError, match="not one of the job's artifacts"):
+        run_molecular_dynamics_job(dict(job, artifact_paths={}))
+
+
+def test_large_results_come_back_through_shared_memory():
+    blocks_before = set(os.listdir('/dev/shm'))
+    completed = []
+    agent = NodeAgent(max_workers=1, shared_result_min_bytes=64,
+                      on_job_complete=lambda job, result: completed.append(result))
+    job = {
+        'id': 'md', 'type': 'molecular_dynamics',
+        'simulation_parameters': {'num_particles': 4, 'simulation_steps': 3}
+    }
+    result = agent.execute_job(job)['result']['simulation_result']
+    agent.shutdown()
+    # The threshold travels with the call, not on the user's job
+    assert 'shared_result_min_bytes' not in job
+
+    # The result keeps the schema the simulation returns
+    states = result['final_particle_states']
+    assert len(states) == 4
+    assert all(set(state) == {'position', 'velocity', 'mass', 'charge'} for state in states)
+    assert all(isinstance(state['position'], list) and len(state['position']) == 3 for state in states)
+    assert all(1 <= state['mass'] <= 2 for state in states)
+    assert isinstance(result['total_energy'], list) and len(result['total_energy']) == 3
+    assert completed[0]['simulation_result'] == result
+    # Blocks are unlinked on arrival, so nothing is left behind in /dev/shm
+    assert set(os.listdir('/dev/shm')) <= blocks_before
+
+
+def test_shared_results_round_trip_exactly():
+    from backend.node_agent.shared_results import SharedArray, SharedRecords, _MappedBlock, attach_arrays, share_arrays
+    result = {
+        'series': [0.5 * i for i in range(16)],
+        'states': [{'position': [float(i), 1.0, 2.0], 'mass': 1.5, 'charge': -1.0} for i in range(8)],
+        'counts': list(range(16)),
+        'short': [1.0],
+        'array': np.arange(16, dtype=np.float64)
+    }
+    shared = share_arrays(result, 64)
+    assert isinstance(shared['series'], SharedArray)
+    assert isinstance(shared['states'], SharedRecords)
+    assert shared['counts'] == result['counts'] and shared['short'] == [1.0]
+
+    attached = attach_arrays(shared)
+    assert isinstance(attached['array'].base, _MappedBlock)
+    assert (attached.pop('array') == result.pop('array')).all()
+    assert attached == result
+
+
+def share_and_hang(min_bytes):
+    from backend.node_agent.shared_results import share_arrays
+    share_arrays([float(i) for i in range(64)], min_bytes)
+    time.sleep(60)
+
+
+def test_killed_worker_leaves_no_shared_blocks():
+    from backend.node_agent.shared_results import BLOCK_PREFIX, release_worker_blocks
+    pool = WorkerPool(processes=1, on_worker_exit=release_worker_blocks)
+    pool.submit('hang', share_and_hang, (64,))
+    prefix = f"{BLOCK_PREFIX}{pool.worker_pids()['hang']}_"
+
+    def worker_blocks():
+        return [name for name in os.listdir('/dev/shm') if name.startswith(prefix)]
+
+    deadline = time.monotonic() + 30
+    while not worker_blocks() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(worker_blocks()) == 1
+    assert pool.cancel('hang')
+    assert worker_blocks() == []
+    pool.shutdown()
+
+
+PRELOAD_PROBE = """
+import json
+from backend.node_agent.worker_pool import WorkerPool, get_worker_context
+modules = {'numpy', 'backend.node_agent.molecular_dynamics'}
+pool = WorkerPool(processes=1, context=get_worker_context('forkserver', tuple(modules)))
+probe = "sorted(%r & __import__('sys').modules.keys())" % modules
+print(json.dumps(pool.submit('probe', eval, (probe,)).result(timeout=30)))
+pool.shutdown()
+"""
+
+def test_forkserver_preloads_modules_before_workers_run():
+    # A fresh interpreter, so the fork server is started with this preload
+    # list; no initializer runs and the probe itself imports nothing
+    output = subprocess.run(
+        [sys.executable, '-c', PRELOAD_PROBE], capture_output=True, text=True, timeout=120,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert json.loads(output.stdout) == ['backend.node_agent.molecular_dynamics', 'numpy']
+
+def test_worker_initializer_imports_modules():
+    pool = WorkerPool(
+        processes=1,
+        context=get_worker_context('spawn'),
+        initializer=preload_modules,
+        initargs=(('xml.dom.minidom',),)
+    )
+    assert pool.submit('probe', loaded_modules, (['xml.dom.minidom'],)).result(timeout=30) == ['xml.dom.minidom']
+    pool.shutdown()
+
+def test_execution_time_excludes_the_wait_for_a_worker():
+    agent = NodeAgent(max_workers=1, preload=())
+    first = {'id': 'first', 'type': 'compute', 'duration': 0.5}
+    second = {'id': 'second', 'type': 'compute', 'duration': 0.5}
+    futures = [agent.submit_job(first), agent.submit_job(second)]
+    for future in futures:
+        future.result(timeout=30)
+    assert 0.5 <= second['execution_time'] < 0.9
+    agent.shutdown()
+
+def test_workers_are_spawned_outside_the_pool_lock():
+    pool = WorkerPool(processes=2, lazy=True)
+    spawn, held = pool._spawn_worker, []
+
+    def checked_spawn():
+        # The lock is not reentrant, so this only times out if the caller holds it
+        acquired = pool.lock.acquire(timeout=1)
+        held.append(not acquired)
+        if acquired:
+            pool.lock.release()
+        return spawn()
+
+    pool._spawn_worker = checked_spawn
+    assert pool.submit('first', abs, (-1,)).result(timeout=30) == 1
+    pool.start()
+    assert held == [False, False] and len(pool.workers) == 2
+    pool.shutdown()
+
+def test_short_jobs_do_not_queue_behind_long_ones():
+    agent = NodeAgent(max_workers=1, executor_sizes={'data_processing': 1})
+    long_job = agent.submit_job({'id': 'long', 'type': 'data_processing', 'duration': 30})
+    start = time.monotonic()
+    short = agent.submit_job({'id': 'short', 'type': 'compute', 'duration': 0})
+    short.result(timeout=10)
+    assert time.monotonic() - start < 5
+    assert not long_job.done()
+    agent.shutdown()
+
+def test_pull_mode_balances_heterogeneous_nodes():
+    from backend.job_submission.job_queue import DistributedJobQueue
+    from backend.scheduler.scheduler import Scheduler
+
+    finished = {}
+    done = threading.Event()
+
+    def on_complete(job, result, node_id):
+        finished[job['id']] = node_id
+        if len(finished) == 16:
+            done.set()
+
+    slow = NodeAgent(max_workers=1, node_id='slow',
+                     on_job_complete=lambda job, result: on_complete(job, result, 'slow'))
+    fast = NodeAgent(max_workers=3, node_id='fast',
+                     on_job_complete=lambda job, result: on_complete(job, result, 'fast'))
+    for agent in (slow, fast):
+        agent.execute_job({'id': f'warmup-{agent.node_id}', 'type': 'compute', 'duration': 0})
+
+    job_queue = DistributedJobQueue()
+    scheduler = Scheduler(job_queue, node_registry=None)
+    for i in range(16):
+        job_queue.enqueue({'id': f'job{i}', 'type': 'compute', 'duration': 0.25})
+
+    start = time.monotonic()
+    for agent in (slow, fast):
+        agent.on_jobs_stolen = scheduler.handle_jobs_stolen
+        agent.start_pulling(scheduler.request_work, peers=[slow, fast], low_water_mark=1, batch_size=2)
+    assert done.wait(20)
+    makespan = time.monotonic() - start
+
+    # Pushing equal shares would leave the slow node running 8 jobs (2s)
+    assert list(finished.values()).count('slow') < 8
+    assert makespan < 1.6
+    slow.shutdown()
+    fast.shutdown()
+
+def test_idle_agent_steals_from_peer_backlog():
+    busy = NodeAgent(max_workers=1, node_id='busy')
+    idle = NodeAgent(max_workers=2, node_id='idle')
+    jobs = [{'id': f'job{i}', 'type': 'compute', 'duration': 0.2} for i in range(6)]
+    stolen = []
+
+    busy.start_pulling(lambda node_id, n: [jobs.pop(0) for _ in range(len(jobs))], low_water_mark=0)
+    deadline = time.monotonic() + 10
+    while busy.backlog() < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    idle.on_jobs_stolen = lambda node_id, taken: stolen.extend(job['id'] for job in taken)
+    idle.start_pulling(lambda node_id, n: [], peers=[busy], poll_interval=0.05)
+    while busy.backlog() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Thieves take from the tail, leaving the oldest work with its owner
+    assert stolen[:2] == ['job5', 'job4']
+    assert busy.stop_pulling() == []
+    busy.shutdown()
+    idle.shutdown()
+
+def test_artifacts_are_cached_once_reported_and_evicted(tmp_path):
+    inputs = []
+    for name, size in (('traj.bin', 3000), ('restart.bin', 2000)):
+        source = tmp_path / name
+        source.write_bytes(os.urandom(size))
+        inputs.append({'digest': hash_file(str(source)), 'size': size, 'source': str(source)})
+    cache = ArtifactCache(str(tmp_path / 'cache'), max_bytes=4000)
+    agent = NodeAgent(max_workers=1, artifact_cache=cache)
+
+    result = agent.execute_job({'id': 'first', 'type': 'compute', 'duration': 0, 'artifacts': inputs[:1]})
+    assert result['status'] == 'COMPLETED'
+    assert agent.execute_job({'id': 'again', 'type': 'compute', 'duration': 0, 'artifacts': inputs[:1]})['status'] == 'COMPLETED'
+    assert (cache.bytes_fetched, cache.bytes_reused) == (3000, 3000)
+    report = agent.heartbeat_resources()['artifacts']
+    assert report['full'] and report['added'] == {inputs[0]['digest']: 3000}
+
+    # Over budget, the least recently used file goes and the change is reported
+    agent.execute_job({'id': 'second', 'type': 'compute', 'duration': 0, 'artifacts': inputs[1:]})
+    report = agent.heartbeat_resources()['artifacts']
+    assert report['removed'] == [inputs[0]['digest']] and report['added'] == {inputs[1]['digest']: 2000}
+
+    corrupt = dict(inputs[0], digest='sha256:' + '0' * 64)
+    assert agent.execute_job({'id': 'bad', 'type': 'compute', 'artifacts': [corrupt]})['status'] == 'FAILED'
+    assert sorted(os.listdir(cache.directory)) == [os.path.basename(cache.path(inputs[1]['digest']))]
+    agent.shutdown()
+
+def test_artifact_paths_stay_inside_the_cache(tmp_path):
+    digest = 'sha256:' + '0' * 64
+    assert artifact_path(str(tmp_path), digest) == str(tmp_path / ('sha256-' + '0' * 64))
+    for bad in ('sha256:../../outside', '../' + digest, 'md5:' + '0' * 32, '/tmp/x'):
+        with pytest.raises(ValueError):
+            artifact_path(str(tmp_path), bad)
+
+    # Files that are not artifacts are neither reported nor evicted
+    cache = ArtifactCache(str(tmp_path), max_bytes=0)
+    (tmp_path / 'notes.txt').write_text('keep')
+    assert cache.report()['added'] == {}
+    assert (tmp_path / 'notes.txt').exists()
+
+def test_lazy_agent_spawns_workers_on_first_job():
+    agent = NodeAgent(max_workers=2, lazy_workers=True)
+    pool = agent.executors['default']
+    assert pool.workers == [] and agent._idle_workers() == 2
+
+    assert agent.execute_job({'id': 'first', 'type': 'compute', 'duration': 0})['status'] == 'COMPLETED'
+    assert len(pool.workers) == 1
+
+    agent.start_workers()
+    assert len(pool.workers) == 2 and agent._idle_workers() == 2
+    agent.shutdown()
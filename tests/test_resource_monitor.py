@@ -0,0 +1,32 @@
+import os
+import time
+import numpy as np
+from backend.node_agent.resource_monitor import ResourceMonitor, SampleRingBuffer
+
+def test_ring_buffer_keeps_newest_samples_in_order():
+    buffer = SampleRingBuffer(capacity=4, fields=('load', 'bytes'))
+    for t in range(6):
+        buffer.append(float(t), {'load': t * 10.0, 'bytes': t * 100.0})
+
+    timestamps, values = buffer.window()
+    assert list(timestamps) == [2.0, 3.0, 4.0, 5.0]
+    assert len(buffer) == 4
+    assert buffer.mean('load', seconds=1) == 45.0
+    assert buffer.max('load') == 50.0
+    assert buffer.rate('bytes') == 100.0
+    assert np.isnan(buffer.window()[1]).sum() == 0
+
+def test_sampler_tracks_job_workers_without_blocking():
+    monitor = ResourceMonitor(worker_pids=lambda: {'job1': os.getpid(), 'gone': 2 ** 22 + 12345})
+
+    start = time.monotonic()
+    for _ in range(5):
+        monitor.sample()
+    assert time.monotonic() - start < 0.5
+
+    summary = monitor.summary()
+    assert summary['samples'] == 5
+    assert 0 <= summary['cpu_percent']['mean'] <= 100
+    assert summary['net_bytes_recv_rate'] is None or summary['net_bytes_recv_rate'] >= 0
+    assert monitor.job_usage['job1']['rss'] > 0
+    assert 'gone' not in monitor.job_usage
@@ -0,0 +1,63 @@
+import pytest
+from backend.rpc.protocol import encode, decode, envelope_body
+from backend.rpc.transport import AgentRPCServer, AgentRPCClient, RPCError
+
+class RecordingAgent:
+    def __init__(self):
+        self.received = []
+        self.running = {'md': {'path': '/tmp/md.npz', 'saved_at': 1700000000.5}}
+
+    def receive_jobs(self, jobs):
+        if any(job.get('reject') for job in jobs):
+            raise RuntimeError("pool is shut down")
+        self.received.append(jobs)
+
+    def cancel_job(self, job_id):
+        return job_id in self.running
+
+    def preempt_job(self, job_id):
+        if job_id not in self.running:
+            return None
+        return {'job_id': job_id, 'checkpoint': self.running[job_id]}
+
+    def checkpoint_status(self, job_id):
+        return self.running.get(job_id)
+
+def test_envelope_round_trip_matches_proto_wire_format():
+    data = encode('Envelope', {'request_id': 300, 'cancel': {'job_id': 'a'}})
+    # request_id=300 as a varint, then field 4 holding a JobRequest
+    assert data == b'\x08\xac\x02\x22\x03\x0a\x01a'
+
+    envelope = decode('Envelope', data + b'\x98\x06\x01')  # Unknown field 99 is skipped
+    assert envelope['request_id'] == 300
+    assert envelope_body(envelope) == ('cancel', {'job_id': 'a'})
+
+@pytest.mark.parametrize('address', ['127.0.0.1:0', 'unix'])
+def test_client_dispatches_batches_over_pooled_connections(address, tmp_path):
+    if address == 'unix':
+        address = f"unix:{tmp_path / 'agent.sock'}"
+    agent = RecordingAgent()
+    server = AgentRPCServer(agent, address)
+    server.start()
+    client = AgentRPCClient(server.address, pool_size=2)
+
+    jobs = [{'id': f'job{i}', 'type': 'compute', 'resources': {'cpu_cores': 2}} for i in range(3)]
+    for _ in range(5):
+        ack = client.receive_jobs(jobs)
+    assert ack['job_ids'] == ['job0', 'job1', 'job2']
+    assert agent.received == [jobs] * 5
+    # Sequential calls reuse a single connection
+    assert client.idle.qsize() == 1
+
+    assert client.cancel_job('md') and not client.cancel_job('missing')
+    assert client.preempt_job('md')['checkpoint']['saved_at'] == 1700000000.5
+    assert client.preempt_job('missing') is None
+    assert client.checkpoint_status('md')['path'] == '/tmp/md.npz'
+
+    with pytest.raises(RPCError, match='shut down'):
+        client.receive_jobs([{'id': 'x', 'reject': True}])
+
+    client.close()
+    server.stop()
+    with pytest.raises(RPCError):
+        AgentRPCClient(server.address).receive_jobs(jobs)
@@ -1,6 +1,53 @@
 import pytest
+import numpy as np
 from backend.scheduler.scheduler import Scheduler
 from backend.job_submission.job_queue import DistributedJobQueue
+from backend.scheduler.preemption import PreemptionPolicy, RunningJob
+from backend.scheduler.algorithms import JobSchedulingAlgorithms
+from backend.scheduler.runtime_predictor import RuntimePredictor
+from backend.scheduler.locality import ArtifactRegistry, LocalityPlacement
+from backend.fault_tolerance.heartbeat import HeartbeatMonitor
+from backend.performance.metrics import PerformanceMetrics
+
+class MockNode:
+    def __init__(self, registry, node_id):
+        self.registry = registry
+        self.node_id = node_id
+
+    def receive_jobs(self, jobs):
+        if self.node_id in self.registry.failing_nodes:
+            raise RuntimeError("node unreachable")
+        for job in jobs:
+            self.registry.distributed_jobs.append((self.node_id, job))
+
+    def cancel_job(self, job_id):
+        self.registry.cancelled_jobs.append((self.node_id, job_id))
+
+    def preempt_job(self, job_id):
+        self.registry.preempted_jobs.append((self.node_id, job_id))
+        return {'job_id': job_id, 'checkpoint': self.registry.checkpoints.get(job_id)}
+
+    def checkpoint_status(self, job_id):
+        return self.registry.checkpoints.get(job_id)
+
+class MockNodeRegistry:
+    def __init__(self, num_nodes=2):
+        self.nodes = [
+            {'id': f'node{i}', 'current_load': 0.1 * i,
+             'available_cpu': 8, 'available_memory': 32}
+            for i in range(num_nodes)
+        ]
+        self.distributed_jobs = []
+        self.cancelled_jobs = []
+        self.preempted_jobs = []
+        self.checkpoints = {}
+        self.failing_nodes = set()
+
+    def get_active_nodes(self):
+        return self.nodes
+
+    def get_node(self, node_id):
+        return MockNode(self, node_id)
 
 def test_job_distribution():
     # Mock node registry and job queue
@@ -20,4 +67,345 @@ def test_job_distribution():
     scheduler.distribute_jobs()
     
     # Assert jobs are correctly distributed
-    assert len(mock_node_registry.distributed_jobs) > 0
\ No newline at end of file
+    assert len(mock_node_registry.distributed_jobs) > 0
+
+def test_gang_job_starts_on_all_nodes_together():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=3)
+    scheduler = Scheduler(job_queue, registry)
+
+    job_queue.enqueue({'id': 'md', 'command': 'md', 'nodes': 3, 'submitted_at': 1})
+    job_queue.enqueue({'id': 'small', 'command': 'x', 'submitted_at': 2})
+    scheduler.distribute_jobs()
+
+    gang_members = [(node, job) for node, job in registry.distributed_jobs if job['id'] == 'md']
+    assert sorted(node for node, _ in gang_members) == ['node0', 'node1', 'node2']
+    assert sorted(job['gang_rank'] for _, job in gang_members) == [0, 1, 2]
+
+    # All nodes are held by the gang, so the single job waits in the queue
+    assert job_queue.get_job('small') is not None
+
+    # A failed member releases the whole gang
+    scheduler.handle_job_failure('md', node_id='node1')
+    assert sorted(node for node, _ in registry.cancelled_jobs) == ['node0', 'node2']
+    assert not scheduler.gang_scheduler.reserved_nodes
+
+def test_gang_completes_when_its_last_rank_finishes():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=2)
+    scheduler = Scheduler(job_queue, registry)
+    statuses = {}
+    job_queue.update_job_status = statuses.__setitem__
+
+    job_queue.enqueue({'id': 'md', 'command': 'md', 'nodes': 2})
+    scheduler.distribute_jobs()
+
+    scheduler.handle_job_completion('md', rank=1)
+    assert sorted(scheduler.gang_scheduler.reserved_nodes) == ['node0', 'node1']
+    assert 'md' not in statuses
+
+    scheduler.handle_job_completion('md', rank=0)
+    assert not scheduler.gang_scheduler.reserved_nodes
+    assert statuses == {'md': 'COMPLETED'}
+
+def test_gang_larger_than_the_cluster_fails_at_its_timeout_without_holding_nodes():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=2)
+    now = [0.0]
+    scheduler = Scheduler(job_queue, registry, gang_reservation_timeout=60, clock=lambda: now[0])
+    statuses = {}
+    job_queue.update_job_status = statuses.__setitem__
+
+    job_queue.enqueue({'id': 'huge', 'command': 'md', 'nodes': 3})
+    job_queue.enqueue({'id': 'single', 'command': 'x'})
+    scheduler.distribute_jobs()
+
+    # A node may only be down for a while, so the gang waits for its timeout
+    assert not scheduler.gang_scheduler.reserved_nodes
+    assert statuses == {}
+    assert [job['id'] for _, job in registry.distributed_jobs] == ['single']
+
+    now[0] = 59.0
+    scheduler.schedule_gangs()
+    assert statuses == {}
+    now[0] = 60.0
+    scheduler.schedule_gangs()
+    assert statuses == {'huge': 'FAILED'}
+    assert not scheduler.gang_scheduler.pending_reservations()
+
+def test_gang_short_of_hosts_starts_once_a_node_returns():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=3)
+    down = registry.nodes.pop()
+    scheduler = Scheduler(job_queue, registry, clock=lambda: 0.0)
+
+    job_queue.enqueue({'id': 'md', 'command': 'md', 'nodes': 3})
+    scheduler.distribute_jobs()
+    assert not registry.distributed_jobs
+
+    registry.nodes.append(down)
+    scheduler.schedule_gangs()
+    assert sorted(node_id for node_id, _ in registry.distributed_jobs) == ['node0', 'node1', 'node2']
+
+def test_running_gang_is_tracked_once_and_late_member_failures_are_ignored():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=2)
+    metrics = PerformanceMetrics()
+    scheduler = Scheduler(job_queue, registry, metrics=metrics)
+    failed = []
+    scheduler.dependency_graph.mark_failed = failed.append
+
+    job_queue.enqueue({'id': 'md', 'command': 'md', 'nodes': 2})
+    scheduler.distribute_jobs()
+    running = scheduler.running_jobs['md']
+    assert running.job['gang_rank'] == 0 and running.node_ids == ['node0', 'node1']
+
+    # The first failure requeues the gang; the other member's report must not fail it
+    scheduler.handle_job_failure('md', node_id='node0')
+    scheduler.handle_job_failure('md', node_id='node1')
+    scheduler.handle_job_failure('unknown', node_id='node1')
+    assert failed == []
+    assert job_queue.get_job('md')['status'] != 'FAILED'
+    assert 'md' not in scheduler.running_jobs
+
+def test_gang_jobs_pulled_off_the_queue_are_placed_by_gang_scheduling():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=2)
+    scheduler = Scheduler(job_queue, registry)
+
+    job_queue.enqueue({'id': 'md', 'command': 'md', 'nodes': 2})
+    job_queue.enqueue({'id': 'single', 'command': 'x'})
+    assert [job['id'] for job in scheduler.request_work('node0', 2)] == ['single']
+    assert not registry.distributed_jobs
+
+    scheduler.schedule_gangs()
+    assert sorted(node_id for node_id, _ in registry.distributed_jobs) == ['node0', 'node1']
+    assert {job['id'] for _, job in registry.distributed_jobs} == {'md'}
+
+def test_partial_gang_reservation_times_out():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=3)
+    # node2 could host the gang but is busy, so only a partial reservation is possible
+    registry.nodes[2].update(cpu_cores=8, available_cpu=0)
+    scheduler = Scheduler(job_queue, registry, gang_reservation_timeout=0)
+
+    job_queue.enqueue({'id': 'big', 'command': 'md', 'nodes': 3, 'resources': {'cpu_cores': 4}})
+    scheduler.distribute_jobs()
+    assert len(scheduler.gang_scheduler.reserved_nodes) == 2
+
+    # Next cycle releases the expired partial reservation and requeues the job
+    scheduler.distribute_jobs()
+    assert not scheduler.gang_scheduler.reserved_nodes
+    assert job_queue.get_job('big') is not None
+    assert not registry.distributed_jobs
+
+def test_victim_selection_prefers_checkpointed_low_priority_jobs():
+    policy = PreemptionPolicy(max_priority=0)
+    now = 10000.0
+    running = [
+        RunningJob(job={'id': 'fresh', 'priority': 2}, node_id='n0', started_at=now - 3000),
+        RunningJob(job={'id': 'saved', 'priority': 2}, node_id='n0', started_at=now - 3000,
+                   checkpoint_saved_at=now - 10),
+        RunningJob(job={'id': 'other', 'priority': 2}, node_id='n1', started_at=now - 5000),
+        RunningJob(job={'id': 'urgent', 'priority': 0}, node_id='n1', started_at=now)
+    ]
+    nodes = [{'id': 'n0', 'available_cpu': 0}, {'id': 'n1', 'available_cpu': 0}]
+
+    plan = policy.select_victims({'id': 'new', 'priority': 0}, nodes, running, now=now)
+    assert plan.node_id == 'n0'
+    assert [victim.job['id'] for victim in plan.victims] == ['saved']
+
+    assert policy.select_victims({'id': 'low', 'priority': 1}, nodes, running, now=now) is None
+
+def test_victim_selection_covers_memory_and_gpu_on_the_scheduler_clock():
+    policy = PreemptionPolicy(max_priority=0)
+    running = [
+        RunningJob(job={'id': 'cores', 'priority': 2, 'resources': {'cpu_cores': 4, 'memory_gb': 1}},
+                   node_id='n0', started_at=0.0),
+        RunningJob(job={'id': 'memory', 'priority': 2, 'resources': {'cpu_cores': 1, 'memory_gb': 30}},
+                   node_id='n0', started_at=0.0),
+        RunningJob(job={'id': 'no-gpu', 'priority': 2, 'resources': {'cpu_cores': 8, 'memory_gb': 32}},
+                   node_id='n1', started_at=0.0)
+    ]
+    nodes = [
+        {'id': 'n0', 'available_cpu': 0, 'available_memory': 2, 'gpu_available': True},
+        {'id': 'n1', 'available_cpu': 0, 'available_memory': 0}
+    ]
+    job = {'id': 'new', 'priority': 0, 'resources': {'cpu_cores': 4, 'memory_gb': 16, 'gpu_required': True}}
+
+    plan = policy.select_victims(job, nodes, running, now=0.0)
+    assert plan.node_id == 'n0'
+    assert sorted(victim.job['id'] for victim in plan.victims) == ['cores', 'memory']
+    # Virtual time starting at 0 is not mistaken for a missing clock
+    assert plan.cost == 2 * policy.priority_weight
+
+    # Cores alone are not enough when memory stays short
+    assert policy.select_victims(job, nodes, running[:1], now=0.0) is None
+
+def test_urgent_job_preempts_and_victim_is_requeued():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=1)
+    metrics = PerformanceMetrics()
+    scheduler = Scheduler(job_queue, registry,
+                          preemption_policy=PreemptionPolicy(max_priority=0),
+                          metrics=metrics)
+
+    job_queue.enqueue({'id': 'long', 'priority': 2, 'resources': {'cpu_cores': 8}})
+    scheduler.distribute_jobs()
+    registry.nodes[0]['available_cpu'] = 0
+    registry.checkpoints['long'] = {'path': '/tmp/long.npz', 'saved_at': 1.0}
+
+    job_queue.enqueue({'id': 'urgent', 'priority': 0, 'resources': {'cpu_cores': 4}})
+    scheduler.distribute_jobs()
+
+    assert registry.preempted_jobs == [('node0', 'long')]
+    assert ('node0', 'urgent') in [(node, job['id']) for node, job in registry.distributed_jobs]
+    requeued = job_queue.get_job('long')
+    assert requeued['checkpoint']['path'] == '/tmp/long.npz'
+    assert requeued['preemptions'] == 1
+    assert 0 in metrics.get_performance_summary()['time_to_start']
+
+def test_preempting_a_gang_member_stops_and_requeues_the_whole_gang():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=2)
+    scheduler = Scheduler(job_queue, registry, preemption_policy=PreemptionPolicy(max_priority=0))
+
+    job_queue.enqueue({'id': 'wide', 'priority': 2, 'nodes': 2, 'resources': {'cpu_cores': 8}})
+    scheduler.distribute_jobs()
+    for node in registry.nodes:
+        node['available_cpu'] = 0
+
+    job_queue.enqueue({'id': 'urgent', 'priority': 0, 'resources': {'cpu_cores': 4}})
+    scheduler.distribute_jobs()
+
+    (node_id, _), = registry.preempted_jobs
+    assert registry.cancelled_jobs == [({'node0': 'node1', 'node1': 'node0'}[node_id], 'wide')]
+    assert not scheduler.gang_scheduler.reserved_nodes and 'wide' not in scheduler.running_jobs
+    requeued = job_queue.get_job('wide')
+    assert 'gang_rank' not in requeued and requeued['preemptions'] == 1
+
+def test_urgent_job_queued_behind_normal_jobs_preempts_first():
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=1)
+    scheduler = Scheduler(job_queue, registry, preemption_policy=PreemptionPolicy(max_priority=0))
+
+    job_queue.enqueue({'id': 'long', 'priority': 2, 'resources': {'cpu_cores': 8}})
+    scheduler.distribute_jobs()
+    registry.nodes[0]['available_cpu'] = 0
+
+    for i in range(3):
+        job_queue.enqueue({'id': f'normal{i}', 'priority': 1, 'submitted_at': i,
+                           'resources': {'cpu_cores': 4}})
+    job_queue.enqueue({'id': 'urgent', 'priority': 0, 'submitted_at': 10,
+                       'resources': {'cpu_cores': 4}})
+    scheduler.distribute_jobs()
+
+    # The urgent job leaves the queue first and evicts the least urgent work;
+    # normal jobs may not preempt
+    assert registry.preempted_jobs == [('node0', 'long')]
+    assert [job['id'] for _, job in registry.distributed_jobs][:2] == ['long', 'urgent']
+
+def test_runtime_predictor_learns_md_scaling_and_sets_timeouts():
+    rng = np.random.default_rng(0)
+    predictor = RuntimePredictor()
+    for _ in range(40):
+        particles, steps = int(rng.integers(50, 2000)), int(rng.integers(100, 5000))
+        job = {'type': 'molecular_dynamics',
+               'simulation_parameters': {'num_particles': particles, 'simulation_steps': steps}}
+        predictor.observe(job, 2e-7 * particles ** 1.9 * steps * rng.lognormal(0, 0.02))
+
+    job = {'type': 'molecular_dynamics', 'simulation_parameters': {'num_particles': 500, 'simulation_steps': 2000}}
+    expected = 2e-7 * 500 ** 1.9 * 2000
+    assert abs(predictor.predict(job) / expected - 1) < 0.1
+    assert predictor.timeout_for(job) >= 2 * predictor.predict(job)
+    assert predictor.predict({'type': 'compute', 'duration': 5}) is None
+
+    # The scheduler predicts a timeout for jobs without one and records the error on completion
+    job_queue = DistributedJobQueue()
+    metrics = PerformanceMetrics()
+    now = [1000.0]
+    scheduler = Scheduler(job_queue, MockNodeRegistry(num_nodes=1), metrics=metrics,
+                          runtime_predictor=predictor, clock=lambda: now[0])
+    job_queue.enqueue(dict(job, id='md'))
+    job_queue.enqueue({'id': 'bounded', 'type': 'molecular_dynamics', 'timeout': 30})
+    scheduler.distribute_jobs()
+    md = scheduler.running_jobs['md'].job
+    assert md['timeout'] == predictor.timeout_for(md)
+    assert scheduler.running_jobs['bounded'].job['timeout'] == 30
+
+    now[0] += 2 * expected
+    scheduler.handle_job_completion('md')
+    error = metrics.get_performance_summary()['runtime_prediction_error']['molecular_dynamics']
+    assert error['count'] == 1 and 0.4 < error['p50'] < 0.6
+    assert 'scheduler_runtime_prediction_error_ratio_count{job_type="molecular_dynamics"} 1' in metrics.render_prometheus()
+
+def test_placement_keeps_shortest_job_first_order_and_learns_execution_time():
+    predictor = RuntimePredictor(min_samples=3)
+    for duration in (5, 50, 500, 5000):
+        predictor.observe({'type': 'compute', 'duration': duration}, duration)
+
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=1)
+    now = [1000.0]
+    scheduler = Scheduler(job_queue, registry, runtime_predictor=predictor, clock=lambda: now[0])
+    for i, duration in enumerate((1000, 10, 100)):
+        job_queue.enqueue({'id': f'job{i}', 'type': 'compute', 'duration': duration, 'submitted_at': i})
+    scheduler.distribute_jobs()
+    assert [job['id'] for _, job in registry.distributed_jobs] == ['job1', 'job2', 'job0']
+
+    # job1 waited 990s on its node behind the others but only ran for 10s
+    now[0] += 1000
+    samples = []
+    predictor.observe = lambda job, runtime: samples.append(runtime)
+    scheduler.handle_job_completion('job1', execution_time=10.0)
+    assert samples == [10.0]
+
+def test_short_jobs_backfill_nodes_held_for_a_waiting_gang():
+    predictor = RuntimePredictor(min_samples=3)
+    for duration in (5, 50, 500, 5000):
+        predictor.observe({'type': 'compute', 'duration': duration}, duration)
+
+    job_queue = DistributedJobQueue()
+    registry = MockNodeRegistry(num_nodes=3)
+    registry.nodes[2].update(cpu_cores=8, available_cpu=0)
+    scheduler = Scheduler(
+        job_queue, registry, runtime_predictor=predictor, clock=lambda: 1000.0,
+        placement_policy=lambda jobs, nodes: JobSchedulingAlgorithms.capacity_aware_placement(jobs, nodes)
+    )
+    # node2 is busy until t=1100, so the gang cannot start before then
+    scheduler.running_jobs['busy'] = RunningJob(
+        job={'id': 'busy', 'predicted_runtime': 100.0}, node_id='node2', started_at=1000.0
+    )
+
+    job_queue.enqueue({'id': 'gang', 'type': 'compute', 'nodes': 3, 'resources': {'cpu_cores': 4}})
+    job_queue.enqueue({'id': 'short', 'type': 'compute', 'duration': 10, 'resources': {'cpu_cores': 1}})
+    job_queue.enqueue({'id': 'long', 'type': 'compute', 'duration': 1000, 'resources': {'cpu_cores': 1}})
+    scheduler.distribute_jobs()
+
+    assert sorted(scheduler.gang_scheduler.reserved_nodes) == ['node0', 'node1']
+    assert [(node, job['id']) for node, job in registry.distributed_jobs] == [('node0', 'short')]
+    assert job_queue.get_job('long') is not None
+
+def test_locality_placement_prefers_nodes_caching_the_inputs():
+    registry = ArtifactRegistry()
+    monitor = HeartbeatMonitor(artifact_registry=registry)
+    monitor.record_heartbeat('node1', resources={'artifacts': {'full': True, 'added': {'sha256:traj': 6000}}})
+    monitor.record_heartbeat('node0', resources={'artifacts': {'full': True, 'added': {'sha256:other': 10}}})
+    monitor.record_heartbeat('node0', resources={'artifacts': {'full': False, 'added': {'sha256:restart': 4000},
+                                                               'removed': ['sha256:other']}})
+    assert registry.nodes_holding('sha256:restart') == {'node0'} and not registry.nodes_holding('sha256:other')
+
+    job_queue = DistributedJobQueue()
+    nodes = MockNodeRegistry(num_nodes=3)
+    metrics = PerformanceMetrics()
+    scheduler = Scheduler(job_queue, nodes, metrics=metrics, artifact_registry=registry,
+                          placement_policy=LocalityPlacement(registry))
+    artifacts = [{'digest': 'sha256:traj', 'size': 6000}, {'digest': 'sha256:restart', 'size': 4000}]
+    job_queue.enqueue({'id': 'analysis', 'artifacts': artifacts, 'resources': {'cpu_cores': 2}})
+    job_queue.enqueue({'id': 'plain', 'resources': {'cpu_cores': 2}})
+    scheduler.distribute_jobs()
+
+    placed = {job['id']: node for node, job in nodes.distributed_jobs}
+    # node1 is busier than node0 but holds most of the bytes
+    assert placed == {'analysis': 'node1', 'plain': 'node0'}
+    assert metrics.get_performance_summary()['artifact_bytes'] == {'local': 6000, 'fetched': 4000}
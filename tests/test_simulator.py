@@ -0,0 +1,54 @@
+from backend.performance.simulator import (
+    ClusterSimulation, POLICIES, build_fleet, compare_policies, synthetic_workload
+)
+
+def _job(submit_time, runtime, cores):
+    return {'submit_time': submit_time, 'runtime': runtime, 'priority': 1, 'type': 'compute',
+            'resources': {'cpu_cores': cores, 'memory_gb': cores}}
+
+def test_failed_node_is_detected_and_its_jobs_rerun():
+    fleet = [('node0', 4, 16), ('node1', 4, 16)]
+    workload = [_job(0, 100, 4), _job(0, 100, 4), _job(1, 50, 2)]
+    simulation = ClusterSimulation(workload, fleet, failures=[(10, 'node0', 1000)], heartbeat_interval=5)
+    report = simulation.run()
+
+    assert report['completed'] == 3
+    assert report['node_failures'] == 1
+    assert report['lost_core_seconds'] == 40
+    assert 'node0' in simulation.registry.inactive
+    # The lost job restarts on node1 once detected, behind the job already there
+    assert report['makespan'] > 200
+    assert report['events'] < 100
+
+def test_policies_run_the_same_workload_to_completion():
+    workload = synthetic_workload(duration=1800, arrival_rate=0.05, mean_runtime=120, seed=1)
+    reports = compare_policies(workload, build_fleet(4), POLICIES)
+
+    assert set(reports) == set(POLICIES)
+    for report in reports.values():
+        assert report['completed'] == report['jobs'] == len(workload)
+        assert 0 < report['utilization'] <= 1
+        assert report['wait_time']['count'] == len(workload)
+
+def test_node_repaired_before_detection_reruns_its_jobs():
+    fleet = [('node0', 4, 16), ('node1', 4, 16)]
+    workload = [_job(0, 100, 4), _job(0, 100, 4)]
+    # Back after 20 s, well inside the 90 s it takes the monitor to notice
+    simulation = ClusterSimulation(workload, fleet, failures=[(10, 'node0', 20)])
+    report = simulation.run()
+
+    assert report['completed'] == 2 and report['stranded'] == 0
+    assert report['node_failures'] == 1
+    assert not simulation.registry.inactive
+
+def test_run_ends_when_a_job_fits_on_no_node():
+    fleet = [('node0', 4, 16), ('node1', 8, 32)]
+    workload = [_job(0, 100, 2), _job(5, 100, 64)]
+
+    # capacity_aware never places the oversized job; least_loaded runs it alone
+    stuck = ClusterSimulation(workload, fleet, POLICIES['capacity_aware']()).run()
+    assert stuck['completed'] == 1 and stuck['stranded'] == 1
+    assert stuck['events'] < 20
+
+    done = ClusterSimulation(workload, fleet, POLICIES['least_loaded']()).run()
+    assert done['completed'] == 2 and done['stranded'] == 0
@@ -0,0 +1,66 @@
+import json
+import threading
+from backend.job_submission.api import JobSubmissionAPI
+from backend.job_submission.job_queue import DistributedJobQueue
+from backend.node_agent.agent import NodeAgent
+from backend.performance.tracing import Tracer, load_traces, summarize_traces
+from backend.scheduler.scheduler import Scheduler
+
+class AgentRegistry:
+    def __init__(self, agent):
+        self.agent = agent
+
+    def get_active_nodes(self):
+        return [{'id': self.agent.node_id, 'current_load': 0.0, 'available_cpu': 8, 'available_memory': 32}]
+
+    def get_node(self, node_id):
+        return self.agent
+
+def test_traced_job_records_every_lifecycle_stage(tmp_path):
+    path = tmp_path / 'traces.jsonl'
+    tracer = Tracer(sample_rate=1.0, path=str(path))
+    queue = DistributedJobQueue()
+    agent = NodeAgent(max_workers=1, node_id='node0')
+    scheduler = Scheduler(queue, AgentRegistry(agent), tracer=tracer)
+    done = threading.Event()
+    agent.on_job_complete = lambda job, result: (scheduler.handle_job_completion(job['id']), done.set())
+
+    client = JobSubmissionAPI(queue, tracer=tracer).app.test_client()
+    response = client.post('/jobs', json={'command': 'run', 'type': 'compute', 'duration': 0.05})
+    assert response.status_code == 201
+    scheduler.distribute_jobs()
+    assert done.wait(30)
+    agent.shutdown()
+    tracer.close()
+
+    [trace] = load_traces([str(path)])
+    assert trace['job_id'] == response.get_json()['job_id']
+    stages = [span['stage'] for span in trace['spans']]
+    assert stages == ['api_parse', 'queue_wait', 'placement', 'dispatch',
+                      'worker_start', 'execute', 'result_transfer']
+    execute = trace['spans'][stages.index('execute')]
+    assert execute['duration'] >= 0.05
+    assert sum(span['duration'] for span in trace['spans']) <= trace['duration'] + 0.01
+    assert 'trace' not in json.dumps(response.get_json())
+
+def test_unsampled_jobs_are_untouched_and_summary_shares():
+    tracer = Tracer(sample_rate=0.0)
+    job = {'id': 'job1'}
+    assert not tracer.start_trace(job)
+    assert tracer.finish_trace(job) is None and job == {'id': 'job1'}
+
+    traces = [
+        {'type': 'md', 'duration': 1.0, 'spans': [
+            {'stage': 'queue_wait', 'start': 0.0, 'duration': 0.25},
+            {'stage': 'execute', 'start': 0.25, 'duration': 0.75},
+            {'stage': 'execute.simulate', 'start': 0.3, 'duration': 0.5}
+        ]},
+        {'type': 'compute', 'duration': 3.0, 'spans': [
+            {'stage': 'execute', 'start': 0.0, 'duration': 3.0}
+        ]}
+    ]
+    summary = summarize_traces(traces, job_type='md')
+    assert summary['traces'] == 1
+    assert list(summary['stages']) == ['queue_wait', 'execute', 'execute.simulate']
+    assert summary['stages']['queue_wait']['share'] == 0.25
+    assert 'share' not in summary['stages']['execute.simulate']
@@ -0,0 +1,84 @@
+from backend.job_submission.api import JobSubmissionAPI
+from backend.job_submission.job_queue import DistributedJobQueue
+from backend.performance.simulator import load_recorded_workload
+from backend.scheduler.scheduler import Scheduler
+from backend.performance.workload_trace import (
+    WorkloadRecorder, WorkloadReplayer, load_workload, trace_files
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_recorded_jobs_round_trip_across_rotated_files(tmp_path):
+    clock = FakeClock()
+    recorder = WorkloadRecorder(str(tmp_path), max_bytes=200, max_files=100, clock=clock)
+    for i in range(20):
+        clock.now += 2
+        recorder.record_submit({'id': f'job{i}', 'type': ('compute', 'md')[i % 2], 'priority': i % 3,
+                                'resources': {'cpu_cores': 4, 'memory_gb': 8}})
+    for i in range(0, 20, 2):
+        recorder.record_finish(f'job{i}', 'COMPLETED', runtime=i * 1.5)
+    recorder.record_finish('job1', 'FAILED', runtime=0.5)
+    recorder.record_finish('unknown', 'COMPLETED', runtime=1.0)
+    recorder.close()
+
+    assert len(trace_files(str(tmp_path))) > 1
+    jobs = load_workload(trace_files(str(tmp_path)))
+    assert len(jobs) == 20
+    assert [job['submit_time'] for job in jobs[:3]] == [0.0, 2.0, 4.0]
+    assert [job['type'] for job in jobs[:2]] == ['compute', 'md']
+    assert jobs[4]['runtime'] == 6.0 and jobs[4]['status'] == 'COMPLETED'
+    assert jobs[1]['status'] == 'FAILED'
+    assert jobs[3]['runtime'] is None
+    assert jobs[5]['resources'] == {'cpu_cores': 4.0, 'memory_gb': 8.0, 'gpu_required': False}
+    assert len(load_recorded_workload([str(tmp_path)])) == 11
+
+    recorder = WorkloadRecorder(str(tmp_path), max_bytes=200, max_files=2, clock=clock)
+    for i in range(20):
+        recorder.record_submit({'id': f'again{i}', 'type': 'compute'})
+    recorder.close()
+    assert len(trace_files(str(tmp_path))) == 2
+
+def test_api_submissions_replay_into_another_instance(tmp_path):
+    recorder = WorkloadRecorder(str(tmp_path))
+    source = JobSubmissionAPI(DistributedJobQueue(), recorder=recorder).app.test_client()
+    for priority in (1, 2, 3):
+        source.post('/jobs', json={'command': 'run', 'type': 'compute', 'priority': priority,
+                                   'resources': {'cpu_cores': priority}})
+    recorder.close()
+
+    target_queue = DistributedJobQueue()
+    target = JobSubmissionAPI(target_queue).app.test_client()
+    replayer = WorkloadReplayer(
+        lambda payload: target.post('/jobs', json=payload).status_code, speed=1000.0, concurrency=1
+    )
+    report = replayer.replay(load_workload(trace_files(str(tmp_path))))
+
+    assert report['accepted'] == 3 and report['rejected'] == 0
+    replayed = sorted(target_queue.get_all_jobs(), key=lambda job: job['priority'])
+    assert [job['priority'] for job in replayed] == [1, 2, 3]
+    assert [job['resources']['cpu_cores'] for job in replayed] == [1.0, 2.0, 3.0]
+
+def test_jobs_failed_by_their_dependencies_are_recorded_and_live_jobs_are_bounded(tmp_path):
+    recorder = WorkloadRecorder(str(tmp_path), max_live=3)
+    job_queue = DistributedJobQueue()
+    scheduler = Scheduler(job_queue, None, recorder=recorder)
+    client = JobSubmissionAPI(job_queue, dependency_graph=scheduler.dependency_graph,
+                              recorder=recorder).app.test_client()
+
+    parent = client.post('/jobs', json={'command': 'run', 'type': 'compute'}).get_json()['job_id']
+    child = client.post('/jobs', json={'command': 'run', 'type': 'md', 'depends_on': [parent]}).get_json()['job_id']
+    scheduler._fail(job_queue.get_job(parent))
+    assert child not in recorder._live
+
+    for _ in range(5):
+        client.post('/jobs', json={'command': 'run', 'type': 'compute'})
+    assert len(recorder._live) == 3
+    recorder.close()
+
+    statuses = [job['status'] for job in load_workload(trace_files(str(tmp_path)))]
+    assert statuses == ['FAILED', 'UPSTREAM_FAILED'] + [None] * 5